@@ -6,29 +6,32 @@ $runOptions = [System.Environment]::GetEnvironmentVariable("RUN_OPTIONS", "Proce
 $outFile = [System.Environment]::GetEnvironmentVariable("OUT_FILE", "Process")
 $backupDir = [System.Environment]::GetEnvironmentVariable("BACKUP_DIR", "Process")
 
-$timeThreshold = (Get-Date).AddMinutes(-$targetTimeMin)
-$fetchTargetFiles = Get-ChildItem -Path "$($imageFetchDir)\*" -File -Include *.png, *.jpg |
-    Where-Object { $_.CreationTime -gt $timeThreshold }
+# fix the time window so that the same files are analyzed and moved to backup
+$timeUntil = Get-Date
+$timeSince = $timeUntil.AddMinutes(-$targetTimeMin)
+$timeFormat = "yyyy-MM-ddTHH:mm:ss.fff"
 
+# images in the current directory already are analyzed regardless of the time window
 $currentDir = $PWD.Path
-foreach ($file in $fetchTargetFiles) {
-    Move-Item -Path $file.FullName -Destination $currentDir
-}
-
-# both images in the current directory already and fetched ones
-$files = Get-ChildItem -Path "$($currentDir)\*" -File -Include *.png, *.jpg | Sort-Object LastWriteTime
-$filenames = $files | ForEach-Object { $_.Name }
-$filenames | Write-Output
+$leftFiles = Get-ChildItem -Path "$($currentDir)\*" -File -Include *.png, *.jpg
+$leftFilenames = $leftFiles | ForEach-Object { "`"$($_.Name)`"" }
 
-$command = "poetry --project $($appDir) run taikoi2t -d $($dictionaryCsv) $($runOptions) " + ($filenames -join " ")
+# taikoi2t filters images in the fetch directory by extension and modify time
+$command = "poetry --project $($appDir) run taikoi2t -d $($dictionaryCsv) $($runOptions) " +
+    "--ext png jpg --since $($timeSince.ToString($timeFormat)) --until $($timeUntil.ToString($timeFormat)) " +
+    "--file-sort MODIFY_ASC -- `"$($imageFetchDir)\*`" " + ($leftFilenames -join " ")
 $result = Invoke-Expression $command
 
 $result | Out-File -FilePath $outFile -Encoding utf8
 $result | Set-Clipboard
 
+$fetchedFiles = Get-ChildItem -Path "$($imageFetchDir)\*" -File -Include *.png, *.jpg |
+    Where-Object { $_.LastWriteTime -ge $timeSince -and $_.LastWriteTime -le $timeUntil }
+$fetchedFiles | ForEach-Object { $_.Name } | Write-Output
+
 if (!(Test-Path $backupDir)) {
     New-Item -ItemType Directory -Path $backupDir
 }
-foreach ($file in $files) {
+foreach ($file in @($leftFiles) + @($fetchedFiles)) {
     Move-Item -Path $file.FullName -Destination $backupDir
 }
@@ -0,0 +1,242 @@
+import asyncio
+from collections.abc import AsyncIterable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, List
+
+import easyocr  # type: ignore
+import numpy
+
+from taikoi2t.application.file import read_student_dictionary_source_file
+from taikoi2t.application.match import extract_match_result_from_source
+from taikoi2t.application.student import STUDENT_TILE_SHAPE, StudentDictionaryImpl
+from taikoi2t.implements.batch import RecognizerBatcher
+from taikoi2t.implements.match import new_errored_match_result
+from taikoi2t.implements.pool import new_thread_pool
+from taikoi2t.implements.reader import new_reader
+from taikoi2t.implements.session import new_ocr_session
+from taikoi2t.implements.source import (
+    new_array_source,
+    new_encoded_source,
+    new_path_source,
+    new_synthetic_image_meta,
+)
+from taikoi2t.models.args import VERBOSE_SILENT
+from taikoi2t.models.image import Image
+from taikoi2t.models.match import MatchResult
+from taikoi2t.models.reader import ReaderOptions
+from taikoi2t.models.settings import Settings
+from taikoi2t.models.source import ImageSource
+from taikoi2t.models.student import StudentDictionary
+
+# a path of an image file, an encoded image file, or a decoded BGR image
+type ExtractTarget = Path | str | bytes | Image
+
+# extracts everything as the JSON output does
+DEFAULT_API_SETTINGS = Settings(
+    columns=(),
+    output_format="json",
+    alias=True,
+    sp_sort=True,
+    verbose=VERBOSE_SILENT,
+)
+# the same defaults as --batch-size and --batch-wait
+DEFAULT_BATCH_SIZE: int = 64
+DEFAULT_BATCH_WAIT: float = 0.02  # in seconds
+
+
+# Owns the loaded models and the dictionary to extract images in this process.
+#
+# Built once and reused, so that the models are loaded only once.
+# `extract` runs in the calling thread; `extract_batch` and `extract_many`
+# extract `batch_images` images at once in threads and merge their recognizer
+# calls into larger batches as --batch-images does.
+# `close` must be called after use.
+class Extractor:
+    def __init__(
+        self,
+        dictionary: StudentDictionary,
+        reader: easyocr.Reader,
+        settings: Settings = DEFAULT_API_SETTINGS,
+        batch_images: int = 8,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_wait: float = DEFAULT_BATCH_WAIT,
+    ) -> None:
+        if batch_images < 1:
+            raise ValueError(f"batch_images must be positive; {batch_images}")
+        self.dictionary: StudentDictionary = dictionary
+        self.reader: easyocr.Reader = _to_session(reader, dictionary)
+        self.settings: Settings = settings
+        self.batch_images: int = batch_images
+        self.batcher: RecognizerBatcher = RecognizerBatcher(
+            self.reader, batch_size, batch_wait
+        )
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            batch_images, thread_name_prefix="extract"
+        )
+
+    def extract(self, target: ExtractTarget) -> MatchResult:
+        return _extract_target(target, 0, self.dictionary, self.reader, self.settings)
+
+    # Returns the results in the order of the targets
+    def extract_batch(self, targets: Iterable[ExtractTarget]) -> List[MatchResult]:
+        futures = [
+            self.executor.submit(
+                _extract_target,
+                target,
+                index,
+                self.dictionary,
+                self.batcher,
+                self.settings,
+            )
+            for index, target in enumerate(targets)
+        ]
+        return [future.result() for future in futures]
+
+    # `extract_many` with the models and the threads of this extractor
+    def extract_many(
+        self,
+        targets: Iterable[ExtractTarget] | AsyncIterable[ExtractTarget],
+        concurrency: int | None = None,
+    ) -> AsyncIterator[MatchResult]:
+        return extract_many(
+            targets,
+            dictionary=self.dictionary,
+            reader=self.batcher,
+            settings=self.settings,
+            concurrency=concurrency or self.batch_images,
+            executor=self.executor,
+        )
+
+    def close(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
+        self.batcher.close()
+
+
+# Returns None if the dictionary is invalid
+def new_extractor(
+    dictionary_path: Path,
+    reader_options: ReaderOptions = ReaderOptions(),
+    settings: Settings = DEFAULT_API_SETTINGS,
+    batch_images: int = 8,
+) -> Extractor | None:
+    student_alias_pairs = read_student_dictionary_source_file(dictionary_path)
+    if student_alias_pairs is None:
+        return None
+    dictionary = StudentDictionaryImpl(student_alias_pairs)
+    if not dictionary.validate():
+        return None
+    reader = new_reader(reader_options, [STUDENT_TILE_SHAPE])
+    return Extractor(dictionary, reader, settings, batch_images)
+
+
+# Extracts the targets in an executor and yields the results as they finish.
+#
+# At most `concurrency` targets are in flight; the next targets are not taken
+# until the caller receives the finished results, so a slow caller holds back
+# the extraction. Closing the generator or cancelling the awaiting task cancels
+# the targets which are not started yet.
+# Errored targets are yielded as errored results in the same way as the CLI.
+#
+#   async for match_result in extract_many(paths, dictionary=d, reader=r, concurrency=4):
+#       ...
+async def extract_many(
+    targets: Iterable[ExtractTarget] | AsyncIterable[ExtractTarget],
+    *,
+    dictionary: StudentDictionary,
+    reader: easyocr.Reader,
+    settings: Settings = DEFAULT_API_SETTINGS,
+    concurrency: int = 1,
+    executor: Executor | None = None,
+) -> AsyncIterator[MatchResult]:
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be positive; {concurrency}")
+
+    loop = asyncio.get_running_loop()
+    reader = _to_session(reader, dictionary)
+    owned = executor is None
+    running = new_thread_pool(concurrency) if executor is None else executor
+
+    iterator = __iterate(targets)
+    pending: Dict[asyncio.Future[MatchResult], int] = {}  # to the target index
+    index = 0
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    target = await anext(iterator)
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                # stats and decodes the image in the executor too
+                future = loop.run_in_executor(
+                    running,
+                    _extract_target,
+                    target,
+                    index,
+                    dictionary,
+                    reader,
+                    settings,
+                )
+                pending[future] = index
+                index += 1
+            if len(pending) == 0:
+                return
+
+            done, _ = await asyncio.wait(
+                pending.keys(), return_when=asyncio.FIRST_COMPLETED
+            )
+            # simultaneous ones are in the order of the targets
+            for future in sorted(done, key=pending.__getitem__):
+                del pending[future]
+                yield future.result()
+    finally:
+        for future in pending.keys():
+            future.cancel()
+        if owned:
+            running.shutdown(wait=False, cancel_futures=True)
+
+
+async def __iterate(
+    targets: Iterable[ExtractTarget] | AsyncIterable[ExtractTarget],
+) -> AsyncIterator[ExtractTarget]:
+    if isinstance(targets, AsyncIterable):
+        async for target in targets:
+            yield target
+    else:
+        for target in targets:
+            yield target
+
+
+# readers given by callers are wrapped once for all targets
+def _to_session(
+    reader: easyocr.Reader, dictionary: StudentDictionary
+) -> easyocr.Reader:
+    if isinstance(reader, easyocr.Reader):
+        return new_ocr_session(reader, dictionary)
+    return reader  # already wrapped
+
+
+# `index` names the targets without paths
+def _extract_target(
+    target: ExtractTarget,
+    index: int,
+    dictionary: StudentDictionary,
+    reader: easyocr.Reader,
+    settings: Settings,
+) -> MatchResult:
+    source = _new_target_source(target, index)
+    return extract_match_result_from_source(
+        source, dictionary, reader, settings
+    ) or new_errored_match_result(source.meta)
+
+
+def _new_target_source(target: ExtractTarget, index: int) -> ImageSource:
+    if isinstance(target, numpy.ndarray):
+        meta = new_synthetic_image_meta(f"<array>/{index}", f"array-{index}")
+        return new_array_source(meta, target)
+    if isinstance(target, bytes):
+        meta = new_synthetic_image_meta(f"<bytes>/{index}", f"bytes-{index}")
+        return new_encoded_source(meta, target)
+    return new_path_source(Path(target))
@@ -1,37 +1,77 @@
+import dataclasses
+import io
 import logging
 import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Sequence
-
-import easyocr  # type: ignore
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterable, List, Sequence, TextIO, Tuple
 
 from taikoi2t.application.args import (
+    REMATCH_COMMAND,
+    RENDER_COMMAND,
     parse_args,
+    parse_render_args,
     validate_args,
+    validate_render_args,
 )
 from taikoi2t.application.file import read_student_dictionary_source_file
-from taikoi2t.application.match import extract_match_result_from_path
+from taikoi2t.application.match import (
+    extract_match_result_from_source,
+    rematch_match_result,
+)
 from taikoi2t.application.student import (
+    STUDENT_TILE_SHAPE,
     StudentDictionaryImpl,
 )
-from taikoi2t.implements.file import expand_paths, sort_files
+from taikoi2t.implements.archive import iterate_sources
+from taikoi2t.implements.batch import RecognizerBatcher
+from taikoi2t.implements.file import (
+    discover_files,
+    new_file_filter_from,
+    sort_file_entries,
+)
+from taikoi2t.implements.journal import append_journal, new_journal_key, read_journal
 from taikoi2t.implements.json import to_json_str
 from taikoi2t.implements.match import (
     new_errored_match_result,
     render_match,
 )
-from taikoi2t.implements.settings import new_settings_from
-from taikoi2t.models.args import VERBOSE_ERROR, VERBOSE_PRINT, Args
+from taikoi2t.implements.memory import format_bytes, get_peak_rss
+from taikoi2t.implements.pool import ForkWorkerPool, new_thread_pool
+from taikoi2t.implements.reader import new_reader, new_reader_options_from
+from taikoi2t.implements.render import read_stored_matches
+from taikoi2t.implements.ring import FrameRingReader
+from taikoi2t.implements.schedule import PriorityScheduler
+from taikoi2t.implements.session import new_ocr_session
+from taikoi2t.implements.settings import new_render_settings_from, new_settings_from
+from taikoi2t.implements.source import new_source_from_origin
+from taikoi2t.implements.stream import read_stream_sources
+from taikoi2t.implements.watch import FileWatcher
+from taikoi2t.models.args import VERBOSE_ERROR, VERBOSE_PRINT, Args, RenderArgs
+from taikoi2t.models.file import FileEntry
+from taikoi2t.models.image import ImageMeta
+from taikoi2t.models.journal import JournalKey
+from taikoi2t.models.match import MatchResult
 from taikoi2t.models.run import RunResult
+from taikoi2t.models.schedule import Scheduled
+from taikoi2t.models.settings import Settings
+from taikoi2t.models.source import ImageSource
 from taikoi2t.models.student import StudentDictionary
 
 logger: logging.Logger = logging.getLogger("taikoi2t")
 
 
 def run(argv: Sequence[str] | None = None) -> None:
+    arguments = list(argv or sys.argv)
+    if len(arguments) > 1 and arguments[1] in (RENDER_COMMAND, REMATCH_COMMAND):
+        __render(arguments)
+        return
+
     run_starts_at = datetime.now()
     run_result = RunResult(
-        arguments=list(argv or sys.argv),
+        arguments=arguments,
         starts_at=run_starts_at.isoformat(),
         ends_at="",
         matches=[],
@@ -44,39 +84,168 @@ def run(argv: Sequence[str] | None = None) -> None:
         sys.exit(1)
 
     settings = new_settings_from(args)
+    file_filter = new_file_filter_from(args)
     logger.debug(f"=> {settings}")
 
-    student_alias_pairs = read_student_dictionary_source_file(args.dictionary)
-    if student_alias_pairs is None:
+    student_dictionary = __read_student_dictionary(args.dictionary)
+    if student_dictionary is None:
         sys.exit(1)
 
-    student_dictionary: StudentDictionary = StudentDictionaryImpl(student_alias_pairs)
-    if not student_dictionary.validate():
-        sys.exit(1)
+    completed: Dict[JournalKey, MatchResult] = {}
+    if args.resume and args.journal is not None:
+        journaled = read_journal(args.journal)
+        if journaled is None:
+            sys.exit(1)
+        completed = journaled
 
-    reader = easyocr.Reader(["ja", "en"], verbose=settings.verbose >= VERBOSE_PRINT)
+    journal: TextIO | None = None
+    if args.journal is not None:
+        try:
+            journal = args.journal.open(mode="a", encoding="utf-8")
+        except OSError as e:
+            logger.critical(f"Journal {args.journal.as_posix()} cannot be opened; {e}")
+            sys.exit(1)
 
-    expanded_paths = expand_paths(args.files)
-    sorted_paths = (
-        expanded_paths
-        if args.file_sort is None
-        else sort_files(expanded_paths, args.file_sort)
+    reader = new_ocr_session(
+        new_reader(new_reader_options_from(args), [STUDENT_TILE_SHAPE]),
+        student_dictionary,
     )
 
+    # forked before any other threads start
+    pool: ForkWorkerPool[__Portable, MatchResult | None] | None = None
+    if args.workers > 1:
+        pool = ForkWorkerPool(
+            args.workers,
+            lambda portable: extract_match_result_from_source(
+                new_source_from_origin(*portable), student_dictionary, reader, settings
+            ),
+        )
+
+    sources: Iterable[ImageSource]
+    ring: FrameRingReader | None = None
+    existing_entries: Sequence[FileEntry] = []
+    if args.stdin is not None:
+        sources = read_stream_sources(sys.stdin.buffer, args.stdin)
+    elif args.shm is not None:
+        try:
+            ring = FrameRingReader(args.shm)
+        except (OSError, ValueError) as e:
+            logger.critical(f"Cannot attach to the shared memory {args.shm}; {e}")
+            sys.exit(1)
+        sources = ring.sources()
+    else:
+        existing_entries = discover_files(args.files, file_filter)
+        sorted_entries = (
+            existing_entries
+            if args.file_sort is None
+            else sort_file_entries(existing_entries, args.file_sort)
+        )
+        sources = iterate_sources(sorted_entries)
+
+    # the given files are the backfill; files arriving while watching are live
+    scheduler = PriorityScheduler(sources)
+    watcher: FileWatcher | None = None
+    if args.watch:
+
+        def push_arrivals(arrived: List[FileEntry]) -> None:
+            for source in iterate_sources(arrived):
+                scheduler.push_live(source)
+
+        watcher = FileWatcher(
+            args.files, file_filter, args.watch_interval, push_arrivals
+        )
+        watcher.start(existing_entries)
+    else:
+        scheduler.close()
+
     logger.info(f"=== INITIALIZED; elapsed: {datetime.now() - run_starts_at} ===")
 
-    for path in sorted_paths:
-        match_result = extract_match_result_from_path(
-            path, student_dictionary, reader, settings
-        ) or new_errored_match_result(path)
+    # several images are in flight to batch their recognizer calls, or in parallel
+    batcher: RecognizerBatcher | None = None
+    executor: ThreadPoolExecutor | None = None
+    if args.batch_images > 1:
+        batcher = RecognizerBatcher(reader, args.batch_size, args.batch_wait / 1000)
+        executor = ThreadPoolExecutor(args.batch_images, thread_name_prefix="extract")
+    elif args.threads > 1:
+        executor = new_thread_pool(args.threads)
+
+    def extract(source: ImageSource) -> MatchResult | None:
+        return extract_match_result_from_source(
+            source, student_dictionary, batcher or reader, settings
+        )
+
+    # Returns None to extract in this thread
+    def submit(source: ImageSource) -> Future[MatchResult | None] | None:
+        if executor is not None:
+            return executor.submit(extract, source)
+        if pool is not None and source.origin is not None:
+            return pool.submit((source.meta, source.origin))
+        return None
+
+    in_flight: Deque[__InFlight] = deque()
+    in_flight_limit = max(args.batch_images, args.workers, args.threads)
+
+    def finish_oldest() -> None:
+        scheduled, journal_key, cached, future = in_flight.popleft()
+        extracted = None if future is None else future.result()
+        # errored files are not journaled to retry them in the next run
+        if journal is not None and journal_key is not None and extracted is not None:
+            append_journal(journal, journal_key, extracted)
+        match_result = dataclasses.replace(
+            cached or extracted or new_errored_match_result(scheduled.item.meta),
+            label=scheduled.label,
+        )
 
         run_result.matches.append(match_result)
         if settings.output_format != "json":
-            print(render_match(match_result, settings))
+            print(render_match(match_result, settings), flush=True)
+
+    def finish_all() -> None:
+        while len(in_flight) > 0:
+            finish_oldest()
+
+    try:
+        # outputs the finished ones before waiting for live arrivals
+        for scheduled in scheduler.iterate(on_idle=finish_all):
+            journal_key = new_journal_key(scheduled.item)
+            cached = None if journal_key is None else completed.get(journal_key)
+            in_flight.append(
+                (
+                    scheduled,
+                    journal_key,
+                    cached,
+                    __start_extraction(scheduled.item, cached, extract, submit),
+                )
+            )
+            # outputs in the scheduled order
+            if len(in_flight) >= in_flight_limit:
+                finish_oldest()
+        finish_all()
+    except KeyboardInterrupt:
+        if watcher is None:
+            raise
+        logger.info("=== WATCH STOPPED ===")
+
+    if executor is not None:
+        executor.shutdown(cancel_futures=True)
+    if batcher is not None:
+        batcher.close()
+    if pool is not None:
+        pool.shutdown()
+        for pid, unique in pool.unique_memory.items():
+            logger.info(f"Worker {pid}; unique memory: {format_bytes(unique)}")
+    if watcher is not None:
+        watcher.stop()
+    if ring is not None:
+        ring.close()
+    if journal is not None:
+        journal.close()
 
     run_ends_at = datetime.now()
     run_result.ends_at = run_ends_at.isoformat()
-    logger.info(f"=== RUN FINISHED; elapsed: {run_ends_at - run_starts_at} ===")
+    logger.info(
+        f"=== RUN FINISHED; elapsed: {run_ends_at - run_starts_at}, peak RSS: {format_bytes(get_peak_rss())} ==="
+    )
 
     if settings.output_format == "json":
         json_str = to_json_str(run_result)
@@ -87,7 +256,101 @@ def run(argv: Sequence[str] | None = None) -> None:
             print(json_str)
 
 
-def __set_logging(args: Args) -> None:
+def __read_student_dictionary(path: Path) -> StudentDictionary | None:
+    student_alias_pairs = read_student_dictionary_source_file(path)
+    if student_alias_pairs is None:
+        return None
+
+    student_dictionary: StudentDictionary = StudentDictionaryImpl(student_alias_pairs)
+    if not student_dictionary.validate():
+        return None
+    return student_dictionary
+
+
+# Outputs stored results again without OCR, matching them again if rematch
+def __render(arguments: Sequence[str]) -> None:
+    args = parse_render_args(arguments)
+    __set_logging(args)
+    logger.info(f"=> {args}")
+    if not validate_render_args(args):
+        sys.exit(1)
+
+    settings = new_render_settings_from(args)
+    logger.debug(f"=> {settings}")
+
+    student_dictionary: StudentDictionary | None = None
+    if args.dictionary is not None:
+        student_dictionary = __read_student_dictionary(args.dictionary)
+        if student_dictionary is None:
+            sys.exit(1)
+
+    def prepare(match_results: Iterable[MatchResult]) -> Iterable[MatchResult]:
+        if student_dictionary is None:
+            return match_results
+        return (
+            rematch_match_result(match_result, student_dictionary, settings.sp_sort)
+            for match_result in match_results
+        )
+
+    errored = False
+    for path in args.files:
+        path_str = path.as_posix()
+        try:
+            if path_str == "-":
+                stdin = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+                __write_rendered(
+                    prepare(read_stored_matches(stdin, "<stdin>")), settings
+                )
+            else:
+                with path.open(mode="r", encoding="utf-8") as file:
+                    __write_rendered(
+                        prepare(read_stored_matches(file, path_str)), settings
+                    )
+        except (OSError, UnicodeDecodeError) as e:
+            logger.error(f"{path_str} cannot be read; {e}")
+            errored = True
+    sys.stdout.flush()
+    if errored:
+        sys.exit(1)
+
+
+# written in blocks instead of flushing each row
+def __write_rendered(match_results: Iterable[MatchResult], settings: Settings) -> None:
+    sys.stdout.writelines(
+        render_match(match_result, settings) + "\n" for match_result in match_results
+    )
+
+
+# picklable to extract in worker processes
+type __Portable = Tuple[ImageMeta, FileEntry | bytes]
+# the cached result and the extraction; no extraction if cached
+type __InFlight = Tuple[
+    Scheduled[ImageSource],
+    JournalKey | None,
+    MatchResult | None,
+    Future[MatchResult | None] | None,
+]
+
+
+def __start_extraction(
+    source: ImageSource,
+    cached: MatchResult | None,
+    extract: Callable[[ImageSource], MatchResult | None],
+    submit: Callable[[ImageSource], Future[MatchResult | None] | None],
+) -> Future[MatchResult | None] | None:
+    if cached is not None:
+        logger.info(f"=== SKIP: {source.meta.path}; completed in the journal ===")
+        return None
+
+    future = submit(source)
+    if future is None:
+        # extracts in this thread without batching
+        future = Future()
+        future.set_result(extract(source))
+    return future
+
+
+def __set_logging(args: Args | RenderArgs) -> None:
     if args.verbose >= VERBOSE_PRINT:
         console_log_level = logging.DEBUG
     elif args.verbose == VERBOSE_ERROR:
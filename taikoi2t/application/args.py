@@ -1,15 +1,26 @@
 import argparse
 import logging
+import re
+from datetime import datetime, timedelta
 from pathlib import Path
+from types import MappingProxyType
 from typing import Sequence
 
 from taikoi2t import TAIKOI2T_VERSION
 from taikoi2t.application.column import COLUMN_DICTIONARY
-from taikoi2t.models.args import VERBOSE_SILENT, Args
+from taikoi2t.implements.runtime import is_fork_available
+from taikoi2t.models.args import VERBOSE_SILENT, Args, RenderArgs
 from taikoi2t.models.file import ALL_FILE_SORT_KEY_ORDERS
+from taikoi2t.models.reader import ALL_ENGINES
+from taikoi2t.models.stream import ALL_STREAM_FORMATS
 
 logger: logging.Logger = logging.getLogger("taikoi2t.args")
 
+# the first argument to render stored results instead of extracting images
+RENDER_COMMAND = "render"
+# the first argument to match stored results with the dictionary again and render them
+REMATCH_COMMAND = "rematch"
+
 
 def parse_args(args: Sequence[str]) -> Args:
     arg_parser = argparse.ArgumentParser(args[0] if len(args) > 0 else None)
@@ -21,6 +32,241 @@ def parse_args(args: Sequence[str]) -> Args:
         "-d", "--dictionary", type=Path, required=True, help="student dictionary (CSV)"
     )
 
+    __add_output_arguments(arg_parser)
+    arg_parser.add_argument(
+        "--no-sp-sort", action="store_true", help="turn off sorting specials"
+    )
+    arg_parser.add_argument(
+        "--file-sort",
+        type=str,
+        choices=sorted(ALL_FILE_SORT_KEY_ORDERS),
+        default=None,
+        help="sort input files (default: disabled)",
+    )
+    arg_parser.add_argument(
+        "--ext",
+        dest="extensions",
+        nargs="+",
+        help="select files matched with wildcards by extensions (e.g. png jpg)",
+    )
+    arg_parser.add_argument(
+        "--since",
+        type=__time_spec,
+        default=None,
+        help="select files matched with wildcards modified at or after this time (ISO 8601, or 30s, 10m, 2h, 1d before now)",
+    )
+    arg_parser.add_argument(
+        "--until",
+        type=__time_spec,
+        default=None,
+        help="select files matched with wildcards modified at or before this time (same format as --since)",
+    )
+    arg_parser.add_argument(
+        "--batch-images",
+        type=int,
+        default=1,
+        help="process this number of images at once and batch their OCR (default: 1)",
+    )
+    arg_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=64,
+        help="maximum number of cropped images in an OCR batch; reduced if memory is short (default: 64)",
+    )
+    arg_parser.add_argument(
+        "--batch-wait",
+        type=float,
+        default=20.0,
+        help="maximum milliseconds to wait for filling an OCR batch (default: 20)",
+    )
+    arg_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="process images in this number of worker processes sharing the loaded models (default: 1)",
+    )
+    arg_parser.add_argument(
+        "--threads",
+        type=int,
+        default=1,
+        help="process images in this number of threads sharing the loaded models; fastest on free-threaded Python (default: 1)",
+    )
+    arg_parser.add_argument(
+        "--engine",
+        type=str,
+        choices=sorted(ALL_ENGINES),
+        default="eager",
+        help="run the OCR recognizer as is or traced by TorchScript with warm-up (default: eager)",
+    )
+    arg_parser.add_argument(
+        "--model-cache",
+        type=Path,
+        default=None,
+        help="directory to cache OCR model weights for fast loading; not cached if omitted",
+    )
+    arg_parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep watching files matched with wildcards and process new ones first, newest first",
+    )
+    arg_parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=1.0,
+        help="seconds between polling files for --watch (default: 1.0)",
+    )
+    arg_parser.add_argument(
+        "--journal",
+        type=Path,
+        default=None,
+        help="append completed files and their results to this path (JSON Lines)",
+    )
+    arg_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="skip files completed in the journal and output their results again",
+    )
+    arg_parser.add_argument(
+        "--keep-ocr",
+        action="store_true",
+        help="keep raw OCR output of students in JSON and journal results to match them again by the rematch command",
+    )
+    arg_parser.add_argument(
+        "--lexicon",
+        action="store_true",
+        help="decode student names constrained to the dictionary before reading them freely",
+    )
+    arg_parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        help="maximum milliseconds for each image to retry students read with low confidence; results out of time are flagged",
+    )
+    arg_parser.add_argument(
+        "--reduced-decode",
+        action="store_true",
+        help="decode images at half scale if the result-box is large enough",
+    )
+    __add_log_arguments(arg_parser)
+    input_group = arg_parser.add_mutually_exclusive_group()
+    input_group.add_argument(
+        "--stdin",
+        type=str,
+        choices=sorted(ALL_STREAM_FORMATS),
+        default=None,
+        help="read images from stdin instead of files (encoded: length-prefixed image files, raw: BGR pixels with width and height)",
+    )
+    input_group.add_argument(
+        "--shm",
+        type=str,
+        default=None,
+        help="read BGR frames from the shared memory ring buffer of this name instead of files",
+    )
+    arg_parser.add_argument("files", type=Path, nargs="*", help="target images")
+
+    namespace = Args(Path(), False, [], False, False, False, False, None, 0, None, [])
+    parsed = arg_parser.parse_args(args=args[1:], namespace=namespace)
+    input_option = (
+        "--stdin" if parsed.stdin is not None else "--shm" if parsed.shm else None
+    )
+    if len(parsed.files) == 0 and input_option is None:
+        arg_parser.error("the following arguments are required: files")
+    if len(parsed.files) > 0 and input_option is not None:
+        arg_parser.error(f"argument files: not allowed with argument {input_option}")
+    if parsed.batch_images < 1:
+        arg_parser.error("argument --batch-images: must be positive")
+    if parsed.batch_size < 1:
+        arg_parser.error("argument --batch-size: must be positive")
+    if parsed.batch_wait < 0:
+        arg_parser.error("argument --batch-wait: must not be negative")
+    if parsed.workers < 1:
+        arg_parser.error("argument --workers: must be positive")
+    if parsed.workers > 1 and parsed.batch_images > 1:
+        arg_parser.error("argument --workers: not allowed with argument --batch-images")
+    if parsed.threads < 1:
+        arg_parser.error("argument --threads: must be positive")
+    if parsed.threads > 1 and parsed.batch_images > 1:
+        arg_parser.error("argument --threads: not allowed with argument --batch-images")
+    if parsed.threads > 1 and parsed.workers > 1:
+        arg_parser.error("argument --threads: not allowed with argument --workers")
+    if parsed.workers > 1 and not is_fork_available():
+        arg_parser.error("argument --workers: not supported on this platform")
+    if parsed.time_budget is not None and parsed.time_budget <= 0:
+        arg_parser.error("argument --time-budget: must be positive")
+    if parsed.watch and input_option is not None:
+        arg_parser.error(f"argument --watch: not allowed with argument {input_option}")
+    if parsed.watch_interval <= 0:
+        arg_parser.error("argument --watch-interval: must be positive")
+    if parsed.resume and parsed.journal is None:
+        arg_parser.error("argument --resume: requires argument --journal")
+    return parsed
+
+
+# `args` starts with the program and the render or rematch command
+def parse_render_args(args: Sequence[str]) -> RenderArgs:
+    rematch = len(args) > 1 and args[1] == REMATCH_COMMAND
+    arg_parser = argparse.ArgumentParser(
+        " ".join(args[0:2]) or None,
+        description="match results stored with --keep-ocr with the dictionary again and output them"
+        if rematch
+        else "output results stored by --json or --journal again in other columns and formats",
+    )
+    if rematch:
+        arg_parser.add_argument(
+            "-d",
+            "--dictionary",
+            type=Path,
+            required=True,
+            help="student dictionary (CSV)",
+        )
+    __add_output_arguments(arg_parser)
+    if rematch:
+        arg_parser.add_argument(
+            "--no-sp-sort", action="store_true", help="turn off sorting specials"
+        )
+    __add_log_arguments(arg_parser)
+    arg_parser.add_argument(
+        "files",
+        type=Path,
+        nargs="+",
+        help="stored results (JSON or JSON Lines); - for stdin",
+    )
+
+    namespace = RenderArgs(False, [], False, False, False, 0, None, [])
+    return arg_parser.parse_args(args=args[2:], namespace=namespace)
+
+
+# Returns False if there are critical errors
+def validate_args(args: Args) -> bool:
+    if not args.dictionary.exists():
+        logger.critical(f"Dictionary file {args.dictionary.as_posix()} is not found")
+        return False
+
+    if args.dictionary.suffix != ".csv":
+        logger.warning(f"{args.dictionary.as_posix()} has invalid suffix as CSV")
+
+    return __validate_columns(args.columns)
+
+
+# Returns False if there are critical errors
+def validate_render_args(args: RenderArgs) -> bool:
+    if args.dictionary is not None and not args.dictionary.exists():
+        logger.critical(f"Dictionary file {args.dictionary.as_posix()} is not found")
+        return False
+    return __validate_columns(args.columns)
+
+
+def __validate_columns(columns: Sequence[str]) -> bool:
+    unknown_columns: Sequence[str] = [
+        c for c in columns if c not in COLUMN_DICTIONARY.keys()
+    ]
+    if len(unknown_columns) > 0:
+        logger.critical(f"Unknown columns {', '.join(unknown_columns)}")
+        return False
+    return True
+
+
+def __add_output_arguments(arg_parser: argparse.ArgumentParser) -> None:
     column_group = arg_parser.add_mutually_exclusive_group()
     column_group.add_argument(
         "--opponent", action="store_true", help="include the name of opponent"
@@ -42,16 +288,9 @@ def parse_args(args: Sequence[str]) -> Args:
         action="store_true",
         help="turn off alias mapping for student's name",
     )
-    arg_parser.add_argument(
-        "--no-sp-sort", action="store_true", help="turn off sorting specials"
-    )
-    arg_parser.add_argument(
-        "--file-sort",
-        type=str,
-        choices=sorted(ALL_FILE_SORT_KEY_ORDERS),
-        default=None,
-        help="sort input files (default: disabled)",
-    )
+
+
+def __add_log_arguments(arg_parser: argparse.ArgumentParser) -> None:
     arg_parser.add_argument(
         "-v",
         "--verbose",
@@ -65,26 +304,19 @@ def parse_args(args: Sequence[str]) -> Args:
         default=None,
         help="output logs to this path (default: disabled)",
     )
-    arg_parser.add_argument("files", type=Path, nargs="+", help="target images")
 
-    namespace = Args(Path(), False, [], False, False, False, False, None, 0, None, [])
-    return arg_parser.parse_args(args=args[1:], namespace=namespace)
-
-
-# Returns False if there are critical errors
-def validate_args(args: Args) -> bool:
-    if not args.dictionary.exists():
-        logger.critical(f"Dictionary file {args.dictionary.as_posix()} is not found")
-        return False
 
-    if args.dictionary.suffix != ".csv":
-        logger.warning(f"{args.dictionary.as_posix()} has invalid suffix as CSV")
+__TIME_UNITS = MappingProxyType(
+    {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+)
 
-    unknown_columns: Sequence[str] = [
-        c for c in args.columns if c not in COLUMN_DICTIONARY.keys()
-    ]
-    if len(unknown_columns) > 0:
-        logger.critical(f"Unknown columns {', '.join(unknown_columns)}")
-        return False
 
-    return True
+def __time_spec(value: str) -> datetime:
+    relative = re.fullmatch(r"(\d+)([smhd])", value)
+    if relative is not None:
+        amount, unit = relative.groups()
+        return datetime.now() - timedelta(**{__TIME_UNITS[unit]: int(amount)})
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid time: '{value}'")
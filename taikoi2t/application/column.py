@@ -1,24 +1,32 @@
 from itertools import chain
-from typing import Dict, Optional, Sequence
+from types import MappingProxyType
+from typing import Mapping, Optional, Sequence
 
 from taikoi2t.models.column import Column
 
-DEFAULT_COLUMN_KEYS: Sequence[str] = ["PLAYER_WINS", "PLAYER_TEAM", "OPPONENT_TEAM"]
-OPPONENT_COLUMN_KEYS: Sequence[str] = [
+# module-level values are immutable to be shared by threads safely
+DEFAULT_COLUMN_KEYS: Sequence[str] = ("PLAYER_WINS", "PLAYER_TEAM", "OPPONENT_TEAM")
+OPPONENT_COLUMN_KEYS: Sequence[str] = (
     "PLAYER_WINS",
     "PLAYER_TEAM",
     "OPPONENT_NAME",
     "OPPONENT_TEAM",
-]
+)
 
-COLUMNS: Sequence[Column] = [
+COLUMNS: Sequence[Column] = (
     Column(["IMAGE_ID", "ID"], None, lambda m: [m.id]),
+    Column(["LABEL", "SEQUENCE", "SEQ"], None, lambda m: [__opt_str(m.label)]),
     Column(["IMAGE_PATH"], None, lambda m: [m.image.path]),
     Column(["IMAGE_NAME", "INAME"], None, lambda m: [m.image.name]),
     Column(["IMAGE_BIRTH_TIME"], None, lambda m: [__opt_int(m.image.birth_time_ns)]),
     Column(["IMAGE_MODIFY_TIME"], None, lambda m: [__opt_int(m.image.modify_time_ns)]),
     Column(["IMAGE_WIDTH"], None, lambda m: [__opt_int(m.image.width)]),
     Column(["IMAGE_HEIGHT"], None, lambda m: [__opt_int(m.image.height)]),
+    Column(
+        ["LOW_CONFIDENCE", "LOWCONF"],
+        "students",
+        lambda m: ["TRUE" if m.low_confidence else "FALSE"],
+    ),
     Column(
         ["PLAYER_WINS", "LEFT_WINS", "PWIN", "LWIN"],
         "win_or_lose",
@@ -158,11 +166,15 @@ COLUMNS: Sequence[Column] = [
         lambda m: [m.opponent.specials.special2],
     ),
     Column(["BLANK", "BL"], None, lambda _: [""]),
-]
+)
 
 
-COLUMN_DICTIONARY: Dict[str, Column] = dict(
-    chain.from_iterable([(key, column) for key in column.keys] for column in COLUMNS)
+COLUMN_DICTIONARY: Mapping[str, Column] = MappingProxyType(
+    dict(
+        chain.from_iterable(
+            [(key, column) for key in column.keys] for column in COLUMNS
+        )
+    )
 )
 
 
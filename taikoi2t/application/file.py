@@ -1,12 +1,28 @@
 import csv
 import logging
 from pathlib import Path
-from typing import List, Tuple
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Sequence, Tuple
+
+from taikoi2t.models.student import Role
 
 logger: logging.Logger = logging.getLogger("taikoi2t.file")
 
 
-def read_student_dictionary_source_file(path: Path) -> List[Tuple[str, str]] | None:
+ROLE_KEYWORDS: Mapping[str, Role] = MappingProxyType(
+    {
+        "striker": "STRIKER",
+        "special": "SPECIAL",
+        "ストライカー": "STRIKER",
+        "スペシャル": "SPECIAL",
+    }
+)
+
+
+# the 3rd column is the role if it is one of ROLE_KEYWORDS; ignored otherwise
+def read_student_dictionary_source_file(
+    path: Path,
+) -> List[Tuple[str, str, Optional[Role]]] | None:
     if not path.exists():
         logger.critical(f"{path.as_posix()} is not found")
         return None
@@ -14,7 +30,7 @@ def read_student_dictionary_source_file(path: Path) -> List[Tuple[str, str]] | N
         logger.critical(f"{path.as_posix()} is not a file")
         return None
 
-    rows: List[Tuple[str, str]] = []
+    rows: List[Tuple[str, str, Optional[Role]]] = []
     try:
         with path.open(mode="r", encoding="utf-8") as students_file:
             for index, row in enumerate(csv.reader(students_file)):
@@ -23,7 +39,9 @@ def read_student_dictionary_source_file(path: Path) -> List[Tuple[str, str]] | N
                 elif len(row[0]) == 0:
                     logger.warning(f"Empty name at line {index + 1}; {row}")
                 else:
-                    rows.append((row[0], row[1] if len(row) >= 2 else ""))
+                    rows.append(
+                        (row[0], row[1] if len(row) >= 2 else "", __parse_role(row))
+                    )
     except UnicodeDecodeError:
         logger.critical(f"{path.as_posix()} is invalid as an UTF-8 text")
         return None
@@ -32,3 +50,7 @@ def read_student_dictionary_source_file(path: Path) -> List[Tuple[str, str]] | N
         logger.critical(f"{path.as_posix()} is invalid as student's dictionary")
         return None
     return rows
+
+
+def __parse_role(row: Sequence[str]) -> Optional[Role]:
+    return ROLE_KEYWORDS.get(row[2].strip().lower()) if len(row) >= 3 else None
@@ -0,0 +1,126 @@
+import logging
+from typing import List, Tuple
+
+import cv2
+import numpy
+
+from taikoi2t.application.slot import (
+    SLOT_INK_MAX_VALUE,
+    SLOT_MAX_COMPONENT_HEIGHT_RATIO,
+    SLOT_MIN_COMPONENT_AREA,
+    SLOT_MIN_COMPONENT_HEIGHT_RATIO,
+)
+from taikoi2t.models.image import BoundingBox, Image
+
+logger: logging.Logger = logging.getLogger("taikoi2t.glyph")
+
+# based on the line height; names are in full-width characters about as wide as high
+# strokes are merged into a glyph up to this width, e.g. the 2 strokes of ハ
+GLYPH_MAX_WIDTH_RATIO: float = 1.2
+# runs wider than this are touching glyphs to be cut
+GLYPH_SPLIT_WIDTH_RATIO: float = 1.5
+# added around each glyph, as the detector does around texts
+GLYPH_MARGIN_RATIO: float = 0.1
+
+
+# Cuts a binarized tile into boxes of single characters without the detector.
+#
+# Connected components of ink make the text line, skipping noise and frames
+# taller than characters. The columns with ink in the line are cut at the blank
+# columns, the narrow runs are merged into glyphs of separated strokes, and
+# the wide runs of touching glyphs are cut at the columns with the least ink.
+# Returns the boxes from left to right; empty if no character-like ink is found.
+def segment_glyphs(tile: Image) -> List[BoundingBox]:
+    height, width = tile.shape[:2]
+    if height == 0 or width == 0:
+        return []
+
+    ink = (tile <= SLOT_INK_MAX_VALUE).astype(numpy.uint8)
+    try:
+        count, labels, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+    except Exception as e:
+        logger.error(e)
+        return []
+
+    # 0 is the background
+    tops = stats[1:, cv2.CC_STAT_TOP]
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+    bottoms = tops + heights
+    areas = stats[1:, cv2.CC_STAT_AREA]
+    inked = (areas >= SLOT_MIN_COMPONENT_AREA) & (
+        heights <= height * SLOT_MAX_COMPONENT_HEIGHT_RATIO
+    )
+    characters = inked & (heights >= height * SLOT_MIN_COMPONENT_HEIGHT_RATIO)
+    if not characters.any():
+        return []
+    # small parts like dakuten count if they are in the line
+    in_line = (
+        inked & (bottoms > tops[characters].min()) & (tops < bottoms[characters].max())
+    )
+    line = numpy.isin(labels, numpy.flatnonzero(in_line) + 1)
+    line_height = int(bottoms[in_line].max() - tops[in_line].min())
+
+    profile = line.sum(axis=0)
+    runs = __merge_strokes(__find_runs(profile > 0), line_height)
+    spans: List[Tuple[int, int]] = []
+    for left, right in runs:
+        spans += __split_touching(profile, left, right, line_height)
+
+    margin = round(line_height * GLYPH_MARGIN_RATIO)
+    boxes: List[BoundingBox] = []
+    for left, right in spans:
+        rows = numpy.flatnonzero(line[:, left:right].any(axis=1))
+        boxes.append(
+            BoundingBox(
+                left=max(0, left - margin),
+                top=max(0, int(rows[0]) - margin),
+                right=min(width, right + margin),
+                bottom=min(height, int(rows[-1]) + 1 + margin),
+            )
+        )
+    logger.debug(f"<Glyph> {[b.as_python_int() for b in boxes]}")
+    return boxes
+
+
+# [left, right) of each run of True
+def __find_runs(columns: numpy.typing.NDArray[numpy.bool_]) -> List[Tuple[int, int]]:
+    edges = numpy.diff(numpy.concatenate(([0], columns.astype(numpy.int8), [0])))
+    return list(
+        zip(
+            numpy.flatnonzero(edges == 1).tolist(),
+            numpy.flatnonzero(edges == -1).tolist(),
+        )
+    )
+
+
+def __merge_strokes(
+    runs: List[Tuple[int, int]], line_height: int
+) -> List[Tuple[int, int]]:
+    merged: List[Tuple[int, int]] = []
+    for left, right in runs:
+        if len(merged) > 0 and right - merged[-1][0] <= (
+            line_height * GLYPH_MAX_WIDTH_RATIO
+        ):
+            merged[-1] = (merged[-1][0], right)
+        else:
+            merged.append((left, right))
+    return merged
+
+
+# cuts near the evenly divided positions, at the columns with the least ink
+def __split_touching(
+    profile: numpy.typing.NDArray[numpy.int_], left: int, right: int, line_height: int
+) -> List[Tuple[int, int]]:
+    width = right - left
+    if width <= line_height * GLYPH_SPLIT_WIDTH_RATIO:
+        return [(left, right)]
+    glyphs = max(2, round(width / line_height))
+    pitch = width / glyphs
+    cuts = [left]
+    for i in range(1, glyphs):
+        # within a quarter of the pitch around the divided position
+        low = round(left + pitch * (i - 0.25))
+        high = round(left + pitch * (i + 0.25))
+        cuts.append(low + int(numpy.argmin(profile[low:high])))
+    cuts.append(right)
+    return list(zip(cuts[:-1], cuts[1:]))
@@ -1,34 +1,41 @@
+import dataclasses
 import logging
 import time
 from datetime import datetime
-from pathlib import Path
-from typing import Callable, Iterable, List, Tuple
+from typing import Callable, List, Tuple
 
 import easyocr  # type: ignore
 
 from taikoi2t.application.modal import find_modal
+from taikoi2t.application.slot import get_slot_roles, is_blank_slot
 from taikoi2t.application.student import (
+    CASCADE_MIN_CONFIDENCE,
+    OCR_MODAL_WIDTH,
     StudentDictionary,
+    match_student,
     preprocess_students_for_ocr,
-    recognize_student,
-    recognize_student_by_character,
+    read_students,
+    recognize_student_with_lexicon,
+    rematch_students,
+    retry_student,
 )
-from taikoi2t.application.wins import check_player_wins
+from taikoi2t.application.wins import check_player_wins, crop_player_wins
 from taikoi2t.implements.image import (
     convert_to_grayscale,
     get_roi_bbox,
-    new_image_meta,
-    read_image,
     show_bboxes,
 )
 from taikoi2t.implements.match import get_match_id
-from taikoi2t.implements.ocr import read_text_from_roi
+from taikoi2t.implements.ocr import new_ocr_texts, read_text_from_roi
 from taikoi2t.implements.settings import Settings
+from taikoi2t.implements.student import new_empty_student
 from taikoi2t.implements.team import new_team_from, sort_specials
 from taikoi2t.models.args import VERBOSE_IMAGE, VERBOSE_PRINT
 from taikoi2t.models.column import Requirement
-from taikoi2t.models.image import Image, RelativeBox
+from taikoi2t.models.image import Image, ImageMeta, ModalImage, RelativeBox
 from taikoi2t.models.match import MatchResult
+from taikoi2t.models.ocr import OCRText, SlotRecognition
+from taikoi2t.models.source import ImageSource
 from taikoi2t.models.student import Student
 from taikoi2t.models.team import Team
 
@@ -37,32 +44,34 @@ logger: logging.Logger = logging.getLogger("taikoi2t.match")
 __PLAYER_NAME_RELATIVE = RelativeBox(left=6 / 19, top=1 / 7, right=1 / 2, bottom=1 / 5)
 __OPPONENT_NAME_RELATIVE = RelativeBox(left=5 / 6, top=1 / 7, right=1, bottom=1 / 5)
 
+REDUCED_DECODE_SCALE: int = 2
+# The students are resized to OCR_MODAL_WIDTH before OCR, so a smaller result-box
+# only means a larger upscale. The result-box of a 1080p screenshot (about 2130px)
+# is upscaled about 1.9x and read well; a reduced image is used while its upscale
+# stays within 2.5x, i.e. about 3/4 of that result-box width.
+REDUCED_DECODE_MAX_UPSCALE: float = 2.5
+REDUCED_DECODE_MIN_MODAL_WIDTH: int = round(
+    OCR_MODAL_WIDTH / REDUCED_DECODE_MAX_UPSCALE
+)
+
 
-def extract_match_result_from_path(
-    path: Path,
+def extract_match_result_from_source(
+    source: ImageSource,
     dictionary: StudentDictionary,
     reader: easyocr.Reader,
     settings: Settings,
 ) -> MatchResult | None:
     image_process_starts_at = datetime.now()
-    path_str = path.as_posix()
-    match_id: str = get_match_id(time.time_ns(), path.name)
+    path_str = source.meta.path
+    match_id: str = get_match_id(time.time_ns(), source.meta.name)
     logger.info(f"=== START: {path_str}; id: {match_id} ===")
 
-    if not path.exists():
-        logger.error(f"{path_str} is not found")
-        return None
-    if not path.is_file():
-        logger.error(f"{path_str} is not a file")
-        return None
-
-    source = read_image(path)
-    if source is None:
-        logger.error(f"{path_str} cannot read as an image")
+    modal_image = read_modal_image(source, settings)
+    if modal_image is None:
         return None
 
-    match_result = extract_match_result(
-        match_id, path, source, dictionary, reader, settings
+    match_result = extract_match_result_from_modal_image(
+        match_id, source.meta, modal_image, dictionary, reader, settings
     )
 
     logger.info(f"{path_str} => {match_result}")
@@ -73,15 +82,61 @@ def extract_match_result_from_path(
     return match_result
 
 
+def read_modal_image(source: ImageSource, settings: Settings) -> ModalImage | None:
+    try:
+        return __read_modal_image(source, settings)
+    finally:
+        if source.release is not None:
+            source.release()
+
+
+def __read_modal_image(source: ImageSource, settings: Settings) -> ModalImage | None:
+    path_str = source.meta.path
+
+    if settings.reduced_decode:
+        reduced = source.load(REDUCED_DECODE_SCALE)
+        modal_image = (
+            None
+            if reduced is None
+            else prepare_modal_image(reduced, path_str, settings, REDUCED_DECODE_SCALE)
+        )
+        del reduced
+        if (
+            modal_image is not None
+            and modal_image.modal.width >= REDUCED_DECODE_MIN_MODAL_WIDTH
+        ):
+            return modal_image
+        # falls back to full scale; the result-box may be too small or not found
+        logger.info(f"Cannot use the reduced scale image of {path_str}")
+
+    image = source.load(1)
+    if image is None:
+        logger.error(f"{path_str} cannot read as an image")
+        return None
+    return prepare_modal_image(image, path_str, settings)
+
+
 def extract_match_result(
     match_id: str,
-    image_path: Path,
+    image_meta: ImageMeta,
     source: Image,
     dictionary: StudentDictionary,
     reader: easyocr.Reader,
     settings: Settings,
 ) -> MatchResult | None:
-    image_path_str = image_path.as_posix()
+    modal_image = prepare_modal_image(source, image_meta.path, settings)
+    del source  # the caller may still hold it, but this frame does not need it anymore
+    if modal_image is None:
+        return None
+    return extract_match_result_from_modal_image(
+        match_id, image_meta, modal_image, dictionary, reader, settings
+    )
+
+
+# crops everything needed from the colored source so that it can be released early
+def prepare_modal_image(
+    source: Image, image_path_str: str, settings: Settings, scale: int = 1
+) -> ModalImage | None:
     grayscale = convert_to_grayscale(source)  # for OCR
     if grayscale is None:
         return None
@@ -93,32 +148,109 @@ def extract_match_result(
     if settings.verbose >= VERBOSE_IMAGE:
         show_bboxes(source, [modal])
 
+    image_height, image_width = source.shape[:2]
+    return ModalImage(
+        grayscale=grayscale,
+        modal=modal,
+        # cropped from the colored source because checking win or lose uses mean saturation of the region
+        wins=crop_player_wins(source, modal),
+        width=image_width * scale,
+        height=image_height * scale,
+        scale=scale,
+    )
+
+
+def extract_match_result_from_modal_image(
+    match_id: str,
+    image_meta: ImageMeta,
+    modal_image: ModalImage,
+    dictionary: StudentDictionary,
+    reader: easyocr.Reader,
+    settings: Settings,
+) -> MatchResult:
+    image_path_str = image_meta.path
+    grayscale = modal_image.grayscale
+    modal = modal_image.modal
+
     player_team: Team
     opponent_team: Team
+    recognitions: List[SlotRecognition] = []
+    low_confidence_slots: List[int] = []
+    # the retries of students stop after the budget from here
+    deadline = (
+        None
+        if settings.time_budget is None
+        else time.monotonic() + settings.time_budget
+    )
 
     def process_students() -> Tuple[Team, Team] | None:
         preprocessed_images = preprocess_students_for_ocr(grayscale, modal)
         if len(preprocessed_images) == 0:
             return None
 
-        first_recognized_students: Iterable[Student] = [
-            recognize_student(reader, dictionary, image, settings.verbose)
-            for image in preprocessed_images
+        blanks = [is_blank_slot(image) for image in preprocessed_images]
+        roles = get_slot_roles(blanks)
+        decoded: List[Tuple[Student, OCRText] | None] = [
+            None
+            if blank or not settings.lexicon
+            else recognize_student_with_lexicon(reader, dictionary, image, role)
+            for image, blank, role in zip(preprocessed_images, blanks, roles)
         ]
+        # the slots decoded with the lexicon are not read again
+        texts = read_students(
+            reader,
+            dictionary,
+            preprocessed_images,
+            [blank or d is not None for blank, d in zip(blanks, decoded)],
+            roles,
+        )
 
         second_recognized_students: List[Student] = []
-        for index, (image, first_recognized) in enumerate(
-            zip(preprocessed_images, first_recognized_students)
+        for index, (image, chars, blank, role, lexicon) in enumerate(
+            zip(preprocessed_images, texts, blanks, roles, decoded)
         ):
-            second_recognized: Student = first_recognized
+            if lexicon is not None:
+                second_recognized_students.append(lexicon[0])
+                if lexicon[1].confidence < CASCADE_MIN_CONFIDENCE:
+                    low_confidence_slots.append(index)
+                if settings.keep_ocr:
+                    recognitions.append(SlotRecognition(role, blank, [lexicon[1]]))
+                continue
+            if blank:
+                second_recognized_students.append(new_empty_student())
+                if settings.keep_ocr:
+                    recognitions.append(SlotRecognition(role, blank, []))
+                continue
+
+            first_recognized = match_student(
+                dictionary, image, chars, settings.verbose, role
+            )
             if first_recognized.is_error:
-                logger.info(
-                    f"!! Recognition error at {index}. Retrying it by single character."
-                )
-                second_recognized = recognize_student_by_character(
-                    reader, dictionary, image, settings.verbose
+                logger.info(f"!! Recognition error at {index}. Retrying it.")
+            cascaded = retry_student(
+                reader,
+                dictionary,
+                image,
+                first_recognized,
+                chars,
+                settings.verbose,
+                role,
+                deadline,
+            )
+            second_recognized_students.append(cascaded.student)
+            if cascaded.low_confidence:
+                low_confidence_slots.append(index)
+            if settings.keep_ocr:
+                recognitions.append(
+                    SlotRecognition(
+                        role,
+                        blank,
+                        new_ocr_texts(cascaded.chars),
+                        None
+                        if cascaded.by_character is None
+                        else new_ocr_texts(cascaded.by_character),
+                    )
                 )
-            second_recognized_students.append(second_recognized)
 
         return (
             new_team_from(second_recognized_students[0:6]),
@@ -137,9 +269,8 @@ def extract_match_result(
     else:
         logger.info(f"--- SKIP sp_sort ({image_path_str}) ---")
 
-    # passes colored source image because checking win or lose uses mean saturation of the region
     player_wins = __run_process(
-        lambda: check_player_wins(source, modal),
+        lambda: check_player_wins(modal_image.wins),
         "win_or_lose",
         image_path_str,
         settings,
@@ -169,9 +300,44 @@ def extract_match_result(
         settings,
     )
 
-    image_height, image_width = source.shape[:2]
-    image_meta = new_image_meta(image_path, (image_width, image_height), modal)
-    return MatchResult(match_id, image_meta, player=player_team, opponent=opponent_team)
+    return MatchResult(
+        match_id,
+        dataclasses.replace(
+            image_meta,
+            width=modal_image.width,
+            height=modal_image.height,
+            modal=modal.scaled(modal_image.scale),
+        ),
+        player=player_team,
+        opponent=opponent_team,
+        # no slots are read if students are not required
+        recognitions=recognitions if len(recognitions) > 0 else None,
+        low_confidence=len(low_confidence_slots) > 0,
+    )
+
+
+# Matches the kept OCR output with the dictionary again without reading the image.
+# The results without the kept output are returned as they are.
+def rematch_match_result(
+    match_result: MatchResult, dictionary: StudentDictionary, sp_sort: bool
+) -> MatchResult:
+    if match_result.recognitions is None:
+        logger.warning(f"No OCR output is kept for {match_result.image.path}")
+        return match_result
+
+    students = rematch_students(dictionary, match_result.recognitions)
+    teams: List[Team] = []
+    for team, team_students in (
+        (match_result.player, students[0:6]),
+        (match_result.opponent, students[6:12]),
+    ):
+        rematched = new_team_from(team_students)
+        if sp_sort:
+            rematched.specials = sort_specials(rematched.specials)
+        rematched.wins = team.wins
+        rematched.owner = team.owner
+        teams.append(rematched)
+    return dataclasses.replace(match_result, player=teams[0], opponent=teams[1])
 
 
 def __run_process[Ret](
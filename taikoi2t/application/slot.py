@@ -0,0 +1,71 @@
+import logging
+from typing import List, Optional, Sequence
+
+import cv2
+import numpy
+
+from taikoi2t.models.image import Image
+from taikoi2t.models.student import Role
+
+logger: logging.Logger = logging.getLogger("taikoi2t.slot")
+
+SLOTS_IN_TEAM: int = 6
+STRIKERS_IN_TEAM: int = 4
+
+# binarized tiles have dark text on white
+SLOT_INK_MAX_VALUE: int = 127
+# less ink than this ratio is never a name
+SLOT_MIN_INK_RATIO: float = 0.002
+# connected components smaller than this are noise
+SLOT_MIN_COMPONENT_AREA: int = 20
+# based on the tile height; taller ones are frames or edges, not characters
+SLOT_MIN_COMPONENT_HEIGHT_RATIO: float = 0.1
+SLOT_MAX_COMPONENT_HEIGHT_RATIO: float = 0.9
+
+
+# checks a binarized tile before OCR; True if no character-like ink is found
+def is_blank_slot(tile: Image) -> bool:
+    height, width = tile.shape[:2]
+    if height == 0 or width == 0:
+        return True
+
+    ink = (tile <= SLOT_INK_MAX_VALUE).astype(numpy.uint8)
+    ink_ratio = float(ink.mean())
+    if ink_ratio < SLOT_MIN_INK_RATIO:
+        logger.debug(f"<Slot> blank by ink ratio {ink_ratio:.4f}")
+        return True
+
+    try:
+        count, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+    except Exception as e:
+        logger.error(e)
+        return False  # leaves it to OCR
+
+    min_height = height * SLOT_MIN_COMPONENT_HEIGHT_RATIO
+    max_height = height * SLOT_MAX_COMPONENT_HEIGHT_RATIO
+    for label in range(1, count):  # 0 is the background
+        component_height = stats[label, cv2.CC_STAT_HEIGHT]
+        if (
+            stats[label, cv2.CC_STAT_AREA] >= SLOT_MIN_COMPONENT_AREA
+            and min_height <= component_height <= max_height
+        ):
+            return False
+
+    logger.debug(f"<Slot> blank by no character-like components in {count - 1}")
+    return True
+
+
+# roles by the slot position; None for the teams with blank slots,
+# because the specials of short teams may be placed in the striker slots
+def get_slot_roles(blanks: Sequence[bool]) -> List[Optional[Role]]:
+    roles: List[Optional[Role]] = []
+    for index in range(len(blanks)):
+        team_start = index - index % SLOTS_IN_TEAM
+        team = blanks[team_start : team_start + SLOTS_IN_TEAM]
+        if len(team) < SLOTS_IN_TEAM or any(team):
+            roles.append(None)
+        elif index % SLOTS_IN_TEAM < STRIKERS_IN_TEAM:
+            roles.append("STRIKER")
+        else:
+            roles.append("SPECIAL")
+    return roles
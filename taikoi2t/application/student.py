@@ -1,13 +1,18 @@
 import dataclasses
 import itertools
 import logging
+import math
+import threading
+import time
 from dataclasses import dataclass
-from typing import Callable, Counter, Dict, Iterable, List, Sequence, Tuple
+from typing import Callable, Counter, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import easyocr  # type: ignore
-import rapidfuzz
-from rapidfuzz import process
+from rapidfuzz.distance import Levenshtein
 
+from taikoi2t.application.glyph import segment_glyphs
+from taikoi2t.application.modal import RESULT_ASPECT_RATIO
+from taikoi2t.implements.fuzzy import FuzzyIndex, weighted_distance
 from taikoi2t.implements.image import (
     binarize,
     crop,
@@ -17,49 +22,80 @@ from taikoi2t.implements.image import (
     show_bboxes,
     skew,
     smooth,
+    thicken,
+    thin,
 )
-from taikoi2t.implements.ocr import join_chars
+from taikoi2t.implements.lexicon import best_path_log_probability, decode_with_lexicon
+from taikoi2t.implements.ocr import join_chars, join_ocr_texts, read_texts_batched
 from taikoi2t.implements.student import (
+    diacritic_substitution_cost,
     new_empty_student,
     new_error_student,
     normalize_student_name,
     remove_diacritics,
+    to_ocr_student_name,
 )
 from taikoi2t.models.args import (
     VERBOSE_IMAGE,
 )
 from taikoi2t.models.image import BoundingBox, Image
-from taikoi2t.models.ocr import Character
-from taikoi2t.models.student import Student, StudentDictionary
+from taikoi2t.models.lexicon import NameTrie
+from taikoi2t.models.ocr import Character, OCRText, SlotRecognition
+from taikoi2t.models.student import (
+    DEFAULT_STUDENT_INDEX,
+    Role,
+    Student,
+    StudentDictionary,
+)
 
 logger: logging.Logger = logging.getLogger("taikoi2t.student")
 
-STUDENT_EXACT_MATCH_SCORE: float = 0.95
+# names decoded with the lexicon less likely than this relative to
+# the best path without it are read and matched in the usual way
+LEXICON_MIN_CONFIDENCE: float = 0.05
+# reads less confident than this are retried even if they are matched
+CASCADE_MIN_CONFIDENCE: float = 0.3
 # reject 0.5 or less
 STUDENT_PRIMARY_CUTOFF_SCORE: float = 0.51
 # reject if 1 letter in 3 letter name is different
 STUDENT_SECONDARY_CUTOFF_SCORE: float = 0.67
+# nearest neighbors farther than this are not looked for
+STUDENT_NEIGHBOR_RADIUS_CAP: float = 3.0
+
+
+type StudentSource = Tuple[str, str] | Tuple[str, str, Optional[Role]]
 
 
 class StudentDictionaryImpl(StudentDictionary):
-    def __init__(self, raw: Iterable[Tuple[str, str]]) -> None:
-        normalized = [(normalize_student_name(r[0]), r[1]) for r in raw]
+    def __init__(self, raw: Iterable[StudentSource]) -> None:
+        normalized = [
+            (normalize_student_name(r[0]), r[1], r[2] if len(r) > 2 else None)
+            for r in raw
+        ]
 
-        self.ordered_names: List[str] = [pair[0] for pair in normalized]
+        self.ordered_names: List[str] = [row[0] for row in normalized]
         self.no_diacritics_names: List[str] = [
             remove_diacritics(n) for n in self.ordered_names
         ]
-        self.allow_char_list: str = (
-            "".join(
-                set("".join(self.ordered_names + self.no_diacritics_names))
-                - set("（）")
-            )
-            + "()"
+        self.allow_char_list: str = self.__to_allow_char_list(
+            self.ordered_names + self.no_diacritics_names
         )
         self.alias_mapping: Dict[str, str] = dict(
-            filter(lambda p: p[1] != "", normalized)
+            (row[0], row[1]) for row in normalized if row[1] != ""
         )
 
+        # students without roles are candidates for any role
+        self.candidates: Dict[Optional[Role], _Candidates] = {
+            None: self.__new_candidates(
+                self.ordered_names, list(range(len(self.ordered_names)))
+            )
+        }
+        for role in set(row[2] for row in normalized if row[2] is not None):
+            indices = [i for i, row in enumerate(normalized) if row[2] in (role, None)]
+            self.candidates[role] = self.__new_candidates(
+                [self.ordered_names[i] for i in indices], indices
+            )
+
         self.logger: logging.Logger = logging.getLogger(
             "taikoi2t.student.StudentDictionary"
         )
@@ -76,80 +112,152 @@ class StudentDictionaryImpl(StudentDictionary):
             )
         return True  # currently always returns True
 
-    def get_allow_char_list(self) -> str:
-        return self.allow_char_list
+    def get_allow_char_list(self, role: Optional[Role] = None) -> str:
+        return self.__candidates_for(role).allow_char_list
+
+    def get_lexicon(self, role: Optional[Role] = None) -> NameTrie:
+        return self.__candidates_for(role).lexicon
+
+    def get_student(self, index: int) -> Student:
+        return self.__new_student_by(index)
 
-    def match(self, recognized_text: str) -> Student:
+    def match(self, recognized_text: str, role: Optional[Role] = None) -> Student:
         if recognized_text == "":
             return new_empty_student()  # empty
 
-        raw_results: Sequence[_ExtractResult] = [
-            _ExtractResult(name, score, index)
-            for name, score, index in process.extract(
-                recognized_text,
-                self.ordered_names,
-                scorer=rapidfuzz.distance.Levenshtein.normalized_similarity,
-                score_cutoff=STUDENT_PRIMARY_CUTOFF_SCORE,
+        candidates = self.__candidates_for(role)
+        length = len(recognized_text)
+        no_diacritics_text = remove_diacritics(recognized_text)
+        # diacritic substitutions cost nothing without diacritics,
+        # so the scores without them are the upper bounds of the weighted scores
+        bounded: List[Tuple[float, int, int]] = [  # (bound, position, distance)
+            (
+                bound,
+                position,
+                round((1 - bound) * max(length, len(candidates.names[position]))),
+            )
+            for position, bound in candidates.index.extract(
+                no_diacritics_text, STUDENT_PRIMARY_CUTOFF_SCORE
             )
         ]
-        self.logger.debug(f"<Raw> {recognized_text} => {raw_results}")
 
-        raw_first: _ExtractResult | None = (
-            raw_results[0] if len(raw_results) > 0 else None
+        results: List[_ExtractResult] = []
+        for bound, position, no_diacritics_distance in bounded:
+            # the rest cannot take the place of the best matched one
+            if (
+                len(results) > 0
+                and results[0].score >= STUDENT_SECONDARY_CUTOFF_SCORE
+                and bound < results[0].score
+            ):
+                break
+            name = candidates.names[position]
+            distance = self.__weighted_distance(
+                recognized_text, name, no_diacritics_distance
+            )
+            score = 1 - distance / max(length, len(name))
+            if score < STUDENT_PRIMARY_CUTOFF_SCORE:
+                continue
+            result = _ExtractResult(name, score, candidates.indices[position])
+
+            # other names are at least (radius - distance) away from the text,
+            # so they score length / (length + radius - distance) at most
+            if score >= STUDENT_SECONDARY_CUTOFF_SCORE:
+                radius = self.__radius_of(candidates, position)
+                if radius > distance and score > length / (length + radius - distance):
+                    self.logger.debug(f"<Nearest> {recognized_text} => {result}")
+                    return self.__new_student_by(result.index)  # unambiguously matched
+            results.append(result)
+            results.sort(key=lambda r: (-r.score, r.index))
+
+        self.logger.debug(f"<Scan> {recognized_text} => {results}")
+
+        match results:
+            case []:
+                return new_error_student()  # no students to match
+            case [first]:
+                return self.__new_student_by(first.index)  # matched
+            case [first, *_] if first.score >= STUDENT_SECONDARY_CUTOFF_SCORE:
+                return self.__new_student_by(first.index)  # matched
+            case _:
+                return new_error_student()  # ambiguous results
+
+    @staticmethod
+    def __new_candidates(names: Sequence[str], indices: Sequence[int]) -> "_Candidates":
+        no_diacritics_names = [remove_diacritics(n) for n in names]
+        return _Candidates(
+            names,
+            no_diacritics_names,
+            FuzzyIndex(no_diacritics_names),
+            {},
+            threading.Lock(),
+            indices,
+            StudentDictionaryImpl.__to_allow_char_list(names + no_diacritics_names),
+            # missing diacritics are read as the same student
+            NameTrie(
+                [
+                    (to_ocr_student_name(name), indices[position])
+                    for position, name in enumerate(names)
+                ]
+                + [
+                    (to_ocr_student_name(name), indices[position])
+                    for position, name in enumerate(no_diacritics_names)
+                ]
+            ),
         )
-        if raw_first is not None and raw_first.score > STUDENT_EXACT_MATCH_SCORE:
-            return self.__new_student_by(raw_first.index)  # exact matched
 
-        # taking care of missing diacritics in OCR
-        # re-matching without diacritics
-        no_diacritics_text = remove_diacritics(recognized_text)
-        no_diacritics_results: Sequence[_ExtractResult] = [
-            _ExtractResult(name, score, index)
-            for name, score, index in process.extract(
-                no_diacritics_text,
-                self.no_diacritics_names,
-                scorer=rapidfuzz.distance.Levenshtein.normalized_similarity,
-                score_cutoff=STUDENT_PRIMARY_CUTOFF_SCORE,
+    # distance to the nearest other name, capped for pruning;
+    # computed when the name is matched first, since most names never are
+    @staticmethod
+    def __radius_of(candidates: "_Candidates", position: int) -> float:
+        with candidates.lock:
+            radius = candidates.radii.get(position)
+        if radius is not None:
+            return radius
+        name = candidates.names[position]
+        no_diacritics_name = candidates.no_diacritics_names[position]
+        neighbors = sorted(
+            (
+                Levenshtein.distance(
+                    no_diacritics_name, candidates.no_diacritics_names[p]
+                ),
+                p,
             )
-        ]
-        self.logger.debug(
-            f"<No-diacritics> {no_diacritics_text} => {no_diacritics_results}"
+            for p in candidates.index.neighbors(
+                no_diacritics_name, STUDENT_NEIGHBOR_RADIUS_CAP
+            )
+            if p != position
         )
-
-        no_diacritics_first: _ExtractResult | None
-        match no_diacritics_results:
-            # diacritics-removed names may be duplicates
-            case [first, second, *_] if first.name == second.name:
-                no_diacritics_first = None  # ignore results
-            case [first, *_]:
-                no_diacritics_first = first
-            case _:
-                no_diacritics_first = None
-
-        if (
-            no_diacritics_first is not None
-            and no_diacritics_first.score > STUDENT_EXACT_MATCH_SCORE
-        ):
-            return self.__new_student_by(no_diacritics_first.index)  # exact matched
-
-        first_matched: _ExtractResult
-        results: Sequence[_ExtractResult]
-        match (raw_first, no_diacritics_first):
-            case (None, None):
-                return new_error_student()  # no students to match
-            case (None, _):
-                first_matched, results = no_diacritics_first, no_diacritics_results
-            case (_, None):
-                first_matched, results = raw_first, raw_results
-            case (_, _) if raw_first.score >= no_diacritics_first.score:
-                first_matched, results = raw_first, raw_results
-            case (_, _):
-                first_matched, results = no_diacritics_first, no_diacritics_results
-
-        if len(results) == 1 or first_matched.score >= STUDENT_SECONDARY_CUTOFF_SCORE:
-            return self.__new_student_by(first_matched.index)  # matched
-        else:
-            return new_error_student()  # ambiguous results
+        radius = STUDENT_NEIGHBOR_RADIUS_CAP
+        for no_diacritics_distance, p in neighbors:
+            if no_diacritics_distance >= radius:
+                break  # the rest are not nearer
+            radius = min(
+                radius,
+                StudentDictionaryImpl.__weighted_distance(
+                    name, candidates.names[p], no_diacritics_distance
+                ),
+            )
+        # threads finding the same radius at once store the same value
+        with candidates.lock:
+            candidates.radii[position] = radius
+        return radius
+
+    # The distance without diacritics <= the weighted distance <= the distance,
+    # so the weighted one is computed only if the others are different
+    @staticmethod
+    def __weighted_distance(s1: str, s2: str, no_diacritics_distance: int) -> float:
+        distance = Levenshtein.distance(s1, s2)
+        if distance == no_diacritics_distance:
+            return distance
+        return weighted_distance(s1, s2, diacritic_substitution_cost)
+
+    @staticmethod
+    def __to_allow_char_list(names: Iterable[str]) -> str:
+        return "".join(set("".join(names)) - set("（）")) + "()"
+
+    def __candidates_for(self, role: Optional[Role]) -> "_Candidates":
+        # all students if no students have the role
+        return self.candidates.get(role, self.candidates[None])
 
     def __new_student_by(self, index: int) -> Student:
         if index < 0 or index >= len(self.ordered_names):
@@ -159,6 +267,18 @@ class StudentDictionaryImpl(StudentDictionary):
             return Student(index, name, self.alias_mapping.get(name))
 
 
+@dataclass(frozen=True)
+class _Candidates:
+    names: Sequence[str]
+    no_diacritics_names: Sequence[str]
+    index: FuzzyIndex  # of names without diacritics
+    radii: Dict[int, float]  # to the nearest neighbors by positions, filled lazily
+    lock: threading.Lock  # for the radii
+    indices: Sequence[int]  # in the dictionary
+    allow_char_list: str
+    lexicon: NameTrie
+
+
 @dataclass(frozen=True)
 class _ExtractResult:
     name: str
@@ -177,7 +297,7 @@ STUDENTS_HORIZONTAL_PITCH: int = 245
 TEAM_WIDTH: int = STUDENTS_HORIZONTAL_PITCH * 6
 PLAYER_TEAM_LEFT_X: int = 216
 OPPONENT_TEAM_LEFT_X: int = OCR_MODAL_WIDTH // 2 + 292
-STUDENTS_LEFT_XS: Iterable[int] = list(
+STUDENTS_LEFT_XS: Iterable[int] = tuple(
     itertools.chain(
         range(
             PLAYER_TEAM_LEFT_X,
@@ -192,14 +312,27 @@ STUDENTS_LEFT_XS: Iterable[int] = list(
     )
 )
 
-OCR_PREPROCESS: Iterable[Callable[[Image], Image | None]] = [
+# (height, width) of a preprocessed tile of a student
+STUDENT_TILE_SHAPE: Tuple[int, int] = (
+    round(OCR_MODAL_WIDTH / RESULT_ASPECT_RATIO * FOOTER_HEIGHT_RATIO),
+    STUDENTS_HORIZONTAL_PITCH,
+)
+
+OCR_PREPROCESS: Iterable[Callable[[Image], Image | None]] = (
     lambda src: resize_to(src, OCR_MODAL_WIDTH),
     lambda src: skew(src, 14.0),
     lambda src: smooth(src, 9),
     lambda src: sharpen(src, 2),
     lambda src: level_contrast(src, 144, 192),
     lambda src: binarize(src),
-]
+)
+
+
+# cheap variants of a preprocessed tile to read again, in order
+CASCADE_VARIANTS: Sequence[Callable[[Image], Image | None]] = (
+    lambda src: thicken(src, 3),
+    lambda src: thin(src, 2),
+)
 
 
 def preprocess_students_for_ocr(grayscale: Image, modal: BoundingBox) -> List[Image]:
@@ -229,28 +362,53 @@ def preprocess_students_for_ocr(grayscale: Image, modal: BoundingBox) -> List[Im
     return results
 
 
-def recognize_student(
+# Returns the characters of each slot read at once; no characters for blank slots
+def read_students(
     reader: easyocr.Reader,
     dictionary: StudentDictionary,
-    preprocessed_image: Image,
-    verbose: int = 0,
+    preprocessed_images: Sequence[Image],
+    blanks: Sequence[bool],
+    roles: Sequence[Optional[Role]],
+) -> List[Sequence[Character]]:
+    # blank slots are empty students without OCR
+    if any(blanks):
+        logger.info(
+            f"<OCR pre> Blank slots at {[i for i, b in enumerate(blanks) if b]}"
+        )
+
+    texts: List[Sequence[Character]] = [[] for _ in preprocessed_images]
+    # slots of the same role share the allowlist, so they are read together
+    for role in dict.fromkeys(roles):
+        indices = [
+            i
+            for i, (blank, slot_role) in enumerate(zip(blanks, roles))
+            if not blank and slot_role == role
+        ]
+        if len(indices) == 0:
+            continue
+        batched = read_texts_batched(
+            reader,
+            [preprocessed_images[i] for i in indices],
+            allowlist=dictionary.get_allow_char_list(role),
+            mag_ratio=2,
+        )
+        for index, chars in zip(indices, batched):
+            texts[index] = chars
+    return texts
+
+
+def match_student(
+    dictionary: StudentDictionary,
+    preprocessed_image: Image | None,
+    chars: Sequence[Character],
+    verbose: int,
+    role: Optional[Role],
 ) -> Student:
-    chars: Sequence[Character] = []
-    height, width = preprocessed_image.shape[:2]
-    if width > 0 and height > 0:
-        try:
-            chars = reader.readtext(  # type: ignore
-                preprocessed_image,
-                allowlist=dictionary.get_allow_char_list(),
-                mag_ratio=2,
-            )
-        except Exception as e:
-            logger.error(e)
     if len(chars) == 0:
         return new_error_student()
 
     logger.debug(f"<OCR read> {[(char[1], float(char[2])) for char in chars]}")
-    if verbose >= VERBOSE_IMAGE:
+    if verbose >= VERBOSE_IMAGE and preprocessed_image is not None:
         bboxes = [
             BoundingBox(char[0][0][0], char[0][0][1], char[0][2][0], char[0][2][1])
             for char in chars
@@ -258,59 +416,216 @@ def recognize_student(
         show_bboxes(preprocessed_image, bboxes, to_bgr=True)
 
     name = normalize_student_name(join_chars(chars))
-    return dictionary.match(name)
+    return dictionary.match(name, role)
 
 
-CHAR_VERTICAL_PADDING: float = 0.2
-CHAR_HEIGHT_RATIO: float = 1 - CHAR_VERTICAL_PADDING
+# the weakest text of the read; 0 if nothing is read
+def get_read_confidence(chars: Sequence[Character]) -> float:
+    return min((float(char[2]) for char in chars), default=0.0)
 
 
-def recognize_student_by_character(
+@dataclass(frozen=True)
+class CascadeResult:
+    student: Student
+    chars: Sequence[Character]  # of the best read at once
+    by_character: Sequence[Character] | None  # None if not retried
+    low_confidence: bool
+
+
+# Retries a slot read at once if it is not matched, or if it is read with low
+# confidence and `deadline` (time.monotonic()) is given.
+#
+# Within the deadline, cheap variants of the tile are read again first; each of
+# them costs another full read, so without the deadline an unmatched slot goes
+# straight to the fallback and a low confidence one is only flagged. The slot is
+# read by single character only if it is not matched yet. A matched read
+# replaces an unmatched one, and a more confident read of the same student
+# replaces a matched one. Another student replaces a matched one only if it is
+# read with confidence.
+# The retries stop at `deadline` and the best read so far is returned with
+# the low confidence flag.
+def retry_student(
     reader: easyocr.Reader,
     dictionary: StudentDictionary,
     preprocessed_image: Image,
+    student: Student,
+    chars: Sequence[Character],
     verbose: int = 0,
-) -> Student:
-    # in order to solve the type in Pylance
-    horizontal_list: List[List[__OCRTextBox]] = []
-    try:
-        horizontal_list, _ = reader.detect(  # type: ignore
-            preprocessed_image, mag_ratio=2
+    role: Optional[Role] = None,
+    deadline: float | None = None,
+) -> CascadeResult:
+    best_student, best_chars = student, chars
+    best_confidence = get_read_confidence(chars)
+
+    def confident() -> bool:
+        return __is_matched(best_student) and best_confidence >= CASCADE_MIN_CONFIDENCE
+
+    def result(by_character: Sequence[Character] | None = None) -> CascadeResult:
+        return CascadeResult(best_student, best_chars, by_character, not confident())
+
+    variants = CASCADE_VARIANTS if deadline is not None else ()
+    for index, variant in enumerate(variants):
+        if confident():
+            return result()
+        if __is_over(deadline):
+            logger.info(f"<Cascade> out of time before variant {index}")
+            return result()
+        varied = variant(preprocessed_image)
+        if varied is None:
+            continue
+        varied_chars = read_texts_batched(
+            reader,
+            [varied],
+            allowlist=dictionary.get_allow_char_list(role),
+            mag_ratio=2,
+        )[0]
+        varied_student = match_student(dictionary, varied, varied_chars, verbose, role)
+        varied_confidence = get_read_confidence(varied_chars)
+        logger.debug(
+            f"<Cascade> variant {index}: {varied_student.name} ({varied_confidence:.3f})"
         )
-    except Exception as e:
-        logger.error(e)
-    if len(horizontal_list) == 0:
-        return new_error_student()
+        if __is_matched(varied_student) and (
+            not __is_matched(best_student)
+            or (
+                varied_confidence > best_confidence
+                and (
+                    varied_student.index == best_student.index
+                    or varied_confidence >= CASCADE_MIN_CONFIDENCE
+                )
+            )
+        ):
+            best_student, best_chars = varied_student, varied_chars
+            best_confidence = varied_confidence
+
+    # the most expensive; only for the slots not matched yet
+    if __is_matched(best_student):
+        return result()
+    if __is_over(deadline):
+        logger.info("<Cascade> out of time before reading by single character")
+        return result()
+    logger.info("<Cascade> retrying by single character")
+    by_character = read_student_by_character(
+        reader, dictionary, preprocessed_image, verbose, role
+    )
+    by_character_student = match_student_by_character(dictionary, by_character, role)
+    if __is_matched(by_character_student) and by_character is not None:
+        best_student = by_character_student
+        best_confidence = get_read_confidence(by_character)
+    return result(by_character)
+
+
+# neither errors nor empty texts read from non-blank slots
+def __is_matched(student: Student) -> bool:
+    return student.index != DEFAULT_STUDENT_INDEX
+
+
+def __is_over(deadline: float | None) -> bool:
+    return deadline is not None and time.monotonic() >= deadline
+
 
-    detected_text_boxes: Iterable[__OCRTextBox] = horizontal_list[0]
-    logger.debug(
-        f"<OCR detect> {[tuple(int(i) for i in b) for b in detected_text_boxes]}"
+# Decodes the recognizer output of the slot into a name in the dictionary directly.
+#
+# The confidence is the probability of the name relative to the best path without
+# the lexicon. Returns None if no names are decoded or the confidence is too low,
+# then the slot should be read and matched in the usual way.
+def recognize_student_with_lexicon(
+    reader: easyocr.Reader,
+    dictionary: StudentDictionary,
+    preprocessed_image: Image,
+    role: Optional[Role] = None,
+) -> Tuple[Student, OCRText] | None:
+    height, width = preprocessed_image.shape[:2]
+    if width == 0 or height == 0:
+        return None
+    # only OCRSession exposes the recognizer output
+    probabilities = reader.read_text_probabilities(  # type: ignore
+        preprocessed_image, dictionary.get_allow_char_list(role), mag_ratio=2
     )
+    if probabilities is None:
+        return None
+    decoded = decode_with_lexicon(
+        probabilities, dictionary.get_lexicon(role), reader.class_by_char
+    )
+    if decoded is None:
+        return None
 
-    single_char_boxes: List[BoundingBox] = []
-    for left, right, top, bottom in detected_text_boxes:
-        width = right - left
-        height = bottom - top
-        char_count: int = round(width / (height * CHAR_HEIGHT_RATIO))
-
-        if char_count >= 2:
-            single_char_width: int = width // char_count
-            single_char_boxes += [
-                BoundingBox(
-                    left=left + single_char_width * i,
-                    top=top,
-                    right=left + single_char_width * (i + 1),
-                    bottom=bottom,
-                )
-                for i in range(char_count)
-            ]
-        else:
-            single_char_boxes.append(
-                BoundingBox(left=left, top=top, right=right, bottom=bottom)
+    word, index, log_probability = decoded
+    confidence = min(
+        1.0, math.exp(log_probability - best_path_log_probability(probabilities))
+    )
+    logger.debug(f"<OCR lexicon> {word} ({confidence:.3f})")
+    if confidence < LEXICON_MIN_CONFIDENCE:
+        return None
+    # the whole slot since the boxes are decoded together
+    return dictionary.get_student(index), OCRText(
+        word, confidence, BoundingBox(0, 0, width, height)
+    )
+
+
+# The same as `match_student` and the retries of `match_student_by_character`
+# but from the kept OCR output, so that the slots are matched with another dictionary
+def rematch_students(
+    dictionary: StudentDictionary, recognitions: Sequence[SlotRecognition]
+) -> List[Student]:
+    students: List[Student] = []
+    for recognition in recognitions:
+        if recognition.blank:
+            students.append(new_empty_student())
+            continue
+        student = (
+            new_error_student()
+            if len(recognition.texts) == 0
+            else dictionary.match(
+                normalize_student_name(join_ocr_texts(recognition.texts)),
+                recognition.role,
             )
-    logger.debug(
-        f"<OCR detect> single_char_boxes: {[b.as_python_int() for b in single_char_boxes]}"
+        )
+        if student.is_error and recognition.by_character is not None:
+            student = dictionary.match(
+                normalize_student_name(join_ocr_texts(recognition.by_character)),
+                recognition.role,
+            )
+        students.append(student)
+    return students
+
+
+def recognize_student_by_character(
+    reader: easyocr.Reader,
+    dictionary: StudentDictionary,
+    preprocessed_image: Image,
+    verbose: int = 0,
+    role: Optional[Role] = None,
+) -> Student:
+    chars = read_student_by_character(
+        reader, dictionary, preprocessed_image, verbose, role
     )
+    return match_student_by_character(dictionary, chars, role)
+
+
+# `chars` is None if no texts are detected
+def match_student_by_character(
+    dictionary: StudentDictionary,
+    chars: Sequence[Character] | None,
+    role: Optional[Role],
+) -> Student:
+    if chars is None:
+        return new_error_student()
+    name = normalize_student_name(join_chars(chars))
+    return dictionary.match(name, role)
+
+
+# Returns None if no texts are detected
+def read_student_by_character(
+    reader: easyocr.Reader,
+    dictionary: StudentDictionary,
+    preprocessed_image: Image,
+    verbose: int = 0,
+    role: Optional[Role] = None,
+) -> Sequence[Character] | None:
+    # the tile is already binarized, so the glyphs are found without the detector
+    single_char_boxes = segment_glyphs(preprocessed_image)
+    if len(single_char_boxes) == 0:
+        return None
 
     chars: List[Character] = []
     for box in single_char_boxes:
@@ -319,7 +634,7 @@ def recognize_student_by_character(
         try:
             chars += reader.recognize(  # type: ignore
                 crop(preprocessed_image, box),
-                allowlist=dictionary.get_allow_char_list(),
+                allowlist=dictionary.get_allow_char_list(role),
             )
         except Exception as e:
             logger.error(e)
@@ -328,9 +643,4 @@ def recognize_student_by_character(
     logger.debug(f"<OCR recognize> {[(char[1], float(char[2])) for char in chars]}")
     if verbose >= VERBOSE_IMAGE:
         show_bboxes(preprocessed_image, single_char_boxes, to_bgr=True)
-
-    name = normalize_student_name(join_chars(chars))
-    return dictionary.match(name)
-
-
-type __OCRTextBox = Tuple[int, int, int, int]
+    return chars
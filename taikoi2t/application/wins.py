@@ -10,8 +10,12 @@ logger: logging.Logger = logging.getLogger("taikoi2t.wins")
 __PLAYER_WINS_RELATIVE = RelativeBox(left=1 / 12, top=1 / 5, right=1 / 6, bottom=1 / 4)
 
 
-def check_player_wins(colored_source: Image, modal: BoundingBox) -> bool:
-    cropped = crop(colored_source, get_roi_bbox(modal, __PLAYER_WINS_RELATIVE))
+# copies the region in order not to keep the whole colored source alive
+def crop_player_wins(colored_source: Image, modal: BoundingBox) -> Image:
+    return crop(colored_source, get_roi_bbox(modal, __PLAYER_WINS_RELATIVE)).copy()
+
+
+def check_player_wins(cropped: Image) -> bool:
     try:
         mean_saturation: int = cv2.mean(cv2.cvtColor(cropped, cv2.COLOR_BGR2HSV))[1]
         # 'Win' has more vivid color than 'Lose'
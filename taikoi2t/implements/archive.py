@@ -0,0 +1,84 @@
+import logging
+import tarfile
+import time
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import Iterable, Iterator
+
+from taikoi2t.implements.image import new_image_meta
+from taikoi2t.implements.source import new_encoded_source, new_file_source
+from taikoi2t.models.file import FileEntry
+from taikoi2t.models.image import ImageMeta
+from taikoi2t.models.source import ImageSource
+
+logger: logging.Logger = logging.getLogger("taikoi2t.archive")
+
+ARCHIVE_SUFFIXES: Iterable[str] = (".zip", ".tar", ".tar.gz", ".tgz")
+ARCHIVE_IMAGE_SUFFIXES: Iterable[str] = (".png", ".jpg", ".jpeg", ".bmp", ".webp")
+ARCHIVE_SEPARATOR: str = "!"
+
+
+def is_archive(path: Path) -> bool:
+    name = path.name.lower()
+    return any(name.endswith(suffix) for suffix in ARCHIVE_SUFFIXES)
+
+
+def iterate_sources(entries: Iterable[FileEntry]) -> Iterator[ImageSource]:
+    for entry in entries:
+        if is_archive(entry.path):
+            yield from read_archive_sources(entry.path)
+        else:
+            yield new_file_source(entry)
+
+
+# members are read one by one in the stored order
+def read_archive_sources(path: Path) -> Iterator[ImageSource]:
+    path_str = path.as_posix()
+    try:
+        if path.name.lower().endswith(".zip"):
+            yield from __read_zip_sources(path)
+        else:
+            yield from __read_tar_sources(path)
+    except Exception as e:  # broken or missing archives
+        logger.error(f"{path_str} cannot read as an archive; {e}")
+        # outputs an error row for the archive itself
+        yield ImageSource(new_image_meta(path), lambda _: None)
+
+
+def __read_zip_sources(path: Path) -> Iterator[ImageSource]:
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if info.is_dir() or not __is_image_member(info.filename):
+                continue
+            mtime_ns = int(time.mktime((*info.date_time, 0, 0, -1)) * 1_000_000_000)
+            meta = __new_member_meta(path, info.filename, mtime_ns)
+            yield new_encoded_source(meta, archive.read(info))
+
+
+def __read_tar_sources(path: Path) -> Iterator[ImageSource]:
+    # stream mode does not seek, so compressed archives are decompressed only once
+    with tarfile.open(path, mode="r|*") as archive:
+        for member in archive:
+            if not member.isfile() or not __is_image_member(member.name):
+                continue
+            extracted = archive.extractfile(member)
+            if extracted is None:
+                continue
+            meta = __new_member_meta(path, member.name, member.mtime * 1_000_000_000)
+            yield new_encoded_source(meta, extracted.read())
+
+
+def __is_image_member(name: str) -> bool:
+    return PurePosixPath(name).suffix.lower() in ARCHIVE_IMAGE_SUFFIXES
+
+
+def __new_member_meta(archive_path: Path, member: str, mtime_ns: int) -> ImageMeta:
+    return ImageMeta(
+        path=f"{archive_path.as_posix()}{ARCHIVE_SEPARATOR}{member}",
+        name=PurePosixPath(member).name,
+        birth_time_ns=None,
+        modify_time_ns=mtime_ns,
+        width=None,
+        height=None,
+        modal=None,
+    )
@@ -0,0 +1,162 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+import easyocr  # type: ignore
+
+from taikoi2t.implements.memory import get_available_memory
+from taikoi2t.implements.ocr import read_texts_batched
+from taikoi2t.models.image import Image
+from taikoi2t.models.ocr import Character
+
+logger: logging.Logger = logging.getLogger("taikoi2t.batch")
+
+# rough peak memory of the detector per input pixel (after magnified)
+DETECTOR_BYTES_PER_PIXEL: int = 256
+# the batch is limited to use up to this ratio of the available memory
+BATCH_MEMORY_RATIO: float = 0.5
+
+
+@dataclass
+class _BatchRequest:
+    images: Sequence[Image]
+    kwargs: Dict[str, Any]
+    arrived_at: float
+    results: List[Sequence[Character]] = field(default_factory=list)
+    error: Exception | None = None
+    done: threading.Event = field(default_factory=threading.Event)
+
+    @property
+    def key(self) -> Tuple[Tuple[str, Any], ...]:
+        return tuple(sorted(self.kwargs.items()))
+
+
+# Shares a reader among threads and merges their calls into larger batches.
+# Used in place of the reader; `readtext` and `readtext_batched` are batched.
+class RecognizerBatcher:
+    def __init__(self, reader: easyocr.Reader, max_batch: int, max_wait: float) -> None:
+        self.reader: easyocr.Reader = reader
+        self.max_batch: int = max_batch  # in images
+        self.max_wait: float = max_wait  # in seconds from the first request
+        self.reader_lock: threading.Lock = threading.Lock()
+        self.condition: threading.Condition = threading.Condition()
+        self.pending: List[_BatchRequest] = []
+        self.closed: bool = False
+        self.thread: threading.Thread = threading.Thread(target=self.__run, daemon=True)
+        self.thread.start()
+
+    def readtext(self, image: Image, **kwargs: Any) -> Sequence[Character]:
+        return self.readtext_batched([image], **kwargs)[0]
+
+    # blocks until the batch including these images is processed
+    def readtext_batched(
+        self, images: Sequence[Image], **kwargs: Any
+    ) -> List[Sequence[Character]]:
+        request = _BatchRequest(images, kwargs, time.monotonic())
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("RecognizerBatcher is closed")
+            self.pending.append(request)
+            self.condition.notify()
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.results
+
+    # not batched
+    def detect(self, *args: Any, **kwargs: Any) -> Any:
+        with self.reader_lock:
+            return self.reader.detect(*args, **kwargs)
+
+    # not batched
+    def recognize(self, *args: Any, **kwargs: Any) -> Any:
+        with self.reader_lock:
+            return self.reader.recognize(*args, **kwargs)
+
+    # not batched; only for OCRSession
+    def read_text_probabilities(self, *args: Any, **kwargs: Any) -> Any:
+        with self.reader_lock:
+            return self.reader.read_text_probabilities(*args, **kwargs)
+
+    @property
+    def class_by_char(self) -> Mapping[str, int]:
+        return self.reader.class_by_char
+
+    def close(self) -> None:
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.thread.join()
+
+    def batch_limit(self, images: Sequence[Image], mag_ratio: float) -> int:
+        available = get_available_memory()
+        largest = max((image.size for image in images), default=0)
+        if available is None or largest == 0:
+            return self.max_batch
+        per_image = largest * mag_ratio * mag_ratio * DETECTOR_BYTES_PER_PIXEL
+        by_memory = int(available * BATCH_MEMORY_RATIO / per_image)
+        return max(1, min(self.max_batch, by_memory))
+
+    def __run(self) -> None:
+        while True:
+            requests: List[_BatchRequest] = []
+            try:
+                with self.condition:
+                    while len(self.pending) == 0 and not self.closed:
+                        self.condition.wait()
+                    if len(self.pending) == 0:
+                        return  # closed
+                    deadline = self.pending[0].arrived_at + self.max_wait
+                    while (
+                        sum(len(r.images) for r in self.pending) < self.max_batch
+                        and not self.closed
+                    ):
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self.condition.wait(remaining)
+                    requests, self.pending = self.pending, []
+                self.__process(requests)
+            except Exception as e:
+                # never leaves callers waiting for a dead thread
+                logger.error(e)
+                with self.condition:
+                    requests, self.pending = requests + self.pending, []
+                for request in requests:
+                    if not request.done.is_set():
+                        request.error = e
+                        request.done.set()
+
+    def __process(self, requests: List[_BatchRequest]) -> None:
+        groups: Dict[Tuple[Tuple[str, Any], ...], List[_BatchRequest]] = {}
+        for request in requests:
+            groups.setdefault(request.key, []).append(request)
+
+        for group in groups.values():
+            try:
+                images = [image for r in group for image in r.images]
+                kwargs = group[0].kwargs
+                limit = self.batch_limit(images, kwargs.get("mag_ratio", 1.0))
+                texts: List[Sequence[Character]] = []
+                for start in range(0, len(images), limit):
+                    with self.reader_lock:
+                        texts.extend(
+                            read_texts_batched(
+                                self.reader, images[start : start + limit], **kwargs
+                            )
+                        )
+                logger.debug(
+                    f"<Batch> {len(images)} images from {len(group)} requests (limit: {limit})"
+                )
+                for request in group:
+                    request.results = texts[: len(request.images)]
+                    texts = texts[len(request.images) :]
+            except Exception as e:
+                logger.error(e)
+                for request in group:
+                    request.error = e
+            finally:
+                for request in group:
+                    request.done.set()
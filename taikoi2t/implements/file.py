@@ -1,33 +1,160 @@
-import glob
+import fnmatch
+import os
+import stat
 from dataclasses import dataclass
-from itertools import filterfalse
+from datetime import datetime
 from pathlib import Path
-from typing import Callable, Iterable, List
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, cast
 
-from taikoi2t.models.file import FileSortKeyOrder
+from taikoi2t.models.args import Args
+from taikoi2t.models.file import FileEntry, FileFilter, FileSortKeyOrder
+
+
+def new_file_entry(path: Path) -> FileEntry:
+    try:
+        return FileEntry(path, path.stat())
+    except OSError:
+        return FileEntry(path, None)
+
+
+def is_regular_file(entry: FileEntry) -> bool:
+    return entry.stat is not None and stat.S_ISREG(entry.stat.st_mode)
+
+
+# st_birthtime_ns is not available on some platforms (e.g. Linux)
+def get_birth_time_ns(entry: FileEntry) -> Optional[int]:
+    return None if entry.stat is None else getattr(entry.stat, "st_birthtime_ns", None)
+
+
+def get_modify_time_ns(entry: FileEntry) -> Optional[int]:
+    return None if entry.stat is None else entry.stat.st_mtime_ns
+
+
+def new_file_filter_from(args: Args) -> FileFilter:
+    return FileFilter(
+        extensions=[
+            ext.lower() if ext.startswith(".") else f".{ext.lower()}"
+            for ext in args.extensions
+        ],
+        since_ns=None if args.since is None else __to_ns(args.since),
+        until_ns=None if args.until is None else __to_ns(args.until),
+    )
+
+
+def __to_ns(time: datetime) -> int:
+    return int(time.timestamp() * 1_000_000) * 1_000  # in microseconds precision
 
 
 def expand_paths(paths: Iterable[Path]) -> List[Path]:
-    expanded: List[Path] = []
+    return [entry.path for entry in discover_files(paths)]
+
+
+# expands wildcards (`*`, `**` for any depth) with a single stat per file
+def discover_files(
+    paths: Iterable[Path], file_filter: FileFilter | None = None
+) -> List[FileEntry]:
+    discovered: List[FileEntry] = []
     for path in paths:
-        path_str = path.as_posix()
-        if "*" in path_str:  # wildcard
-            expanded.extend(map(Path, sorted(glob.glob(path_str))))
+        if "*" in path.as_posix():  # wildcard
+            matched: Dict[str, FileEntry] = dict(
+                (str(entry.path), entry) for entry in __scan_pattern(path)
+            )
+            discovered.extend(
+                entry
+                for _, entry in sorted(matched.items())
+                if file_filter is None or __accepts(entry, file_filter)
+            )
         else:
-            expanded.append(path)
-    return expanded
+            discovered.append(new_file_entry(path))
+    return discovered
+
+
+def __scan_pattern(pattern: Path) -> Iterator[FileEntry]:
+    parts = pattern.parts
+    first_magic = next(i for i, part in enumerate(parts) if "*" in part)
+    base = Path(*parts[:first_magic]) if first_magic > 0 else Path()
+    return __match_parts(base, parts[first_magic:])
+
+
+def __match_parts(base: Path, parts: Sequence[str]) -> Iterator[FileEntry]:
+    part, rest = parts[0], parts[1:]
+    if part == "**":
+        # matches zero or more directories; `**` at the end matches all files
+        yield from __match_parts(base, rest if len(rest) > 0 else ["*"])
+        for entry in __scandir(base):
+            # symlinks to directories are not followed as they may loop
+            if entry.is_dir(follow_symlinks=False) and not entry.name.startswith("."):
+                yield from __match_parts(base / entry.name, parts)
+    elif "*" not in part:
+        if len(rest) > 0:
+            yield from __match_parts(base / part, rest)
+        else:
+            file_entry = new_file_entry(base / part)
+            if is_regular_file(file_entry):
+                yield file_entry
+    else:
+        for entry in __scandir(base):
+            # hidden files are ignored as glob does
+            if entry.name.startswith(".") and not part.startswith("."):
+                continue
+            if not fnmatch.fnmatch(entry.name, part):
+                continue
+            if len(rest) > 0:
+                if entry.is_dir():
+                    yield from __match_parts(base / entry.name, rest)
+            elif entry.is_file():
+                # DirEntry caches the stat (Windows gets it from the directory listing)
+                yield FileEntry(base / entry.name, entry.stat())
+
+
+def __scandir(directory: Path) -> List[os.DirEntry[str]]:
+    try:
+        with os.scandir(directory) as entries:
+            return list(entries)
+    except OSError:  # not found, not a directory or permission denied
+        return []
+
+
+def __accepts(entry: FileEntry, file_filter: FileFilter) -> bool:
+    if (
+        len(file_filter.extensions) > 0
+        and entry.path.suffix.lower() not in file_filter.extensions
+    ):
+        return False
+    mtime = get_modify_time_ns(entry)
+    if file_filter.since_ns is not None and (
+        mtime is None or mtime < file_filter.since_ns
+    ):
+        return False
+    if file_filter.until_ns is not None and (
+        mtime is None or mtime > file_filter.until_ns
+    ):
+        return False
+    return True
 
 
 def sort_files(paths: Iterable[Path], order_by: FileSortKeyOrder) -> List[Path]:
+    entries = [new_file_entry(path) for path in paths]
+    return [entry.path for entry in sort_file_entries(entries, order_by)]
+
+
+def sort_file_entries(
+    entries: Iterable[FileEntry], order_by: FileSortKeyOrder
+) -> List[FileEntry]:
     sort_key = __SORT_KEYS[order_by]
-    sortables = (
-        list(filter(lambda p: p.exists(), paths)) if sort_key.needs_stat else paths
-    )
-    un_sortables = (
-        list(filterfalse(lambda p: p.exists(), paths)) if sort_key.needs_stat else []
-    )
+    sortables: List[FileEntry] = []
+    un_sortables: List[FileEntry] = []
+    for entry in entries:
+        if sort_key.selector(entry) is None:
+            un_sortables.append(entry)
+        else:
+            sortables.append(entry)
     return (
-        sorted(sortables, key=sort_key.selector, reverse=sort_key.reverse)
+        sorted(
+            sortables,
+            key=lambda e: cast(int | str, sort_key.selector(e)),
+            reverse=sort_key.reverse,
+        )
         + un_sortables
     )
 
@@ -35,33 +162,19 @@ def sort_files(paths: Iterable[Path], order_by: FileSortKeyOrder) -> List[Path]:
 @dataclass(frozen=True)
 class __SortKey:
     key_order: FileSortKeyOrder
-    selector: Callable[[Path], int | str]
+    # returns None if the entry cannot be sorted
+    selector: Callable[[FileEntry], int | str | None]
     reverse: bool
-    needs_stat: bool
 
 
 __SORT_KEYS = dict(
     (s.key_order, s)
     for s in [
-        __SortKey(
-            "MODIFY_ASC", lambda p: p.stat().st_mtime_ns, reverse=False, needs_stat=True
-        ),
-        __SortKey(
-            "MODIFY_DESC", lambda p: p.stat().st_mtime_ns, reverse=True, needs_stat=True
-        ),
-        __SortKey(
-            "BIRTH_ASC",
-            lambda p: p.stat().st_birthtime_ns,
-            reverse=False,
-            needs_stat=True,
-        ),
-        __SortKey(
-            "BIRTH_DESC",
-            lambda p: p.stat().st_birthtime_ns,
-            reverse=True,
-            needs_stat=True,
-        ),
-        __SortKey("NAME_ASC", lambda p: p.name, reverse=False, needs_stat=False),
-        __SortKey("NAME_DESC", lambda p: p.name, reverse=True, needs_stat=False),
+        __SortKey("MODIFY_ASC", get_modify_time_ns, reverse=False),
+        __SortKey("MODIFY_DESC", get_modify_time_ns, reverse=True),
+        __SortKey("BIRTH_ASC", get_birth_time_ns, reverse=False),
+        __SortKey("BIRTH_DESC", get_birth_time_ns, reverse=True),
+        __SortKey("NAME_ASC", lambda e: e.path.name, reverse=False),
+        __SortKey("NAME_DESC", lambda e: e.path.name, reverse=True),
     ]
 )
@@ -0,0 +1,193 @@
+import math
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy
+from rapidfuzz import process
+from rapidfuzz.distance import Levenshtein
+
+# cost to substitute the first character with the second one
+type SubstitutionCost = Callable[[str, str], float]
+
+# keeps borderline candidates against rounding errors of the scorer
+_BOUND_TOLERANCE: float = 1e-9
+# fewer choices are scanned by rapidfuzz, which is faster than pruning them by numpy
+FUZZY_INDEX_MIN_CHOICES: int = 1000
+
+# postings of 1 / this of the choices or more are looked up by membership arrays;
+# each choice is in a few postings, so there are few such postings
+_DENSE_POSTING_RATIO: int = 16
+
+
+# Inverted index of characters over the choices.
+#
+# Each edit changes at most one character of the multiset, so
+# Levenshtein distance >= max(len(a), len(b)) - (common characters of a and b),
+# and normalized similarity <= common / max(len(a), len(b)).
+#
+# A choice sharing `required` of the n characters of the query is in at least one of
+# any (n - required + 1) postings of them, so the candidates are taken from the
+# shortest ones only and looked up in the others. The long postings of common
+# characters are never scanned; they are looked up by dense membership arrays.
+class FuzzyIndex:
+    def __init__(self, choices: Sequence[str]) -> None:
+        self.choices: Sequence[str] = choices
+        self.lengths: numpy.typing.NDArray[numpy.int64] = numpy.array(
+            [len(choice) for choice in choices], dtype=numpy.int64
+        )
+        # postings[char][n] has the choices which have `char` more than n times,
+        # so that min(count in the query, count in a choice) is counted without weights
+        postings: Dict[str, List[List[int]]] = {}
+        for index, choice in enumerate(choices):
+            for char, count in Counter(choice).items():
+                levels = postings.setdefault(char, [])
+                levels.extend([] for _ in range(count - len(levels)))
+                for level in levels[:count]:
+                    level.append(index)
+        self.postings: Dict[str, List[_Posting]] = dict(
+            (char, [self.__new_posting(level) for level in levels])
+            for char, levels in postings.items()
+        )
+
+    def __len__(self) -> int:
+        return len(self.choices)
+
+    # Returns (index, normalized Levenshtein similarity) of the choices scoring
+    # `score_cutoff` or more, in descending order of the score then the index
+    def extract(self, query: str, score_cutoff: float) -> List[Tuple[int, float]]:
+        # few choices are scanned at once faster than pruned
+        candidates = (
+            None
+            if len(self.choices) < FUZZY_INDEX_MIN_CHOICES
+            else self.candidates(query, score_cutoff)
+        )
+        results = process.extract(
+            query,
+            self.choices
+            if candidates is None
+            else [self.choices[index] for index in candidates],
+            scorer=Levenshtein.normalized_similarity,
+            score_cutoff=score_cutoff,
+            limit=None,
+        )
+        # ties are in the order of the choices
+        return [
+            (index if candidates is None else candidates[index], score)
+            for _, score, index in results
+        ]
+
+    # Returns indices of the choices which may score `score_cutoff` or more, in order
+    def candidates(self, query: str, score_cutoff: float) -> List[int]:
+        if score_cutoff <= 0:
+            return list(range(len(self.choices)))  # all choices pass
+        if query == "":
+            # an empty query is similar to empty choices only
+            return numpy.flatnonzero(self.lengths == 0).tolist()
+
+        # choices no longer than the query need the fewest common characters
+        found, common = self.__count_common(
+            query, math.ceil(score_cutoff * len(query) - _BOUND_TOLERANCE)
+        )
+        bounds = common + _BOUND_TOLERANCE >= score_cutoff * numpy.maximum(
+            len(query), self.lengths[found]
+        )
+        return found[bounds].tolist()
+
+    # Returns indices of the choices which may be within `max_distance`, in order
+    def neighbors(self, query: str, max_distance: float) -> List[int]:
+        found, common = self.__count_common(
+            query, math.ceil(len(query) - max_distance - _BOUND_TOLERANCE)
+        )
+        distances = numpy.maximum(len(query), self.lengths[found]) - common
+        return found[distances <= max_distance].tolist()
+
+    # Returns the choices sharing `required` characters with the query or more
+    # (and maybe less) in order, and the number of the common characters of each
+    def __count_common(
+        self, query: str, required: int
+    ) -> Tuple[numpy.typing.NDArray[numpy.int64], numpy.typing.NDArray[numpy.int64]]:
+        postings = sorted(
+            (
+                levels[level] if level < len(levels) else _NO_POSTING
+                for char, count in Counter(query).items()
+                for levels in [self.postings.get(char, [])]
+                for level in range(count)
+            ),
+            key=lambda posting: len(posting.indices),
+        )
+        if required <= 0:
+            # choices without common characters may pass, so all are counted
+            common = numpy.zeros(len(self.choices), dtype=numpy.int64)
+            for posting in postings:
+                common[posting.indices] += 1
+            return numpy.arange(len(self.choices), dtype=numpy.int64), common
+
+        shortest = len(postings) - required + 1
+        found, common = numpy.unique(
+            numpy.concatenate([posting.indices for posting in postings[:shortest]]),
+            return_counts=True,
+        )
+        rest = postings[shortest:]
+        for checked, posting in enumerate(rest):
+            # drops the choices which cannot be required even in all the rest
+            alive = common + (len(rest) - checked) >= required
+            found, common = found[alive], common[alive]
+            if len(found) == 0:
+                break
+            common += posting.contains(found)
+        return found, common
+
+    def __new_posting(self, indices: List[int]) -> "_Posting":
+        array = numpy.array(indices, dtype=numpy.int64)
+        if len(indices) * _DENSE_POSTING_RATIO < len(self.choices):
+            return _Posting(array, None)
+        members = numpy.zeros(len(self.choices), dtype=numpy.bool_)
+        members[array] = True
+        return _Posting(array, members)
+
+
+# choices in a posting in order; long ones have the membership of all choices too
+@dataclass(frozen=True)
+class _Posting:
+    indices: numpy.typing.NDArray[numpy.int64]
+    members: numpy.typing.NDArray[numpy.bool_] | None
+
+    def contains(
+        self, choices: numpy.typing.NDArray[numpy.int64]
+    ) -> numpy.typing.NDArray[numpy.bool_]:
+        if self.members is not None:
+            return self.members[choices]
+        if len(self.indices) == 0:
+            return numpy.zeros(len(choices), dtype=numpy.bool_)
+        positions = numpy.searchsorted(self.indices, choices)
+        return self.indices[numpy.minimum(positions, len(self.indices) - 1)] == choices
+
+
+_NO_POSTING: _Posting = _Posting(numpy.zeros(0, dtype=numpy.int64), None)
+
+
+# Levenshtein distance whose insertions and deletions cost 1
+# and substitutions cost `substitution_cost` (1 for different characters usually)
+def weighted_distance(s1: str, s2: str, substitution_cost: SubstitutionCost) -> float:
+    previous: List[float] = [float(j) for j in range(len(s2) + 1)]
+    for i, c1 in enumerate(s1, start=1):
+        current: List[float] = [float(i)]
+        for j, c2 in enumerate(s2, start=1):
+            current.append(
+                min(
+                    previous[j] + 1,  # deletion
+                    current[j - 1] + 1,  # insertion
+                    previous[j - 1] + (0 if c1 == c2 else substitution_cost(c1, c2)),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+# 1 - distance / max(len(s1), len(s2)) as `Levenshtein.normalized_similarity`
+def weighted_similarity(s1: str, s2: str, substitution_cost: SubstitutionCost) -> float:
+    length = max(len(s1), len(s2))
+    if length == 0:
+        return 1.0
+    return 1 - weighted_distance(s1, s2, substitution_cost) / length
@@ -1,11 +1,18 @@
 import logging
 import math
+import mmap
 from pathlib import Path
 from typing import Iterable, Tuple
 
 import cv2
 import numpy
 
+from taikoi2t.implements.file import (
+    get_birth_time_ns,
+    get_modify_time_ns,
+    new_file_entry,
+)
+from taikoi2t.models.file import FileEntry
 from taikoi2t.models.image import BoundingBox, Image, ImageMeta, RelativeBox
 
 logger: logging.Logger = logging.getLogger("taikoi2t.image")
@@ -35,15 +42,41 @@ def get_roi_bbox(source: BoundingBox, relative_roi: RelativeBox) -> BoundingBox:
     )
 
 
-def read_image(path: Path) -> Image | None:
+def read_image(path: Path, reduction: int = 1) -> Image | None:
     try:
-        # imread returns None when error occurred...?
-        return cv2.imread(path.as_posix())
+        # decodes from the page cache directly instead of reading the whole file into a buffer
+        with path.open(mode="rb") as image_file:
+            with mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                buffer = numpy.frombuffer(mapped, dtype=numpy.uint8)
+                image = decode_image(buffer, reduction)
+                del buffer  # mmap cannot be closed while exported
+                return image
+    except Exception as e:  # empty files cannot be mapped either
+        logger.error(e)
+        return None
+
+
+def decode_image(buffer: Image, reduction: int = 1) -> Image | None:
+    flags = __DECODE_FLAGS.get(reduction)
+    if flags is None:
+        logger.error(f"Unsupported reduction for decoding: {reduction}")
+        return None
+    try:
+        # imdecode returns None when the buffer is not an image
+        return cv2.imdecode(buffer, flags)
     except Exception as e:  # unexpected error
         logger.error(e)
         return None
 
 
+__DECODE_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+
 def convert_to_grayscale(source: Image) -> Image | None:
     try:
         return cv2.cvtColor(source, cv2.COLOR_BGR2GRAY)
@@ -93,6 +126,24 @@ def sharpen(source: Image, k: float) -> Image | None:
         return None
 
 
+# thickens dark strokes on white
+def thicken(source: Image, kernel_size: int) -> Image | None:
+    try:
+        return cv2.erode(source, numpy.ones((kernel_size, kernel_size), numpy.uint8))
+    except Exception as e:
+        logger.error(e)
+        return None
+
+
+# thins dark strokes on white
+def thin(source: Image, kernel_size: int) -> Image | None:
+    try:
+        return cv2.dilate(source, numpy.ones((kernel_size, kernel_size), numpy.uint8))
+    except Exception as e:
+        logger.error(e)
+        return None
+
+
 def crop(image: Image, bbox: BoundingBox) -> Image:
     height, width = image.shape[:2]
     sanitized = sanitize_roi(bbox, image_width=width, image_height=height)
@@ -160,16 +211,21 @@ def new_image_meta(
     image_dimension: Tuple[int, int] | None = None,
     modal: BoundingBox | None = None,
 ) -> ImageMeta:
-    stat = path.stat() if path.exists() else None
-    btime, mtime = (
-        (None, None) if stat is None else (stat.st_birthtime_ns, stat.st_mtime_ns)
-    )
+    return new_image_meta_from(new_file_entry(path), image_dimension, modal)
+
+
+# uses the cached stat of the entry
+def new_image_meta_from(
+    entry: FileEntry,
+    image_dimension: Tuple[int, int] | None = None,
+    modal: BoundingBox | None = None,
+) -> ImageMeta:
     width, height = (None, None) if image_dimension is None else image_dimension
     return ImageMeta(
-        path=path.as_posix(),
-        name=path.name,
-        birth_time_ns=btime,
-        modify_time_ns=mtime,
+        path=entry.path.as_posix(),
+        name=entry.path.name,
+        birth_time_ns=get_birth_time_ns(entry),
+        modify_time_ns=get_modify_time_ns(entry),
         width=width,
         height=height,
         modal=modal,
@@ -0,0 +1,146 @@
+import json
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, TextIO
+
+from taikoi2t.implements.json import to_json_str
+from taikoi2t.models.image import BoundingBox, ImageMeta
+from taikoi2t.models.journal import JournalKey
+from taikoi2t.models.match import MatchResult
+from taikoi2t.models.ocr import OCRText, SlotRecognition
+from taikoi2t.models.source import ImageSource
+from taikoi2t.models.student import Student
+from taikoi2t.models.team import Specials, Strikers, Team
+
+logger: logging.Logger = logging.getLogger("taikoi2t.journal")
+
+
+# returns None for the sources without a stable identity (e.g. stdin)
+def new_journal_key(source: ImageSource) -> Optional[JournalKey]:
+    if source.size is None or source.meta.modify_time_ns is None:
+        return None
+    return JournalKey(source.meta.path, source.size, source.meta.modify_time_ns)
+
+
+# returns None if the journal exists but cannot be read
+def read_journal(path: Path) -> Optional[Dict[JournalKey, MatchResult]]:
+    path_str = path.as_posix()
+    if not path.exists():
+        return {}  # nothing finished yet
+
+    completed: Dict[JournalKey, MatchResult] = {}
+    try:
+        with path.open(mode="r", encoding="utf-8") as file:
+            for line_number, line in enumerate(file, start=1):
+                if len(line.strip()) == 0:
+                    continue
+                try:
+                    entry = json.loads(line)
+                    key = JournalKey(
+                        entry["path"], entry["size"], entry["modify_time_ns"]
+                    )
+                    # later entries win if the same file is journaled twice
+                    completed[key] = parse_match_result(entry["match"])
+                except (ValueError, KeyError, TypeError) as e:
+                    # the last line may be truncated if the previous run was killed
+                    logger.warning(f"Broken entry at line {line_number}; {e}")
+    except (OSError, UnicodeDecodeError) as e:
+        logger.critical(f"Journal {path_str} cannot be read; {e}")
+        return None
+
+    logger.info(f"{len(completed)} completed files in journal {path_str}")
+    return completed
+
+
+# writes a line per file and flushes it, so a killed run loses at most one entry
+def append_journal(stream: TextIO, key: JournalKey, match_result: MatchResult) -> bool:
+    line = to_json_str(
+        {
+            "path": key.path,
+            "size": key.size,
+            "modify_time_ns": key.modify_time_ns,
+            "match": match_result,
+        }
+    )
+    if line is None:
+        return False
+    stream.write(line + "\n")
+    stream.flush()
+    return True
+
+
+def parse_match_result(obj: Any) -> MatchResult:
+    return MatchResult(
+        id=obj["id"],
+        image=__parse_image_meta(obj["image"]),
+        player=__parse_team(obj["player"]),
+        opponent=__parse_team(obj["opponent"]),
+        label=obj.get("label"),
+        recognitions=None
+        if obj.get("recognitions") is None
+        else [__parse_slot_recognition(r) for r in obj["recognitions"]],
+        low_confidence=obj.get("low_confidence", False),
+    )
+
+
+def __parse_image_meta(obj: Any) -> ImageMeta:
+    modal = obj["modal"]
+    return ImageMeta(
+        path=obj["path"],
+        name=obj["name"],
+        birth_time_ns=obj["birth_time_ns"],
+        modify_time_ns=obj["modify_time_ns"],
+        width=obj["width"],
+        height=obj["height"],
+        modal=None if modal is None else __parse_bounding_box(modal),
+    )
+
+
+def __parse_bounding_box(obj: Any) -> BoundingBox:
+    return BoundingBox(obj["left"], obj["top"], obj["right"], obj["bottom"])
+
+
+def __parse_team(obj: Any) -> Team:
+    strikers = obj["strikers"]
+    specials = obj["specials"]
+    return Team(
+        wins=obj["wins"],
+        owner=obj["owner"],
+        strikers=Strikers(
+            __parse_student(strikers["striker1"]),
+            __parse_student(strikers["striker2"]),
+            __parse_student(strikers["striker3"]),
+            __parse_student(strikers["striker4"]),
+        ),
+        specials=Specials(
+            __parse_student(specials["special1"]),
+            __parse_student(specials["special2"]),
+        ),
+    )
+
+
+def __parse_student(obj: Any) -> Student:
+    return __new_shared_student(obj["index"], obj["name"], obj["alias"])
+
+
+# the same students appear in most results, so frozen instances are shared
+@lru_cache(maxsize=4096)
+def __new_shared_student(index: int, name: str, alias: str | None) -> Student:
+    return Student(index, name, alias)
+
+
+def __parse_slot_recognition(obj: Any) -> SlotRecognition:
+    by_character = obj["by_character"]
+    return SlotRecognition(
+        role=obj["role"],
+        blank=obj["blank"],
+        texts=[__parse_ocr_text(t) for t in obj["texts"]],
+        by_character=None
+        if by_character is None
+        else [__parse_ocr_text(t) for t in by_character],
+    )
+
+
+def __parse_ocr_text(obj: Any) -> OCRText:
+    return OCRText(obj["text"], obj["confidence"], __parse_bounding_box(obj["box"]))
@@ -0,0 +1,90 @@
+import math
+from typing import Dict, List, Mapping, Tuple
+
+import numpy
+
+from taikoi2t.models.lexicon import NameTrie
+
+CTC_BLANK_CLASS: int = 0  # in the recognizer output
+# classes less likely than this at a frame are not extended by the beams
+LEXICON_MIN_FRAME_PROBABILITY: float = 1e-4
+DEFAULT_BEAM_WIDTH: int = 16
+
+# (the word, the value of the word, log probability summed over its alignments)
+type LexiconResult = Tuple[str, int, float]
+
+
+# CTC prefix beam search whose prefixes are limited to the paths of the trie.
+#
+# `probabilities` is (frames, classes) of the recognizer output after softmax,
+# and `class_by_char` maps characters to the classes; characters out of them
+# are never decoded. Returns the most probable word, or None if no beams reach any words.
+def decode_with_lexicon(
+    probabilities: numpy.typing.NDArray[numpy.float32],
+    trie: NameTrie,
+    class_by_char: Mapping[str, int],
+    beam_width: int = DEFAULT_BEAM_WIDTH,
+) -> LexiconResult | None:
+    with numpy.errstate(divide="ignore"):
+        log_probabilities = numpy.log(probabilities).tolist()
+    actives = [
+        set(numpy.flatnonzero(frame >= LEXICON_MIN_FRAME_PROBABILITY).tolist())
+        for frame in probabilities
+    ]
+    node_classes = [class_by_char.get(char, -1) for char in trie.chars]
+
+    # by node, log probabilities of (ending with blank, ending with the char of the node)
+    beams: Dict[int, Tuple[float, float]] = {0: (0.0, -math.inf)}
+    for log_frame, active in zip(log_probabilities, actives):
+        extended: Dict[int, List[float]] = {}
+        for node, (blank, non_blank) in beams.items():
+            total = _log_add(blank, non_blank)
+            entry = extended.setdefault(node, [-math.inf, -math.inf])
+            entry[0] = _log_add(entry[0], total + log_frame[CTC_BLANK_CLASS])
+            last = node_classes[node]
+            if node != 0:
+                # the same character continues
+                entry[1] = _log_add(entry[1], non_blank + log_frame[last])
+            for child in trie.children[node].values():
+                cls = node_classes[child]
+                if cls not in active:
+                    continue
+                # repeated characters are separated by blanks
+                previous = blank if cls == last else total
+                child_entry = extended.setdefault(child, [-math.inf, -math.inf])
+                child_entry[1] = _log_add(child_entry[1], previous + log_frame[cls])
+        beams = dict(
+            (node, (entry[0], entry[1]))
+            for node, entry in sorted(
+                extended.items(), key=lambda item: -_log_add(*item[1])
+            )[:beam_width]
+        )
+
+    ended = [
+        (_log_add(*probability), node)
+        for node, probability in beams.items()
+        if node in trie.words
+    ]
+    if len(ended) == 0:
+        return None
+    log_probability, node = max(ended)
+    word, value = trie.words[node]
+    return word, value, log_probability
+
+
+# log probability of the most probable path without the lexicon
+def best_path_log_probability(
+    probabilities: numpy.typing.NDArray[numpy.float32],
+) -> float:
+    with numpy.errstate(divide="ignore"):
+        return float(numpy.log(probabilities.max(axis=1)).sum())
+
+
+def _log_add(a: float, b: float) -> float:
+    if a == -math.inf:
+        return b
+    if b == -math.inf:
+        return a
+    if a < b:
+        a, b = b, a
+    return a + math.log1p(math.exp(b - a))
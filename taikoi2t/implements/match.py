@@ -1,12 +1,11 @@
 import json
 import time
 from dataclasses import asdict
-from pathlib import Path
 from typing import List
 
-from taikoi2t.implements.image import new_image_meta
 from taikoi2t.implements.settings import Settings
 from taikoi2t.implements.team import new_error_team
+from taikoi2t.models.image import ImageMeta
 from taikoi2t.models.match import MatchResult
 from taikoi2t.models.student import Student
 
@@ -40,10 +39,10 @@ def render_match(match_result: MatchResult, settings: Settings) -> str:
     return ("," if settings.output_format == "csv" else "\t").join(row)
 
 
-def new_errored_match_result(path: Path) -> MatchResult:
+def new_errored_match_result(image_meta: ImageMeta) -> MatchResult:
     return MatchResult(
-        get_match_id(time.time_ns(), path.name),
-        new_image_meta(path),
+        get_match_id(time.time_ns(), image_meta.name),
+        image_meta,
         new_error_team(),
         new_error_team(),
     )
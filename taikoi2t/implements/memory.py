@@ -0,0 +1,113 @@
+import ctypes
+import logging
+import sys
+
+logger: logging.Logger = logging.getLogger("taikoi2t.memory")
+
+
+# Returns the peak resident set size of this process in bytes
+def get_peak_rss() -> int | None:
+    try:
+        if sys.platform == "win32":
+            return __get_peak_working_set_windows()
+
+        import resource
+
+        max_rss: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # bytes on macOS, kilobytes on Linux
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+    except Exception as e:  # unsupported platforms
+        logger.error(e)
+        return None
+
+
+# Returns the physical memory available without swapping in bytes
+def get_available_memory() -> int | None:
+    try:
+        if sys.platform == "win32":
+            return __get_available_physical_windows()
+        if sys.platform == "linux":
+            with open("/proc/meminfo", mode="r", encoding="ascii") as meminfo:
+                for line in meminfo:
+                    if line.startswith("MemAvailable:"):
+                        return int(line.split()[1]) * 1024  # in kilobytes
+            return None
+
+        import os
+
+        # free pages only; smaller than the actual available memory on macOS
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except Exception as e:  # unsupported platforms
+        logger.error(e)
+        return None
+
+
+# Returns the memory only this process uses (USS) in bytes; None if unknown
+# pages shared copy-on-write with other processes are not counted until written
+def get_unique_memory() -> int | None:
+    if sys.platform != "linux":
+        return None
+    try:
+        unique = 0
+        with open("/proc/self/smaps_rollup", mode="r", encoding="ascii") as smaps:
+            for line in smaps:
+                if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                    unique += int(line.split()[1]) * 1024  # in kilobytes
+        return unique
+    except Exception as e:  # old kernels
+        logger.error(e)
+        return None
+
+
+def format_bytes(size: int | None) -> str:
+    return "unknown" if size is None else f"{size / 2**20:.1f} MiB"
+
+
+class __ProcessMemoryCounters(ctypes.Structure):
+    _fields_ = [
+        ("cb", ctypes.c_ulong),
+        ("PageFaultCount", ctypes.c_ulong),
+        ("PeakWorkingSetSize", ctypes.c_size_t),
+        ("WorkingSetSize", ctypes.c_size_t),
+        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+        ("PagefileUsage", ctypes.c_size_t),
+        ("PeakPagefileUsage", ctypes.c_size_t),
+    ]
+
+
+def __get_peak_working_set_windows() -> int | None:
+    counters = __ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()  # type: ignore
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(  # type: ignore
+        process, ctypes.byref(counters), counters.cb
+    ):
+        return None
+    return int(counters.PeakWorkingSetSize)
+
+
+class __MemoryStatusEx(ctypes.Structure):
+    _fields_ = [
+        ("dwLength", ctypes.c_ulong),
+        ("dwMemoryLoad", ctypes.c_ulong),
+        ("ullTotalPhys", ctypes.c_ulonglong),
+        ("ullAvailPhys", ctypes.c_ulonglong),
+        ("ullTotalPageFile", ctypes.c_ulonglong),
+        ("ullAvailPageFile", ctypes.c_ulonglong),
+        ("ullTotalVirtual", ctypes.c_ulonglong),
+        ("ullAvailVirtual", ctypes.c_ulonglong),
+        ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+    ]
+
+
+def __get_available_physical_windows() -> int | None:
+    status = __MemoryStatusEx()
+    status.dwLength = ctypes.sizeof(status)
+    if not ctypes.windll.kernel32.GlobalMemoryStatusEx(  # type: ignore
+        ctypes.byref(status)
+    ):
+        return None
+    return int(status.ullAvailPhys)
@@ -1,11 +1,11 @@
 import logging
-from typing import Iterable, Sequence
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
 
 import easyocr  # type: ignore
 
 from taikoi2t.implements.image import crop
 from taikoi2t.models.image import BoundingBox, Image
-from taikoi2t.models.ocr import Character
+from taikoi2t.models.ocr import Character, OCRText
 
 logger: logging.Logger = logging.getLogger("taikoi2t.ocr")
 
@@ -22,5 +22,49 @@ def read_text_from_roi(
         return None
 
 
+# reads each image as `reader.readtext` does, running the detector once for the same sized images
+def read_texts_batched(
+    reader: easyocr.Reader, images: Sequence[Image], **kwargs: Any
+) -> List[Sequence[Character]]:
+    results: List[Sequence[Character]] = [[] for _ in images]
+    groups: Dict[Tuple[int, ...], List[int]] = {}
+    for index, image in enumerate(images):
+        if image.size > 0:  # empty images have no text
+            groups.setdefault(image.shape, []).append(index)
+
+    for indices in groups.values():
+        try:
+            texts: List[Sequence[Character]] = reader.readtext_batched(  # type: ignore
+                [images[i] for i in indices], **kwargs
+            )
+        except Exception as e:  # catch errors from easyocr and opencv
+            logger.error(e)
+            continue
+        for index, chars in zip(indices, texts):
+            results[index] = chars
+    return results
+
+
 def join_chars(chars: Iterable[Character]) -> str:
     return "".join(c[1] for c in chars).replace(" ", "")
+
+
+# the same as `join_chars` for the kept texts
+def join_ocr_texts(texts: Iterable[OCRText]) -> str:
+    return "".join(t.text for t in texts).replace(" ", "")
+
+
+def new_ocr_texts(chars: Iterable[Character]) -> List[OCRText]:
+    return [
+        OCRText(
+            text=char[1],
+            confidence=float(char[2]),
+            box=BoundingBox(
+                int(min(x for x, _ in char[0])),
+                int(min(y for _, y in char[0])),
+                int(max(x for x, _ in char[0])),
+                int(max(y for _, y in char[0])),
+            ),
+        )
+        for char in chars
+    ]
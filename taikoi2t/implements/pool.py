@@ -0,0 +1,112 @@
+import gc
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Tuple
+
+from taikoi2t.implements.memory import get_unique_memory
+from taikoi2t.implements.runtime import is_gil_enabled
+
+logger: logging.Logger = logging.getLogger("taikoi2t.pool")
+
+# the work given by the parent; set only in worker processes
+_worker_work: Callable[[Any], Any] | None = None
+
+
+# Threads sharing the loaded models in this process.
+#
+# The models of easyocr.Reader are only read while extracting, and the caches
+# OCRSession and StudentDictionaryImpl fill on demand are guarded by their locks,
+# so the threads share them; the grad mode of torch is thread-local,
+# so it is disabled in each thread.
+# The threads run in parallel on a free-threaded build (python3.13t),
+# or only while torch and OpenCV release the GIL otherwise.
+def new_thread_pool(threads: int) -> ThreadPoolExecutor:
+    import torch
+
+    if is_gil_enabled():
+        logger.info("GIL is enabled; threads run in parallel only in native code")
+    # the threads share the cores
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // threads))
+    return ThreadPoolExecutor(
+        threads, thread_name_prefix="extract", initializer=_init_thread
+    )
+
+
+# Worker processes forked from this process after loading the models.
+#
+# The workers inherit the loaded objects copy-on-write instead of loading them again.
+# Objects are frozen before forking, so that the garbage collector of the workers
+# never writes to their headers and the pages stay shared.
+# Tensors of the models are outside Python objects, so reference counting
+# does not touch them either.
+class ForkWorkerPool[T, R]:
+    def __init__(self, workers: int, work: Callable[[T], R]) -> None:
+        import torch
+
+        # no autograd buffers are made in the workers
+        torch.set_grad_enabled(False)
+        gc.collect()
+        gc.freeze()
+
+        # the work is not pickled since the workers are forked
+        self.executor = ProcessPoolExecutor(
+            workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(work, max(1, (os.cpu_count() or 1) // workers)),
+        )
+        self.unique_memory: Dict[int, int | None] = {}  # by worker pid
+        # forks all workers now, before other threads start in this process
+        self.__record(self.executor.submit(_report_worker).result())
+
+    # `item` must be picklable
+    def submit(self, item: T) -> Future[R]:
+        submitted = self.executor.submit(_run_worker, item)
+        future: Future[R] = Future()
+
+        def done(finished: Future[Tuple[R, Tuple[int, int | None]]]) -> None:
+            try:
+                result, memory = finished.result()
+            except BaseException as e:
+                future.set_exception(e)
+                return
+            self.__record(memory)
+            future.set_result(result)
+
+        submitted.add_done_callback(done)
+        return future
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
+        gc.unfreeze()
+
+    def __record(self, memory: Tuple[int, int | None]) -> None:
+        pid, unique = memory
+        self.unique_memory[pid] = unique
+
+
+def _init_worker(work: Callable[[Any], Any], threads: int) -> None:
+    global _worker_work
+    import torch
+
+    _worker_work = work
+    # the workers share the cores
+    torch.set_num_threads(threads)
+    torch.set_grad_enabled(False)
+
+
+def _init_thread() -> None:
+    import torch
+
+    torch.set_grad_enabled(False)
+
+
+def _run_worker(item: Any) -> Tuple[Any, Tuple[int, int | None]]:
+    assert _worker_work is not None
+    return _worker_work(item), _report_worker()
+
+
+def _report_worker() -> Tuple[int, int | None]:
+    return os.getpid(), get_unique_memory()
@@ -0,0 +1,235 @@
+import logging
+import math
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Sequence, Tuple
+
+import cv2
+import easyocr  # type: ignore
+import numpy
+import torch
+from easyocr.config import BASE_PATH  # type: ignore
+from easyocr.config import imgH as RECOGNIZER_INPUT_HEIGHT  # type: ignore
+from easyocr.craft import CRAFT  # type: ignore
+from easyocr.detection import get_textbox  # type: ignore
+from easyocr.model.vgg_model import Model  # type: ignore
+from easyocr.utils import CTCLabelConverter  # type: ignore
+
+from taikoi2t.models.args import VERBOSE_PRINT, Args
+from taikoi2t.models.reader import ReaderOptions
+
+logger: logging.Logger = logging.getLogger("taikoi2t.reader")
+
+READER_LANGUAGES = ["ja", "en"]
+DEFAULT_MODEL_CACHE_DIR: Path = Path.home() / ".EasyOCR" / "taikoi2t"
+# bump when the layout of cached models changes
+MODEL_CACHE_VERSION: int = 2
+# how easyocr builds the recognizer for READER_LANGUAGES ("japanese_g2")
+RECOGNIZER_NETWORK_PARAMS: Dict[str, int] = {
+    "input_channel": 1,
+    "output_channel": 256,
+    "hidden_size": 256,
+}
+# TorchScript optimizes the graph in the first runs
+WARM_UP_RUNS: int = 2
+# (height, width) to trace if no tile shapes are given
+DEFAULT_TILE_SHAPE: Tuple[int, int] = (
+    RECOGNIZER_INPUT_HEIGHT,
+    RECOGNIZER_INPUT_HEIGHT * 4,
+)
+
+
+def new_reader_options_from(args: Args) -> ReaderOptions:
+    return ReaderOptions(
+        model_cache=args.model_cache,
+        engine=args.engine,
+        verbose=args.verbose >= VERBOSE_PRINT,
+    )
+
+
+# `tile_shapes` are (height, width) of images to recognize for tracing and warm-up
+def new_reader(
+    options: ReaderOptions, tile_shapes: Sequence[Tuple[int, int]] = ()
+) -> easyocr.Reader:
+    reader = __new_cached_reader(options)
+    if options.engine == "traced":
+        reader.recognizer = __load_or_trace_recognizer(
+            reader, options, tile_shapes[0] if len(tile_shapes) > 0 else None
+        )
+        warm_up_reader(reader, tile_shapes or [DEFAULT_TILE_SHAPE])
+    return reader
+
+
+# runs the detector and the recognizer on synthetic images
+def warm_up_reader(
+    reader: easyocr.Reader, tile_shapes: Sequence[Tuple[int, int]]
+) -> None:
+    starts_at = time.perf_counter()
+    for height, width in tile_shapes:
+        tile = numpy.full((height, width), 255, dtype=numpy.uint8)
+        cv2.putText(
+            tile,
+            "OCR",
+            (width // 8, height * 2 // 3),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            height / 64,
+            0,
+            max(1, height // 32),
+        )
+        for _ in range(WARM_UP_RUNS):
+            reader.detect(tile, mag_ratio=2)
+            reader.recognize(tile)
+    logger.info(f"Warmed up in {time.perf_counter() - starts_at:.2f}s")
+
+
+def get_model_cache_path(options: ReaderOptions, mode: str) -> Path:
+    directory = options.model_cache or DEFAULT_MODEL_CACHE_DIR
+    # artifacts made by other versions may not be loadable
+    return directory / (
+        f"{'-'.join(READER_LANGUAGES)}-{mode}"
+        f"-easyocr{easyocr.__version__}-torch{torch.__version__}"
+        f"-v{MODEL_CACHE_VERSION}.pt"
+    )
+
+
+# loads the trained weights from the cache, or builds the networks and caches the weights
+def __new_cached_reader(options: ReaderOptions) -> easyocr.Reader:
+    if options.model_cache is None:
+        return __new_uncached_reader(options)
+    # builds no networks, and finds the device
+    reader = easyocr.Reader(
+        READER_LANGUAGES,
+        detector=False,
+        recognizer=False,
+        verbose=options.verbose,
+    )
+    # models for GPUs are not cached, since they are copied to the device anyway
+    if reader.device != "cpu":
+        return __new_uncached_reader(options)
+
+    cache_path = get_model_cache_path(options, "weights")
+    if not (cache_path.exists() and __load_weights(reader, cache_path)):
+        reader = easyocr.Reader(
+            READER_LANGUAGES, gpu=False, quantize=False, verbose=options.verbose
+        )
+        __save_weights(cache_path, reader)
+    # as easyocr does on CPU by default
+    __quantize(reader)
+    return reader
+
+
+# the same as easyocr.Reader(READER_LANGUAGES)
+def __new_uncached_reader(options: ReaderOptions) -> easyocr.Reader:
+    return easyocr.Reader(READER_LANGUAGES, verbose=options.verbose)
+
+
+# the same as easyocr does after loading the weights on CPU;
+# only the LSTM and linear layers of the recognizer are quantized, CRAFT has none
+def __quantize(reader: easyocr.Reader) -> None:
+    for network in (reader.detector, reader.recognizer):
+        torch.quantization.quantize_dynamic(network, dtype=torch.qint8, inplace=True)
+
+
+# easyocr quantizes the networks only on CPU
+def __get_precision(reader: easyocr.Reader) -> str:
+    return "int8" if reader.device == "cpu" else "fp32"
+
+
+# Returns False if the cache is broken
+def __load_weights(reader: easyocr.Reader, path: Path) -> bool:
+    try:
+        # only tensors are unpickled; they are mapped from the file and read on demand,
+        # so that processes loading the same file share the physical pages
+        weights: Dict[str, Any] = torch.load(path, weights_only=True, mmap=True)
+        converter = CTCLabelConverter(
+            reader.character,
+            {},
+            dict(
+                (lang, os.path.join(BASE_PATH, "dict", f"{lang}.txt"))
+                for lang in READER_LANGUAGES
+            ),
+        )
+        # the initial weights are not allocated, since they are replaced by mapped ones
+        with torch.device("meta"):
+            detector = CRAFT()
+            recognizer = Model(
+                num_class=len(converter.character), **RECOGNIZER_NETWORK_PARAMS
+            )
+        detector.load_state_dict(weights["detector"], assign=True)
+        recognizer.load_state_dict(weights["recognizer"], assign=True)
+    except Exception as e:
+        logger.warning(f"Broken model cache {path.as_posix()}; {e}")
+        return False
+    reader.detector = detector.eval()
+    reader.recognizer = recognizer.eval()
+    reader.converter = converter
+    reader.detect_network = "craft"
+    reader.get_textbox = get_textbox
+    logger.info(f"Model weights are loaded from {path.as_posix()}")
+    return True
+
+
+def __save_weights(path: Path, reader: easyocr.Reader) -> None:
+    temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        torch.save(
+            {
+                "detector": reader.detector.state_dict(),
+                "recognizer": reader.recognizer.state_dict(),
+            },
+            temporary,
+        )
+        # other processes never see a partial file
+        os.replace(temporary, path)
+        logger.info(f"Model weights are cached to {path.as_posix()}")
+    except OSError as e:
+        logger.warning(f"Model weights cannot be cached to {path.as_posix()}; {e}")
+        temporary.unlink(missing_ok=True)
+
+
+# traced once per model and device; the artifact is reused in later runs
+def __load_or_trace_recognizer(
+    reader: easyocr.Reader,
+    options: ReaderOptions,
+    tile_shape: Tuple[int, int] | None,
+) -> torch.nn.Module:
+    precision = __get_precision(reader)
+    cache_path = get_model_cache_path(
+        options, f"{precision}-{reader.device}-recognizer-traced"
+    )
+    if cache_path.exists():
+        try:
+            traced = torch.jit.load(cache_path, map_location=reader.device)
+            logger.info(f"Traced recognizer is loaded from {cache_path.as_posix()}")
+            return traced
+        except Exception as e:
+            logger.warning(f"Broken traced recognizer {cache_path.as_posix()}; {e}")
+
+    # traces the inner model, not the wrapper for GPUs
+    model = getattr(reader.recognizer, "module", reader.recognizer)
+    model.eval()
+    height, width = tile_shape or DEFAULT_TILE_SHAPE
+    # a tile is resized to the input height keeping its aspect ratio
+    input_width = max(
+        RECOGNIZER_INPUT_HEIGHT, math.ceil(RECOGNIZER_INPUT_HEIGHT * width / height)
+    )
+    image = torch.zeros(1, 1, RECOGNIZER_INPUT_HEIGHT, input_width).to(reader.device)
+    text = torch.zeros(1, input_width // 10 + 1, dtype=torch.long).to(reader.device)
+    try:
+        with torch.no_grad():
+            traced = torch.jit.trace(model, (image, text))
+    except Exception as e:
+        logger.warning(f"Recognizer cannot be traced, running eagerly; {e}")
+        return reader.recognizer
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        torch.jit.save(traced, temporary)
+        os.replace(temporary, cache_path)
+        logger.info(f"Traced recognizer is cached to {cache_path.as_posix()}")
+    except OSError as e:
+        logger.warning(f"Traced recognizer cannot be cached; {e}")
+    return traced
@@ -0,0 +1,44 @@
+import json
+import logging
+from typing import Any, Iterator, List, TextIO
+
+from taikoi2t.implements.journal import parse_match_result
+from taikoi2t.models.match import MatchResult
+
+logger: logging.Logger = logging.getLogger("taikoi2t.render")
+
+
+# Reads match results stored in a line-based stream in the order of them.
+#
+# Each line may be a JSON output of a run (with "matches"), a journal entry
+# (with "match"), or a match result itself, so that both --json outputs
+# appended to a file and --journal files are accepted.
+# Broken lines are skipped with warnings.
+def read_stored_matches(stream: TextIO, path_str: str) -> Iterator[MatchResult]:
+    for line_number, line in enumerate(stream, start=1):
+        if len(line.strip()) == 0:
+            continue
+        try:
+            matches = __find_matches(json.loads(line))
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Broken line {line_number} of {path_str}; {e}")
+            continue
+        for match in matches:
+            try:
+                match_result = parse_match_result(match)
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(
+                    f"Broken result at line {line_number} of {path_str}; {e}"
+                )
+                continue
+            yield match_result
+
+
+def __find_matches(stored: Any) -> List[Any]:
+    if not isinstance(stored, dict):
+        raise TypeError(f"not an object but {type(stored).__name__}")
+    if "matches" in stored:
+        return stored["matches"]
+    if "match" in stored:
+        return [stored["match"]]
+    return [stored]
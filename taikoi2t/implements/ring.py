@@ -0,0 +1,209 @@
+import logging
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import Iterator
+
+import numpy
+
+from taikoi2t.implements.source import new_synthetic_image_meta
+from taikoi2t.models.image import Image
+from taikoi2t.models.source import ImageSource
+
+logger: logging.Logger = logging.getLogger("taikoi2t.ring")
+
+# Single-producer, single-consumer ring buffer of BGR frames in shared memory.
+#
+# header | slot headers | slot data (slot_count * slot_capacity bytes)
+# the producer fills a slot then marks it FILLED, the consumer marks it EMPTY after use
+
+RING_MAGIC: bytes = b"TKRB"
+RING_VERSION: int = 1
+RING_POLL_INTERVAL: float = 0.001  # in seconds
+
+SLOT_EMPTY: int = 0
+SLOT_FILLED: int = 1
+
+_HEADER = struct.Struct("<4sIIQI")  # magic, version, slot_count, slot_capacity, closed
+_HEADER_SIZE: int = 64
+_SLOT = struct.Struct("<IIIQ")  # state, width, height, sequence
+_SLOT_SIZE: int = 32
+_CHANNELS: int = 3  # BGR
+
+
+class FrameRingWriter:
+    def __init__(self, name: str, slot_count: int, max_width: int, max_height: int):
+        self.slot_count: int = slot_count
+        self.slot_capacity: int = max_width * max_height * _CHANNELS
+        self.shm = shared_memory.SharedMemory(
+            name=name,
+            create=True,
+            size=_data_offset(slot_count, slot_count, self.slot_capacity),
+            track=False,  # the producer owns the lifetime by unlink()
+        )
+        self.buf: memoryview = _buffer_of(self.shm)
+        self.sequence: int = 0
+        self.write_index: int = 0
+
+        self.buf[:_HEADER_SIZE] = bytes(_HEADER_SIZE)
+        _HEADER.pack_into(
+            self.buf, 0, RING_MAGIC, RING_VERSION, slot_count, self.slot_capacity, 0
+        )
+        for index in range(slot_count):
+            _SLOT.pack_into(self.buf, _slot_offset(index), SLOT_EMPTY, 0, 0, 0)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    # Returns False if no slot gets free within the timeout
+    def put(self, frame: Image, timeout: float | None = None) -> bool:
+        height, width = frame.shape[:2]
+        if frame.dtype != numpy.uint8 or frame.shape != (height, width, _CHANNELS):
+            raise ValueError(f"Frame must be BGR uint8; {frame.dtype} {frame.shape}")
+        if frame.nbytes > self.slot_capacity:
+            raise ValueError(
+                f"Frame is too large; {frame.nbytes} > {self.slot_capacity}"
+            )
+
+        offset = _slot_offset(self.write_index)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while _SLOT.unpack_from(self.buf, offset)[0] != SLOT_EMPTY:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(RING_POLL_INTERVAL)
+
+        data_offset = _data_offset(
+            self.slot_count, self.write_index, self.slot_capacity
+        )
+        destination: Image = numpy.ndarray(
+            frame.shape, dtype=numpy.uint8, buffer=self.buf, offset=data_offset
+        )
+        destination[:] = frame
+        del destination
+        # marks FILLED at last so that the consumer never sees a partial frame
+        _SLOT.pack_into(self.buf, offset, SLOT_FILLED, width, height, self.sequence)
+
+        self.sequence += 1
+        self.write_index = (self.write_index + 1) % self.slot_count
+        return True
+
+    # Returns False if the consumer does not release all slots within the timeout
+    def drain(self, timeout: float | None = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while any(
+            _SLOT.unpack_from(self.buf, _slot_offset(i))[0] != SLOT_EMPTY
+            for i in range(self.slot_count)
+        ):
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(RING_POLL_INTERVAL)
+        return True
+
+    # tells the consumer that no more frames will come
+    def close(self) -> None:
+        _HEADER.pack_into(
+            self.buf,
+            0,
+            RING_MAGIC,
+            RING_VERSION,
+            self.slot_count,
+            self.slot_capacity,
+            1,
+        )
+
+    def unlink(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+
+class FrameRingReader:
+    def __init__(self, name: str):
+        self.shm = shared_memory.SharedMemory(name=name, create=False, track=False)
+        self.buf: memoryview = _buffer_of(self.shm)
+        magic, version, slot_count, slot_capacity, _ = _HEADER.unpack_from(self.buf, 0)
+        if magic != RING_MAGIC or version != RING_VERSION:
+            self.shm.close()
+            raise ValueError(f"{name} is not a frame ring (version {RING_VERSION})")
+        self.name: str = name
+        self.slot_count: int = slot_count
+        self.slot_capacity: int = slot_capacity
+
+    def is_closed(self) -> bool:
+        return _HEADER.unpack_from(self.buf, 0)[4] != 0
+
+    # yields zero-copy views of the slots; each slot is kept until its source is released
+    def sources(self) -> Iterator[ImageSource]:
+        read_index = 0
+        while True:
+            offset = _slot_offset(read_index)
+            state, width, height, sequence = _SLOT.unpack_from(self.buf, offset)
+            if state != SLOT_FILLED:
+                # the writer may have filled the slot just before closing
+                if self.is_closed() and (
+                    _SLOT.unpack_from(self.buf, offset)[0] != SLOT_FILLED
+                ):
+                    return
+                time.sleep(RING_POLL_INTERVAL)
+                continue
+
+            # a broken producer must not make the view overrun the slot
+            if width * height * _CHANNELS > self.slot_capacity:
+                logger.error(
+                    f"Skipped frame {sequence} of {self.name}; "
+                    f"{width}x{height} exceeds the slot capacity {self.slot_capacity}"
+                )
+                _SLOT.pack_into(self.buf, offset, SLOT_EMPTY, 0, 0, 0)
+                read_index = (read_index + 1) % self.slot_count
+                continue
+
+            frame: Image = numpy.ndarray(
+                (height, width, _CHANNELS),
+                dtype=numpy.uint8,
+                buffer=self.buf,
+                offset=_data_offset(self.slot_count, read_index, self.slot_capacity),
+            )
+            slot = _RingSlot(self.buf, offset, frame)
+            del frame
+            meta = new_synthetic_image_meta(
+                f"<shm:{self.name}>/{sequence}", f"{self.name}-{sequence}"
+            )
+            yield ImageSource(meta, slot.load, slot.release)
+            read_index = (read_index + 1) % self.slot_count
+
+    def close(self) -> None:
+        try:
+            self.shm.close()
+        except BufferError as e:  # some views are still alive
+            logger.error(e)
+
+
+class _RingSlot:
+    def __init__(self, buf: memoryview, offset: int, frame: Image) -> None:
+        self.buf: memoryview = buf
+        self.offset: int = offset
+        self.frame: Image | None = frame
+
+    def load(self, reduction: int) -> Image | None:
+        return self.frame if reduction == 1 else None
+
+    # drops the view too, so that the shared memory can be closed
+    def release(self) -> None:
+        if self.frame is None:
+            return
+        self.frame = None
+        _SLOT.pack_into(self.buf, self.offset, SLOT_EMPTY, 0, 0, 0)
+
+
+# the buffer is None only after closed
+def _buffer_of(shm: shared_memory.SharedMemory) -> memoryview:
+    assert shm.buf is not None
+    return shm.buf
+
+
+def _slot_offset(index: int) -> int:
+    return _HEADER_SIZE + _SLOT_SIZE * index
+
+
+def _data_offset(slot_count: int, index: int, slot_capacity: int) -> int:
+    return _HEADER_SIZE + _SLOT_SIZE * slot_count + slot_capacity * index
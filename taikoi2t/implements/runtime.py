@@ -0,0 +1,11 @@
+import multiprocessing
+import sys
+
+
+def is_fork_available() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def is_gil_enabled() -> bool:
+    # always enabled before Python 3.13
+    return getattr(sys, "_is_gil_enabled", lambda: True)()
@@ -0,0 +1,66 @@
+import threading
+from typing import Callable, Iterable, Iterator, List
+
+from taikoi2t.models.schedule import Scheduled
+
+
+# live arrivals are processed first, newest first (LIFO);
+# backfill is processed in the given order (FIFO) when no live item is waiting
+class PriorityScheduler[T]:
+    def __init__(self, backfill: Iterable[T]) -> None:
+        self.backfill: Iterator[T] = iter(backfill)
+        self.backfill_done: bool = False
+        self.backfill_count: int = 0
+        self.live: List[Scheduled[T]] = []
+        self.live_count: int = 0
+        self.closed: bool = False
+        self.condition: threading.Condition = threading.Condition()
+
+    # thread safe
+    def push_live(self, item: T) -> None:
+        with self.condition:
+            self.live.append(Scheduled(item, "L", self.live_count))
+            self.live_count += 1
+            self.condition.notify()
+
+    # no more live arrivals; iteration stops after both lanes are drained
+    def close(self) -> None:
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+
+    def __iter__(self) -> Iterator[Scheduled[T]]:
+        return self.iterate()
+
+    # `on_idle` is called out of the lock before waiting for live arrivals
+    def iterate(
+        self, on_idle: Callable[[], None] | None = None
+    ) -> Iterator[Scheduled[T]]:
+        idle_notified = False
+        while True:
+            with self.condition:
+                live = self.live.pop() if len(self.live) > 0 else None
+                waits = live is None and self.backfill_done
+                if waits and (on_idle is None or idle_notified or self.closed):
+                    while len(self.live) == 0 and not self.closed:
+                        self.condition.wait()
+                    if len(self.live) == 0:
+                        return
+                    continue
+            if waits and on_idle is not None:
+                idle_notified = True
+                on_idle()
+                continue
+            idle_notified = False
+            if live is not None:
+                yield live
+                continue
+
+            # the backfill may read files, so it is iterated out of the lock
+            try:
+                item = next(self.backfill)
+            except StopIteration:
+                self.backfill_done = True
+                continue
+            yield Scheduled(item, "B", self.backfill_count)
+            self.backfill_count += 1
@@ -0,0 +1,260 @@
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+import easyocr  # type: ignore
+import numpy
+import PIL.Image
+import torch
+from easyocr.config import imgH as RECOGNIZER_INPUT_HEIGHT  # type: ignore
+from easyocr.recognition import AlignCollate  # type: ignore
+from easyocr.utils import (  # type: ignore
+    get_image_list,
+    reformat_input,
+    reformat_input_batched,
+)
+
+from taikoi2t.models.image import Image
+from taikoi2t.models.ocr import Character
+from taikoi2t.models.student import ALL_ROLES, StudentDictionary
+
+logger: logging.Logger = logging.getLogger("taikoi2t.session")
+
+# the same as the defaults of `easyocr.Reader.readtext`
+CONTRAST_THRESHOLD: float = 0.1
+ADJUST_CONTRAST: float = 0.5
+
+type _HorizontalBox = List[int]  # [left, right, top, bottom]
+type _FreeBox = List[List[int]]  # 4 points
+
+
+# Reads texts as easyocr.Reader does, reusing the state easyocr builds on each call.
+#
+# easyocr looks up the classes to ignore over the whole character set for each
+# `allowlist` and makes new collators and input tensors for each text box;
+# they are kept here by the allowlist and by the input width instead.
+# The caches are filled on demand under a lock, so that threads share a session
+# even without the GIL.
+# Used in place of the reader; `readtext`, `readtext_batched`, `detect` and
+# `recognize` take the same arguments as easyocr for the ones used in this package,
+# and return the same results for the greedy decoder.
+class OCRSession:
+    def __init__(self, reader: easyocr.Reader, allowlists: Iterable[str] = ()) -> None:
+        self.reader: easyocr.Reader = reader
+        # easyocr switches them to the evaluation mode on each call instead;
+        # BatchNorm in the training mode normalizes by each batch and updates its stats
+        reader.recognizer.eval()
+        if getattr(reader, "detector", None) is not None:
+            reader.detector.eval()
+        self.class_by_char: Mapping[str, int] = get_class_by_char(reader)
+        self.lock: threading.Lock = threading.Lock()  # for the caches below
+        # by allowlist ("" for the language characters)
+        self.masks: Dict[str, numpy.typing.NDArray[numpy.bool_]] = {}
+        # by (width, contrast)
+        self.collates: Dict[Tuple[int, float], AlignCollate] = {}
+        # by (batch, length); the recognizer takes them for training, unused in prediction
+        self.text_inputs: Dict[Tuple[int, int], torch.Tensor] = {}
+        for allowlist in allowlists:
+            self.ignore_mask(allowlist)
+
+    @property
+    def recognizer(self) -> Any:
+        return self.reader.recognizer
+
+    @property
+    def device(self) -> Any:
+        return self.reader.device
+
+    def detect(self, image: Image, mag_ratio: float = 1.0, **kwargs: Any) -> Any:
+        return self.reader.detect(image, mag_ratio=mag_ratio, **kwargs)
+
+    def readtext(
+        self, image: Image, allowlist: str | None = None, mag_ratio: float = 1.0
+    ) -> List[Character]:
+        colored, grayscale = reformat_input(image)
+        horizontal_list, free_list = self.reader.detect(
+            colored, mag_ratio=mag_ratio, reformat=False
+        )
+        return self.__recognize_boxes(
+            grayscale, horizontal_list[0], free_list[0], allowlist
+        )
+
+    # `images` must be the same size
+    def readtext_batched(
+        self,
+        images: Sequence[Image],
+        allowlist: str | None = None,
+        mag_ratio: float = 1.0,
+    ) -> List[List[Character]]:
+        if len(images) == 0:
+            return []
+        coloreds, grayscales = reformat_input_batched(list(images))
+        horizontal_lists, free_lists = self.reader.detect(
+            coloreds, mag_ratio=mag_ratio, reformat=False
+        )
+        return [
+            self.__recognize_boxes(grayscale, horizontal_list, free_list, allowlist)
+            for grayscale, horizontal_list, free_list in zip(
+                grayscales, horizontal_lists, free_lists
+            )
+        ]
+
+    # reads the whole image as a text box
+    def recognize(self, image: Image, allowlist: str | None = None) -> List[Character]:
+        _, grayscale = reformat_input(image)
+        height, width = grayscale.shape
+        return self.__recognize_boxes(grayscale, [[0, width, 0, height]], [], allowlist)
+
+    # Returns the recognizer output (frames, classes) of the texts detected in the image
+    # from left to right, as `readtext` reads them; None if no texts are detected.
+    # The classes out of the allowlist are zeroed as easyocr does.
+    def read_text_probabilities(
+        self, image: Image, allowlist: str, mag_ratio: float = 1.0
+    ) -> numpy.typing.NDArray[numpy.float32] | None:
+        colored, grayscale = reformat_input(image)
+        try:
+            horizontal_list, _ = self.reader.detect(
+                colored, mag_ratio=mag_ratio, reformat=False
+            )
+        except Exception as e:  # catch errors from easyocr and opencv
+            logger.error(e)
+            return None
+        # names are written horizontally, so rotated texts are ignored
+        boxes = (
+            sorted(horizontal_list[0], key=lambda box: box[0])
+            if horizontal_list
+            else []
+        )
+        image_list, max_width = get_image_list(
+            boxes,
+            [],
+            grayscale,
+            model_height=RECOGNIZER_INPUT_HEIGHT,
+            sort_output=False,
+        )
+        if len(image_list) == 0:
+            return None
+        probabilities = self.__predict(
+            [cropped for _, cropped in image_list],
+            int(max_width),
+            self.ignore_mask(allowlist),
+        )
+        return numpy.concatenate(list(probabilities), axis=0)
+
+    # True for the classes out of the allowlist, as easyocr ignores them
+    def ignore_mask(self, allowlist: str | None) -> numpy.typing.NDArray[numpy.bool_]:
+        key = allowlist or ""
+        with self.lock:
+            mask = self.masks.get(key)
+            if mask is None:
+                allowed = set(allowlist or self.reader.lang_char)
+                mask = numpy.zeros(len(self.reader.character) + 1, dtype=bool)
+                mask[
+                    [
+                        cls
+                        for char, cls in self.class_by_char.items()
+                        if char not in allowed
+                    ]
+                ] = True
+                self.masks[key] = mask
+            return mask
+
+    # each box is recognized separately as easyocr does on CPU
+    def __recognize_boxes(
+        self,
+        grayscale: Image,
+        horizontal_list: Sequence[_HorizontalBox],
+        free_list: Sequence[_FreeBox],
+        allowlist: str | None,
+    ) -> List[Character]:
+        mask = self.ignore_mask(allowlist)
+        results: List[Character] = []
+        for boxes in [([box], []) for box in horizontal_list] + [
+            ([], [box]) for box in free_list
+        ]:
+            image_list, max_width = get_image_list(
+                *boxes, grayscale, model_height=RECOGNIZER_INPUT_HEIGHT
+            )
+            for box, cropped in image_list:
+                text, confidence = self.__decode(
+                    self.__predict([cropped], int(max_width), mask)[0]
+                )
+                # retried with the contrast adjusted as easyocr does
+                if confidence < CONTRAST_THRESHOLD:
+                    retried = self.__decode(
+                        self.__predict(
+                            [cropped], int(max_width), mask, ADJUST_CONTRAST
+                        )[0]
+                    )
+                    if retried[1] >= confidence:
+                        text, confidence = retried
+                results.append((box, text, confidence))
+        return results
+
+    # probabilities (images, frames, classes) after the ignored classes are zeroed
+    def __predict(
+        self,
+        croppeds: Sequence[Image],
+        width: int,
+        mask: numpy.typing.NDArray[numpy.bool_],
+        contrast: float = 0.0,
+    ) -> numpy.typing.NDArray[numpy.float32]:
+        shape = (len(croppeds), width // 10 + 1)
+        with self.lock:
+            collate = self.collates.get((width, contrast))
+            if collate is None:
+                collate = AlignCollate(
+                    imgH=RECOGNIZER_INPUT_HEIGHT,
+                    imgW=width,
+                    keep_ratio_with_pad=True,
+                    adjust_contrast=contrast,
+                )
+                self.collates[(width, contrast)] = collate
+            texts = self.text_inputs.get(shape)
+            if texts is None:
+                texts = torch.zeros(shape, dtype=torch.long).to(self.reader.device)
+                self.text_inputs[shape] = texts
+        inputs = collate([PIL.Image.fromarray(cropped, "L") for cropped in croppeds])
+
+        with torch.no_grad():
+            outputs = self.reader.recognizer(inputs.to(self.reader.device), texts)
+            probabilities = torch.softmax(outputs, dim=2).cpu().numpy()
+        probabilities[:, :, mask] = 0
+        probabilities /= probabilities.sum(axis=2, keepdims=True)
+        return probabilities
+
+    # greedy decoding and the confidence of easyocr
+    def __decode(
+        self, probabilities: numpy.typing.NDArray[numpy.float32]
+    ) -> Tuple[str, float]:
+        classes = probabilities.argmax(axis=1)
+        text: str = self.reader.converter.decode_greedy(classes, [len(classes)])[0]
+        max_probabilities = probabilities.max(axis=1)[classes != 0]
+        if len(max_probabilities) == 0:
+            return text, 0.0
+        confidence = max_probabilities.prod() ** (
+            2.0 / numpy.sqrt(len(max_probabilities))
+        )
+        return text, float(confidence)
+
+
+# the allowlists of the dictionary are prepared for every role
+def new_ocr_session(
+    reader: easyocr.Reader, dictionary: StudentDictionary
+) -> OCRSession:
+    return OCRSession(
+        reader,
+        dict.fromkeys(
+            [dictionary.get_allow_char_list(None)]
+            + [dictionary.get_allow_char_list(role) for role in sorted(ALL_ROLES)]
+        ),
+    )
+
+
+# the class of each character in the recognizer output; 0 is the blank
+def get_class_by_char(reader: easyocr.Reader) -> Mapping[str, int]:
+    class_by_char: Dict[str, int] = {}
+    for index, char in enumerate(reader.character):
+        # easyocr looks up the first one
+        class_by_char.setdefault(char, index + 1)
+    return class_by_char
@@ -1,39 +1,64 @@
-from typing import Iterable
+from typing import Iterable, Sequence
 
 from taikoi2t.application.column import (
     COLUMN_DICTIONARY,
     DEFAULT_COLUMN_KEYS,
     OPPONENT_COLUMN_KEYS,
 )
-from taikoi2t.models.args import Args
+from taikoi2t.models.args import Args, RenderArgs
+from taikoi2t.models.column import Column
 from taikoi2t.models.settings import OutputFormat, Settings
 
 
 def new_settings_from(args: Args) -> Settings:
+    output_format = __select_output_format(args.csv, args.json)
+    return Settings(
+        columns=__select_columns(output_format, args.columns, args.opponent),
+        output_format=output_format,
+        alias=not args.no_alias,
+        sp_sort=not args.no_sp_sort,
+        verbose=args.verbose,
+        reduced_decode=args.reduced_decode,
+        keep_ocr=args.keep_ocr,
+        lexicon=args.lexicon,
+        time_budget=None if args.time_budget is None else args.time_budget / 1000,
+    )
+
+
+# sp_sort is used only to match again; rendered specials stay as they are stored
+def new_render_settings_from(args: RenderArgs) -> Settings:
+    output_format = __select_output_format(args.csv, args.json)
+    return Settings(
+        columns=__select_columns(output_format, args.columns, args.opponent),
+        output_format=output_format,
+        alias=not args.no_alias,
+        sp_sort=not args.no_sp_sort,
+        verbose=args.verbose,
+    )
+
+
+def __select_output_format(csv: bool, json: bool) -> OutputFormat:
     output_format: OutputFormat = "tsv"
-    if args.csv:
+    if csv:
         output_format = "csv"
-    if args.json:
+    if json:
         output_format = "json"  # overwrite csv
+    return output_format
+
 
+def __select_columns(
+    output_format: OutputFormat, columns: Sequence[str], opponent: bool
+) -> Sequence[Column]:
     column_keys: Iterable[str]
     if output_format == "json":
         column_keys = []
-    elif len(args.columns) > 0:
-        column_keys = args.columns
-    elif args.opponent:
+    elif len(columns) > 0:
+        column_keys = columns
+    elif opponent:
         column_keys = OPPONENT_COLUMN_KEYS
     else:
         column_keys = DEFAULT_COLUMN_KEYS
 
-    return Settings(
-        columns=[
-            COLUMN_DICTIONARY[key]
-            for key in column_keys
-            if key in COLUMN_DICTIONARY.keys()
-        ],
-        output_format=output_format,
-        alias=not args.no_alias,
-        sp_sort=not args.no_sp_sort,
-        verbose=args.verbose,
-    )
+    return [
+        COLUMN_DICTIONARY[key] for key in column_keys if key in COLUMN_DICTIONARY.keys()
+    ]
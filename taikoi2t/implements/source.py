@@ -0,0 +1,69 @@
+import logging
+from pathlib import Path
+
+import numpy
+
+from taikoi2t.implements.file import is_regular_file, new_file_entry
+from taikoi2t.implements.image import decode_image, new_image_meta_from, read_image
+from taikoi2t.models.file import FileEntry
+from taikoi2t.models.image import Image, ImageMeta
+from taikoi2t.models.source import ImageSource
+
+logger: logging.Logger = logging.getLogger("taikoi2t.source")
+
+
+def new_path_source(path: Path) -> ImageSource:
+    return new_file_source(new_file_entry(path))
+
+
+# uses the cached stat of the entry instead of checking the file again
+def new_file_source(entry: FileEntry) -> ImageSource:
+    def load(reduction: int) -> Image | None:
+        path_str = entry.path.as_posix()
+        if entry.stat is None:
+            logger.error(f"{path_str} is not found")
+            return None
+        if not is_regular_file(entry):
+            logger.error(f"{path_str} is not a file")
+            return None
+        return read_image(entry.path, reduction)
+
+    return ImageSource(
+        new_image_meta_from(entry),
+        load,
+        size=None if entry.stat is None else entry.stat.st_size,
+        origin=entry,
+    )
+
+
+def new_encoded_source(meta: ImageMeta, data: bytes) -> ImageSource:
+    return ImageSource(
+        meta,
+        lambda reduction: decode_image(numpy.frombuffer(data, numpy.uint8), reduction),
+        size=len(data),
+        origin=data,
+    )
+
+
+# the same source as the one which has the origin
+def new_source_from_origin(meta: ImageMeta, origin: FileEntry | bytes) -> ImageSource:
+    if isinstance(origin, bytes):
+        return new_encoded_source(meta, origin)
+    return new_file_source(origin)
+
+
+# raw frames are not decoded, so only the full scale is available
+def new_array_source(meta: ImageMeta, image: Image) -> ImageSource:
+    return ImageSource(meta, lambda reduction: image if reduction == 1 else None)
+
+
+def new_synthetic_image_meta(path: str, name: str) -> ImageMeta:
+    return ImageMeta(
+        path=path,
+        name=name,
+        birth_time_ns=None,
+        modify_time_ns=None,
+        width=None,
+        height=None,
+        modal=None,
+    )
@@ -0,0 +1,83 @@
+import logging
+import struct
+from typing import BinaryIO, Iterator, List
+
+import numpy
+
+from taikoi2t.implements.source import (
+    new_array_source,
+    new_encoded_source,
+    new_synthetic_image_meta,
+)
+from taikoi2t.models.source import ImageSource
+from taikoi2t.models.stream import StreamFormat
+
+logger: logging.Logger = logging.getLogger("taikoi2t.stream")
+
+__LENGTH = struct.Struct(">I")
+__DIMENSION = struct.Struct(">II")
+__CHANNELS: int = 3  # BGR
+# 8K; larger headers are broken rather than screenshots
+RAW_MAX_WIDTH: int = 7680
+RAW_MAX_HEIGHT: int = 4320
+# encoded images are not larger than the raw pixels of the largest frame
+ENCODED_MAX_LENGTH: int = RAW_MAX_WIDTH * RAW_MAX_HEIGHT * __CHANNELS
+
+
+def read_stream_sources(
+    stream: BinaryIO, stream_format: StreamFormat, label: str = "stdin"
+) -> Iterator[ImageSource]:
+    index = 0
+    while True:
+        meta = new_synthetic_image_meta(f"<{label}>/{index}", f"{label}-{index}")
+        if stream_format == "encoded":
+            header = __read_exact(stream, __LENGTH.size, meta.path)
+            if header is None:
+                return
+            (length,) = __LENGTH.unpack(header)
+            if length > ENCODED_MAX_LENGTH:
+                logger.error(
+                    f"{meta.path} is too large; {length} > {ENCODED_MAX_LENGTH} bytes"
+                )
+                return
+            data = __read_exact(stream, length, meta.path)
+            if data is None:
+                return
+            yield new_encoded_source(meta, data)
+        else:
+            header = __read_exact(stream, __DIMENSION.size, meta.path)
+            if header is None:
+                return
+            width, height = __DIMENSION.unpack(header)
+            # the rest cannot be parsed without trusting the header
+            if width > RAW_MAX_WIDTH or height > RAW_MAX_HEIGHT:
+                logger.error(
+                    f"{meta.path} is too large; {width}x{height} > "
+                    f"{RAW_MAX_WIDTH}x{RAW_MAX_HEIGHT}"
+                )
+                return
+            data = __read_exact(stream, width * height * __CHANNELS, meta.path)
+            if data is None:
+                return
+            frame = numpy.frombuffer(data, numpy.uint8).reshape(
+                (height, width, __CHANNELS)
+            )
+            yield new_array_source(meta, frame)
+        index += 1
+
+
+# Returns None at the end of the stream
+def __read_exact(stream: BinaryIO, size: int, path_str: str) -> bytes | None:
+    chunks: List[bytes] = []
+    remaining = size
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    if remaining == 0:
+        return b"".join(chunks)
+    if remaining < size:
+        logger.error(f"{path_str} is truncated; {size - remaining} of {size} bytes")
+    return None
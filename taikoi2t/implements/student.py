@@ -1,5 +1,8 @@
 from taikoi2t.models.student import DEFAULT_STUDENT_INDEX, ERROR_STUDENT_NAME, Student
 
+# OCR often misses or adds dakuten/handakuten, e.g. ガ <-> カ
+DIACRITIC_SUBSTITUTION_COST: float = 0.25
+
 
 def new_empty_student() -> Student:
     return Student(DEFAULT_STUDENT_INDEX, "", None)
@@ -13,10 +16,25 @@ def normalize_student_name(name: str) -> str:
     return name.replace("(", "（").replace(")", "）")
 
 
+# OCR reads parentheses in half-width as the allowlist has them
+def to_ocr_student_name(name: str) -> str:
+    return name.replace("（", "(").replace("）", ")")
+
+
 def remove_diacritics(word: str) -> str:
     return word.translate(__DIACRITIC_MAP)
 
 
+# substitutions between characters only different in diacritics are cheap
+def diacritic_substitution_cost(c1: str, c2: str) -> float:
+    if c1 == c2:
+        return 0.0
+    elif remove_diacritics(c1) == remove_diacritics(c2):
+        return DIACRITIC_SUBSTITUTION_COST
+    else:
+        return 1.0
+
+
 __DIACRITIC_MAP = str.maketrans(
     {
         "が": "か",
@@ -0,0 +1,67 @@
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Set, Tuple
+
+from taikoi2t.implements.file import discover_files, get_modify_time_ns
+from taikoi2t.models.file import FileEntry, FileFilter
+
+logger: logging.Logger = logging.getLogger("taikoi2t.watch")
+
+
+# polls the wildcard patterns and reports the files added after the start
+class FileWatcher:
+    def __init__(
+        self,
+        patterns: Sequence[Path],
+        file_filter: FileFilter | None,
+        interval: float,
+        on_arrival: Callable[[List[FileEntry]], None],
+    ) -> None:
+        self.patterns: Sequence[Path] = patterns
+        self.file_filter: FileFilter | None = file_filter
+        self.interval: float = interval
+        self.on_arrival: Callable[[List[FileEntry]], None] = on_arrival
+        self.stopped: threading.Event = threading.Event()
+        self.thread: threading.Thread = threading.Thread(target=self.__run, daemon=True)
+        self.known: Set[str] = set()
+        # files still being written are reported after they stop changing
+        self.pending: Dict[str, Tuple[int, int]] = {}
+
+    # files existing at this time are not reported
+    def start(self, existing: Sequence[FileEntry]) -> None:
+        self.known.update(str(entry.path) for entry in existing)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        if self.thread.is_alive():
+            self.thread.join()
+
+    def poll(self) -> List[FileEntry]:
+        arrived: List[FileEntry] = []
+        pending: Dict[str, Tuple[int, int]] = {}
+        for entry in discover_files(self.patterns, self.file_filter):
+            path_str = str(entry.path)
+            if path_str in self.known or entry.stat is None:
+                continue
+            state = (entry.stat.st_size, entry.stat.st_mtime_ns)
+            if self.pending.get(path_str) == state:
+                self.known.add(path_str)
+                arrived.append(entry)
+            else:
+                pending[path_str] = state
+        self.pending = pending
+        # the newest is the last to be taken first from the live lane
+        return sorted(arrived, key=lambda e: get_modify_time_ns(e) or 0)
+
+    def __run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            try:
+                arrived = self.poll()
+            except Exception as e:
+                logger.error(f"Failed to poll files; {e}")
+                continue
+            if len(arrived) > 0:
+                logger.info(f"{len(arrived)} files arrived")
+                self.on_arrival(arrived)
@@ -1,8 +1,11 @@
 from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
 from typing import Optional, Sequence
 
 from taikoi2t.models.file import FileSortKeyOrder
+from taikoi2t.models.reader import Engine
+from taikoi2t.models.stream import StreamFormat
 
 VERBOSE_SILENT = 0
 VERBOSE_ERROR = 1
@@ -23,3 +26,38 @@ class Args:
     verbose: int
     logfile: Optional[Path]
     files: Sequence[Path]
+    reduced_decode: bool = False
+    stdin: Optional[StreamFormat] = None
+    shm: Optional[str] = None
+    extensions: Sequence[str] = ()
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    journal: Optional[Path] = None
+    resume: bool = False
+    watch: bool = False
+    watch_interval: float = 1.0
+    batch_images: int = 1
+    batch_size: int = 64
+    batch_wait: float = 20.0
+    workers: int = 1
+    threads: int = 1
+    model_cache: Optional[Path] = None
+    engine: Engine = "eager"
+    keep_ocr: bool = False
+    lexicon: bool = False
+    time_budget: Optional[float] = None  # in milliseconds
+
+
+# arguments of the render and rematch commands
+@dataclass
+class RenderArgs:
+    opponent: bool
+    columns: Sequence[str]
+    csv: bool
+    json: bool
+    no_alias: bool
+    verbose: int
+    logfile: Optional[Path]
+    files: Sequence[Path]  # "-" for stdin
+    dictionary: Optional[Path] = None  # to match again; only for rematch
+    no_sp_sort: bool = False
@@ -1,7 +1,24 @@
-from typing import Literal, Set, TypeAlias, get_args
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal, Optional, Sequence, Set, TypeAlias, get_args
 
 __FileSortKeyOrder: TypeAlias = Literal[
     "BIRTH_ASC", "BIRTH_DESC", "MODIFY_ASC", "MODIFY_DESC", "NAME_ASC", "NAME_DESC"
 ]
 type FileSortKeyOrder = __FileSortKeyOrder
 ALL_FILE_SORT_KEY_ORDERS: Set[FileSortKeyOrder] = set(get_args(__FileSortKeyOrder))
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    path: Path
+    stat: Optional[os.stat_result]  # None if not found
+
+
+# applied to the files matched with wildcards
+@dataclass(frozen=True)
+class FileFilter:
+    extensions: Sequence[str] = ()  # lower case with the leading dot; empty for any
+    since_ns: Optional[int] = None  # compared with the modify time
+    until_ns: Optional[int] = None
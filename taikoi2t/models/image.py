@@ -30,6 +30,11 @@ class BoundingBox:
             int(self.left), int(self.top), int(self.right), int(self.bottom)
         )
 
+    def scaled(self, scale: int) -> "BoundingBox":
+        return BoundingBox(
+            self.left * scale, self.top * scale, self.right * scale, self.bottom * scale
+        )
+
 
 @dataclass(frozen=True)
 class RelativeBox:
@@ -48,3 +53,14 @@ class ImageMeta:
     width: Optional[int]
     height: Optional[int]
     modal: Optional[BoundingBox]
+
+
+# minimum data to extract a match result; the colored source can be released after this
+@dataclass(frozen=True)
+class ModalImage:
+    grayscale: Image
+    modal: BoundingBox
+    wins: Image  # colored, cropped region for checking win or lose
+    width: int  # of the source image
+    height: int
+    scale: int  # > 1 if decoded at reduced scale
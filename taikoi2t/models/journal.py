@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+
+
+# identifies an input file; a changed file is processed again
+@dataclass(frozen=True)
+class JournalKey:
+    path: str
+    size: int  # in bytes
+    modify_time_ns: int
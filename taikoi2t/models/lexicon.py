@@ -0,0 +1,27 @@
+from typing import Dict, List, Sequence, Tuple
+
+
+# Prefix tree of words.
+#
+# Node 0 is the root. Each node is reached by a character from its parent;
+# the words ending at a node give their values (e.g. indices in the dictionary).
+class NameTrie:
+    def __init__(self, words: Sequence[Tuple[str, int]]) -> None:
+        self.children: List[Dict[str, int]] = [{}]  # by node, to the child by char
+        self.chars: List[str] = [""]  # by node, reached by this char
+        self.words: Dict[int, Tuple[str, int]] = {}  # by node, the first word there
+        for word, value in words:
+            node = 0
+            for char in word:
+                child = self.children[node].get(char)
+                if child is None:
+                    child = len(self.children)
+                    self.children[node][char] = child
+                    self.children.append({})
+                    self.chars.append(char)
+                node = child
+            if node != 0:
+                self.words.setdefault(node, (word, value))
+
+    def __len__(self) -> int:
+        return len(self.words)
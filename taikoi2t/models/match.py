@@ -1,6 +1,8 @@
 from dataclasses import dataclass
+from typing import Optional, Sequence
 
 from taikoi2t.models.image import ImageMeta
+from taikoi2t.models.ocr import SlotRecognition
 from taikoi2t.models.team import Team
 
 
@@ -10,3 +12,8 @@ class MatchResult:
     image: ImageMeta
     player: Team
     opponent: Team
+    label: Optional[str] = None  # the arrival order given by the scheduler
+    # raw OCR output of the 12 slots if --keep-ocr, to match them again later
+    recognitions: Optional[Sequence[SlotRecognition]] = None
+    # some students are read with low confidence, or not retried out of time
+    low_confidence: bool = False
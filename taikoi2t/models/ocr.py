@@ -1,3 +1,25 @@
-from typing import List, Tuple
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from taikoi2t.models.image import BoundingBox
+from taikoi2t.models.student import Role
 
 type Character = Tuple[List[Tuple[int, int]], str, float]
+
+
+# a text read by OCR, kept to match it again with another dictionary
+@dataclass(frozen=True)
+class OCRText:
+    text: str
+    confidence: float
+    box: BoundingBox  # circumscribing the detected polygon
+
+
+# raw OCR output of a slot of students
+@dataclass(frozen=True)
+class SlotRecognition:
+    role: Optional[Role]
+    blank: bool
+    texts: Sequence[OCRText]  # read at once; empty if blank
+    # read by single character; None if not retried or nothing is detected
+    by_character: Optional[Sequence[OCRText]] = None
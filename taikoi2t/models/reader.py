@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal, Optional, Set, TypeAlias, get_args
+
+__Engine: TypeAlias = Literal["eager", "traced"]
+type Engine = __Engine
+ALL_ENGINES: Set[Engine] = set(get_args(__Engine))
+
+
+# how to build the OCR reader
+@dataclass(frozen=True)
+class ReaderOptions:
+    # directory to cache model weights; None not to cache them
+    model_cache: Optional[Path] = None
+    engine: Engine = "eager"  # "traced" runs the recognizer by TorchScript
+    verbose: bool = False
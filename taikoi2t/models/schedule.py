@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+from typing import Literal, Set, TypeAlias, get_args
+
+__Lane: TypeAlias = Literal["B", "L"]  # backfill, live
+type Lane = __Lane
+ALL_LANES: Set[Lane] = set(get_args(__Lane))
+
+
+@dataclass(frozen=True)
+class Scheduled[T]:
+    item: T
+    lane: Lane
+    sequence: int  # in the order of arrival for each lane
+
+    # sorting by this restores the arrival order regardless of the processing order
+    @property
+    def label(self) -> str:
+        return f"{self.lane}{self.sequence:06d}"
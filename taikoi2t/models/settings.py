@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from functools import cached_property
-from typing import Literal, Sequence, Set
+from typing import Literal, Optional, Sequence, Set
 
 from taikoi2t.models.column import ALL_REQUIREMENTS, Column, Requirement
 
@@ -14,6 +14,10 @@ class Settings:
     alias: bool
     sp_sort: bool
     verbose: int
+    reduced_decode: bool = False
+    keep_ocr: bool = False
+    lexicon: bool = False
+    time_budget: Optional[float] = None  # in seconds for each image
 
     @cached_property
     def requirements(self) -> Set[Requirement]:
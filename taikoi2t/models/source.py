@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from taikoi2t.models.file import FileEntry
+from taikoi2t.models.image import Image, ImageMeta
+
+# takes the reduction of decoding (1, 2, 4 or 8) and returns None if not supported
+type ImageLoader = Callable[[int], Image | None]
+
+
+@dataclass(frozen=True)
+class ImageSource:
+    meta: ImageMeta  # without the image dimension and the modal
+    load: ImageLoader
+    # called after the modal image is copied out; the loaded image must not be used then
+    release: Optional[Callable[[], None]] = None
+    size: Optional[int] = None  # of the encoded file in bytes; None if unknown
+    # picklable to load the image again in other processes; None if not supported
+    origin: Optional[FileEntry | bytes] = None
@@ -0,0 +1,7 @@
+from typing import Literal, Set, TypeAlias, get_args
+
+# encoded: repeated (uint32 length, encoded image bytes)
+# raw: repeated (uint32 width, uint32 height, BGR pixels); integers are big-endian
+__StreamFormat: TypeAlias = Literal["encoded", "raw"]
+type StreamFormat = __StreamFormat
+ALL_STREAM_FORMATS: Set[StreamFormat] = set(get_args(__StreamFormat))
@@ -1,12 +1,17 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional
+from typing import Literal, Optional, Set, TypeAlias, get_args
 
 from taikoi2t.models.json import CustomJSONSerializable, JSONType
+from taikoi2t.models.lexicon import NameTrie
 
 DEFAULT_STUDENT_INDEX = -1
 ERROR_STUDENT_NAME: str = "Error"
 
+__Role: TypeAlias = Literal["STRIKER", "SPECIAL"]
+type Role = __Role
+ALL_ROLES: Set[Role] = set(get_args(__Role))
+
 
 @dataclass(frozen=True)
 class Student(CustomJSONSerializable):
@@ -31,7 +36,13 @@ class Student(CustomJSONSerializable):
 class StudentDictionary(ABC):
     @abstractmethod
     def validate(self) -> bool: ...
+    # narrowed to the students of the role and the ones without roles if given
+    @abstractmethod
+    def get_allow_char_list(self, role: Optional[Role] = None) -> str: ...
+    @abstractmethod
+    def match(self, recognized_text: str, role: Optional[Role] = None) -> Student: ...
+    # names spelled as OCR reads them, valued by their indices
     @abstractmethod
-    def get_allow_char_list(self) -> str: ...
+    def get_lexicon(self, role: Optional[Role] = None) -> NameTrie: ...
     @abstractmethod
-    def match(self, recognized_text: str) -> Student: ...
+    def get_student(self, index: int) -> Student: ...
@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import time
+from pathlib import Path
+from typing import Any, List
+
+import numpy
+import pytest
+
+import taikoi2t.api
+from taikoi2t.api import Extractor, extract_many, new_extractor
+from taikoi2t.application.student import StudentDictionaryImpl
+from taikoi2t.implements.match import new_errored_match_result
+from taikoi2t.models.match import MatchResult
+from taikoi2t.models.source import ImageSource
+
+DICTIONARY = StudentDictionaryImpl([("ホシノ", None)])
+
+
+class _Recorder:
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.started: List[str] = []
+
+    def __call__(self, source: ImageSource, *args: Any) -> MatchResult | None:
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            self.started.append(source.meta.path)
+        # later targets finish earlier
+        index = int("".join(c for c in source.meta.name if c.isdigit()))
+        time.sleep(self.seconds / (1 + index))
+        with self.lock:
+            self.running -= 1
+        return new_errored_match_result(source.meta)
+
+
+def test_extract_many() -> None:
+    async def collect() -> List[MatchResult]:
+        return [
+            match_result
+            async for match_result in extract_many(
+                [numpy.zeros((90, 160, 3), dtype=numpy.uint8), "./not-found.png"],
+                dictionary=DICTIONARY,
+                reader=None,
+            )
+        ]
+
+    results = asyncio.run(collect())
+    # no result windows are found
+    assert [r.image.path for r in results] == ["<array>/0", "not-found.png"]
+
+
+def test_extract_many_concurrency(monkeypatch: pytest.MonkeyPatch) -> None:
+    recorder = _Recorder(0.2)
+    monkeypatch.setattr(taikoi2t.api, "extract_match_result_from_source", recorder)
+    images = [numpy.zeros((1, 1, 3), dtype=numpy.uint8) for _ in range(6)]
+
+    async def collect() -> List[str]:
+        return [
+            match_result.image.path
+            async for match_result in extract_many(
+                images, dictionary=DICTIONARY, reader=None, concurrency=3
+            )
+        ]
+
+    paths = asyncio.run(collect())
+    assert sorted(paths) == [f"<array>/{i}" for i in range(6)]
+    assert paths != sorted(paths)  # as they finish
+    assert recorder.max_running == 3
+
+
+def test_extract_many_close(monkeypatch: pytest.MonkeyPatch) -> None:
+    recorder = _Recorder(0.05)
+    monkeypatch.setattr(taikoi2t.api, "extract_match_result_from_source", recorder)
+
+    async def take_first() -> MatchResult:
+        async def targets() -> Any:
+            for i in range(100):
+                yield Path(f"{i}.png")
+
+        generator = extract_many(
+            targets(), dictionary=DICTIONARY, reader=None, concurrency=2
+        )
+        first = await anext(generator)
+        # the targets are not taken while the caller does not receive the results
+        await asyncio.sleep(0.2)
+        assert len(recorder.started) <= 3
+        await generator.aclose()
+        return first
+
+    first = asyncio.run(take_first())
+    assert first.image.path in ("0.png", "1.png")
+    time.sleep(0.1)
+    assert len(recorder.started) <= 3
+
+
+def test_extract_many_invalid_concurrency() -> None:
+    async def collect() -> None:
+        async for _ in extract_many(
+            [], dictionary=DICTIONARY, reader=None, concurrency=0
+        ):
+            pass
+
+    with pytest.raises(ValueError):
+        asyncio.run(collect())
+
+
+def test_extractor() -> None:
+    extractor = Extractor(DICTIONARY, None, batch_images=2)
+    try:
+        blank = numpy.zeros((90, 160, 3), dtype=numpy.uint8)
+        assert extractor.extract(blank).image.path == "<array>/0"
+        assert extractor.extract(b"not an image").image.path == "<bytes>/0"
+
+        results = extractor.extract_batch([blank, b"", "./not-found.png", blank])
+        assert [r.image.path for r in results] == [
+            "<array>/0",
+            "<bytes>/1",
+            "not-found.png",
+            "<array>/3",
+        ]
+
+        async def collect() -> List[str]:
+            return [r.image.path async for r in extractor.extract_many([blank, b""])]
+
+        assert sorted(asyncio.run(collect())) == ["<array>/0", "<bytes>/1"]
+    finally:
+        extractor.close()
+
+
+def test_new_extractor_invalid_dictionary() -> None:
+    assert new_extractor(Path("./not-found.csv")) is None
@@ -113,7 +113,7 @@ def test_extract_match_result() -> None:
             source_image: Image = cv2.imread(image_meta.path)
 
             actual = extract_match_result(
-                "id", expected_result.path, source_image, dictionary, reader, settings
+                "id", image_meta, source_image, dictionary, reader, settings
             )
             assert actual is not None
 
@@ -0,0 +1,105 @@
+import logging
+import tarfile
+import zipfile
+from pathlib import Path
+
+import cv2
+import numpy
+import pytest
+
+from taikoi2t.implements.archive import (
+    is_archive,
+    iterate_sources,
+    read_archive_sources,
+)
+from taikoi2t.implements.file import new_file_entry
+from taikoi2t.models.image import Image
+
+
+def test_is_archive() -> None:
+    assert is_archive(Path("backup.zip")) is True
+    assert is_archive(Path("backup.ZIP")) is True
+    assert is_archive(Path("backup.tar")) is True
+    assert is_archive(Path("backup.tar.gz")) is True
+    assert is_archive(Path("backup.tgz")) is True
+    assert is_archive(Path("image.png")) is False
+    assert is_archive(Path("backup.gz")) is False
+
+
+def test_read_archive_sources_zip(tmp_path: Path) -> None:
+    image1 = __encode(numpy.full((20, 30, 3), 10, dtype=numpy.uint8))
+    path1 = tmp_path / "images.zip"
+    with zipfile.ZipFile(path1, mode="w") as archive:
+        archive.writestr(
+            zipfile.ZipInfo("b/0002.png", date_time=(2025, 4, 1, 0, 0, 2)), image1
+        )
+        archive.writestr("readme.txt", "not an image")
+        archive.writestr(
+            zipfile.ZipInfo("a/0001.PNG", date_time=(2025, 4, 1, 0, 0, 4)), image1
+        )
+
+    res1 = list(read_archive_sources(path1))
+    assert [s.meta.path for s in res1] == [
+        f"{path1.as_posix()}!b/0002.png",
+        f"{path1.as_posix()}!a/0001.PNG",
+    ]
+    assert [s.meta.name for s in res1] == ["0002.png", "0001.PNG"]
+    assert res1[0].meta.birth_time_ns is None
+    assert res1[0].meta.modify_time_ns is not None
+    assert res1[1].meta.modify_time_ns == res1[0].meta.modify_time_ns + 2_000_000_000
+
+    loaded1 = res1[0].load(1)
+    assert loaded1 is not None
+    assert loaded1.shape == (20, 30, 3)
+
+
+def test_read_archive_sources_tar(tmp_path: Path) -> None:
+    image_path = tmp_path / "0001.png"
+    cv2.imwrite(image_path.as_posix(), numpy.zeros((10, 10, 3), dtype=numpy.uint8))
+    path1 = tmp_path / "images.tar.gz"
+    with tarfile.open(path1, mode="w:gz") as archive:
+        info = archive.gettarinfo(image_path, arcname="shots/0001.png")
+        info.mtime = 1743465600
+        with image_path.open(mode="rb") as image_file:
+            archive.addfile(info, image_file)
+        archive.add(tmp_path, arcname="shots", recursive=False)  # directory
+
+    res1 = list(read_archive_sources(path1))
+    assert len(res1) == 1
+    assert res1[0].meta.path == f"{path1.as_posix()}!shots/0001.png"
+    assert res1[0].meta.modify_time_ns == 1743465600_000_000_000
+
+    loaded1 = res1[0].load(1)
+    assert loaded1 is not None
+    assert loaded1.shape == (10, 10, 3)
+
+
+def test_read_archive_sources_not_found(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    path1 = tmp_path / "not_found.tar.gz"
+
+    res1 = list(read_archive_sources(path1))
+    assert len(res1) == 1
+    assert res1[0].meta.path == path1.as_posix()
+    assert res1[0].meta.modify_time_ns is None
+    assert res1[0].load(1) is None
+
+    assert len(caplog.record_tuples) == 1
+    assert caplog.record_tuples[0][:2] == ("taikoi2t.archive", logging.ERROR)
+    assert "not_found.tar.gz cannot read as an archive" in caplog.record_tuples[0][2]
+
+
+def test_iterate_sources(tmp_path: Path) -> None:
+    path1 = tmp_path / "images.zip"
+    with zipfile.ZipFile(path1, mode="w") as archive:
+        archive.writestr("1.png", b"")
+        archive.writestr("2.png", b"")
+
+    paths = [tmp_path / "0.png", path1, tmp_path / "3.png"]
+    res1 = list(iterate_sources(new_file_entry(p) for p in paths))
+    assert [s.meta.name for s in res1] == ["0.png", "1.png", "2.png", "3.png"]
+
+
+def __encode(image: Image) -> bytes:
+    return cv2.imencode(".png", image)[1].tobytes()
@@ -1,9 +1,12 @@
 import logging
+import subprocess
+import sys
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
 
-from taikoi2t.application.args import parse_args, validate_args
+from taikoi2t.application.args import parse_args, parse_render_args, validate_args
 from taikoi2t.models.args import (
     VERBOSE_ERROR,
     VERBOSE_IMAGE,
@@ -115,6 +118,99 @@ def test_parse_args_file_sort() -> None:
     assert e.value.code == 2
 
 
+def test_parse_args_reduced_decode() -> None:
+    res1 = parse_args("app -d dict.csv --reduced-decode image0.png".split())
+    assert res1.reduced_decode is True
+
+    res2 = parse_args("app -d dict.csv image0.png".split())
+    assert res2.reduced_decode is False
+
+
+def test_parse_args_ext() -> None:
+    res1 = parse_args("app -d dict.csv --ext png .JPG -- image0.png".split())
+    assert res1.extensions == ["png", ".JPG"]
+
+    res2 = parse_args("app -d dict.csv image0.png".split())
+    assert len(res2.extensions) == 0
+
+
+def test_parse_args_since_until() -> None:
+    res1 = parse_args(
+        "app -d dict.csv --since 2025-01-02T03:04:05 --until 2025-01-03 *.png".split()
+    )
+    assert res1.since == datetime(2025, 1, 2, 3, 4, 5)
+    assert res1.until == datetime(2025, 1, 3)
+
+    before = datetime.now()
+    res2 = parse_args("app -d dict.csv --since 2h *.png".split())
+    assert res2.since is not None
+    assert before - timedelta(hours=2) <= res2.since <= datetime.now()
+
+    res3 = parse_args("app -d dict.csv *.png".split())
+    assert res3.since is None
+    assert res3.until is None
+
+    with pytest.raises(SystemExit) as e:
+        parse_args("app -d dict.csv --since yesterday *.png".split())
+    assert e.value.code == 2
+
+
+def test_parse_args_batch() -> None:
+    res1 = parse_args("app -d dict.csv *.png".split())
+    assert res1.batch_images == 1
+    assert res1.batch_size == 64
+    assert res1.batch_wait == 20.0
+
+    res2 = parse_args(
+        "app -d dict.csv --batch-images 4 --batch-size 128 --batch-wait 5 *.png".split()
+    )
+    assert res2.batch_images == 4
+    assert res2.batch_size == 128
+    assert res2.batch_wait == 5.0
+
+    with pytest.raises(SystemExit) as e:
+        parse_args("app -d dict.csv --batch-images 0 *.png".split())
+    assert e.value.code == 2
+
+
+def test_parse_args_watch() -> None:
+    res1 = parse_args("app -d dict.csv --watch *.png".split())
+    assert res1.watch is True
+    assert res1.watch_interval == 1.0
+
+    res2 = parse_args("app -d dict.csv --watch --watch-interval 0.5 *.png".split())
+    assert res2.watch_interval == 0.5
+
+    res3 = parse_args("app -d dict.csv *.png".split())
+    assert res3.watch is False
+
+    with pytest.raises(SystemExit) as e1:
+        parse_args("app -d dict.csv --watch --stdin raw".split())
+    assert e1.value.code == 2
+
+    with pytest.raises(SystemExit) as e2:
+        parse_args("app -d dict.csv --watch --watch-interval 0 *.png".split())
+    assert e2.value.code == 2
+
+
+def test_parse_args_journal() -> None:
+    res1 = parse_args("app -d dict.csv --journal run.jsonl --resume *.png".split())
+    assert res1.journal is not None
+    assert res1.journal.as_posix() == "run.jsonl"
+    assert res1.resume is True
+
+    res2 = parse_args("app -d dict.csv --journal run.jsonl *.png".split())
+    assert res2.resume is False
+
+    res3 = parse_args("app -d dict.csv *.png".split())
+    assert res3.journal is None
+    assert res3.resume is False
+
+    with pytest.raises(SystemExit) as e:
+        parse_args("app -d dict.csv --resume *.png".split())
+    assert e.value.code == 2
+
+
 def test_parse_args_verbose() -> None:
     res1 = parse_args("app -d dict.csv --verbose image0.png".split())
     assert res1.verbose == VERBOSE_ERROR
@@ -153,6 +249,43 @@ def test_parse_args_files() -> None:
     assert e.value.code == 2
 
 
+def test_parse_args_stdin() -> None:
+    res1 = parse_args("app -d dict.csv --stdin encoded".split())
+    assert res1.stdin == "encoded"
+    assert res1.files == []
+
+    res2 = parse_args("app -d dict.csv --stdin raw".split())
+    assert res2.stdin == "raw"
+
+    res3 = parse_args("app -d dict.csv image0.png".split())
+    assert res3.stdin is None
+
+    with pytest.raises(SystemExit) as e1:
+        parse_args("app -d dict.csv --stdin png".split())
+    assert e1.value.code == 2
+
+    with pytest.raises(SystemExit) as e2:
+        parse_args("app -d dict.csv --stdin raw image0.png".split())
+    assert e2.value.code == 2
+
+
+def test_parse_args_shm() -> None:
+    res1 = parse_args("app -d dict.csv --shm frames".split())
+    assert res1.shm == "frames"
+    assert res1.files == []
+
+    res2 = parse_args("app -d dict.csv image0.png".split())
+    assert res2.shm is None
+
+    with pytest.raises(SystemExit) as e1:
+        parse_args("app -d dict.csv --shm frames --stdin raw".split())
+    assert e1.value.code == 2
+
+    with pytest.raises(SystemExit) as e2:
+        parse_args("app -d dict.csv --shm frames image0.png".split())
+    assert e2.value.code == 2
+
+
 def test_validate_args_valid(caplog: pytest.LogCaptureFixture) -> None:
     args1 = Args(
         dictionary=Path("./students.csv"),
@@ -235,3 +368,132 @@ def test_validate_args_unknown_columns(caplog: pytest.LogCaptureFixture) -> None
     assert caplog.record_tuples == [
         ("taikoi2t.args", logging.CRITICAL, "Unknown columns L0, L7")
     ]
+
+
+def test_parse_args_keep_ocr() -> None:
+    res1 = parse_args("app -d dict.csv a.png".split())
+    assert res1.keep_ocr is False
+
+    res2 = parse_args("app -d dict.csv --keep-ocr a.png".split())
+    assert res2.keep_ocr is True
+
+
+def test_parse_args_time_budget() -> None:
+    res1 = parse_args("app -d dict.csv a.png".split())
+    assert res1.time_budget is None
+
+    res2 = parse_args("app -d dict.csv --time-budget 1500 a.png".split())
+    assert res2.time_budget == 1500.0
+
+    with pytest.raises(SystemExit) as e:
+        parse_args("app -d dict.csv --time-budget 0 a.png".split())
+    assert e.value.code == 2
+
+
+def test_parse_args_lexicon() -> None:
+    res1 = parse_args("app -d dict.csv a.png".split())
+    assert res1.lexicon is False
+
+    res2 = parse_args("app -d dict.csv --lexicon a.png".split())
+    assert res2.lexicon is True
+
+
+def test_parse_args_reader() -> None:
+    res1 = parse_args("app -d dict.csv *.png".split())
+    assert res1.model_cache is None
+    assert res1.engine == "eager"
+
+    res2 = parse_args("app -d dict.csv --model-cache cache *.png".split())
+    assert res2.model_cache == Path("cache")
+
+    res3 = parse_args("app -d dict.csv --engine traced *.png".split())
+    assert res3.engine == "traced"
+
+    with pytest.raises(SystemExit) as e:
+        parse_args("app -d dict.csv --engine compiled *.png".split())
+    assert e.value.code == 2
+
+
+def test_parse_args_workers() -> None:
+    res1 = parse_args("app -d dict.csv *.png".split())
+    assert res1.workers == 1
+
+    res2 = parse_args("app -d dict.csv --workers 4 *.png".split())
+    assert res2.workers == 4
+
+    with pytest.raises(SystemExit) as e1:
+        parse_args("app -d dict.csv --workers 0 *.png".split())
+    assert e1.value.code == 2
+
+    with pytest.raises(SystemExit) as e2:
+        parse_args("app -d dict.csv --workers 2 --batch-images 2 *.png".split())
+    assert e2.value.code == 2
+
+
+def test_parse_args_without_torch() -> None:
+    # parsing arguments must not pay for loading torch
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; import taikoi2t.application.args; "
+            "sys.exit('torch' in sys.modules)",
+        ],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_parse_args_threads() -> None:
+    res1 = parse_args("app -d dict.csv *.png".split())
+    assert res1.threads == 1
+
+    res2 = parse_args("app -d dict.csv --threads 4 *.png".split())
+    assert res2.threads == 4
+
+    with pytest.raises(SystemExit) as e1:
+        parse_args("app -d dict.csv --threads 0 *.png".split())
+    assert e1.value.code == 2
+
+    with pytest.raises(SystemExit) as e2:
+        parse_args("app -d dict.csv --threads 2 --workers 2 *.png".split())
+    assert e2.value.code == 2
+
+
+def test_parse_render_args() -> None:
+    res1 = parse_render_args("app render results.jsonl -".split())
+    assert res1.files == [Path("results.jsonl"), Path("-")]
+    assert (res1.csv, res1.json, res1.no_alias, res1.opponent) == (
+        False,
+        False,
+        False,
+        False,
+    )
+
+    res2 = parse_render_args("app render --csv --no-alias -c L1 R1 -- a.json".split())
+    assert (res2.csv, res2.no_alias, res2.columns) == (True, True, ["L1", "R1"])
+
+    with pytest.raises(SystemExit) as e1:
+        parse_render_args("app render".split())
+    assert e1.value.code == 2
+
+    with pytest.raises(SystemExit) as e2:
+        parse_render_args("app render -d dict.csv a.json".split())
+    assert e2.value.code == 2
+
+
+def test_parse_render_args_rematch() -> None:
+    res1 = parse_render_args("app rematch -d dict.csv --no-sp-sort a.jsonl".split())
+    assert (res1.dictionary, res1.no_sp_sort, res1.files) == (
+        Path("dict.csv"),
+        True,
+        [Path("a.jsonl")],
+    )
+
+    res2 = parse_render_args("app render a.jsonl".split())
+    assert (res2.dictionary, res2.no_sp_sort) == (None, False)
+
+    with pytest.raises(SystemExit) as e1:
+        parse_render_args("app rematch a.jsonl".split())
+    assert e1.value.code == 2
@@ -0,0 +1,95 @@
+import threading
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy
+import pytest
+
+from taikoi2t.implements.batch import RecognizerBatcher
+from taikoi2t.implements.ocr import join_chars
+from taikoi2t.models.image import Image
+from taikoi2t.models.ocr import Character
+
+
+# returns the first pixel value as the text
+class _FakeReader:
+    def __init__(self) -> None:
+        self.batches: List[Tuple[int, Any]] = []
+
+    def readtext_batched(
+        self, images: Sequence[Image], **kwargs: Any
+    ) -> List[List[Character]]:
+        self.batches.append((len(images), kwargs.get("allowlist")))
+        return [[([(0, 0), (1, 0), (1, 1), (0, 1)], str(i[0, 0]), 0.9)] for i in images]
+
+
+def test_recognizer_batcher() -> None:
+    reader = _FakeReader()
+    # waits long enough to gather all requests
+    batcher = RecognizerBatcher(reader, max_batch=24, max_wait=0.5)
+    results: Dict[Tuple[int, str], List[str]] = {}
+
+    def extract(i: int) -> None:
+        slots = [numpy.full((10, 20), i * 10 + j, dtype=numpy.uint8) for j in range(6)]
+        texts = batcher.readtext_batched(slots, allowlist="0123456789")
+        results[(i, "slots")] = [join_chars(chars) for chars in texts]
+        name = batcher.readtext(numpy.full((5, 8), i, dtype=numpy.uint8))
+        results[(i, "name")] = [join_chars(name)]
+
+    threads = [threading.Thread(target=extract, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    for i in range(4):
+        assert results[(i, "slots")] == [str(i * 10 + j) for j in range(6)]
+        assert results[(i, "name")] == [str(i)]
+    # slots from 4 images in a batch
+    assert reader.batches[0] == (24, "0123456789")
+    assert sum(n for n, allowlist in reader.batches if allowlist is None) == 4
+
+
+def test_recognizer_batcher_max_wait() -> None:
+    reader = _FakeReader()
+    batcher = RecognizerBatcher(reader, max_batch=100, max_wait=0.01)
+
+    res1 = batcher.readtext(numpy.full((5, 8), 7, dtype=numpy.uint8))
+    assert join_chars(res1) == "7"
+    batcher.close()
+
+
+def test_recognizer_batcher_batch_limit() -> None:
+    batcher = RecognizerBatcher(_FakeReader(), max_batch=16, max_wait=0.0)
+    images = [numpy.zeros((100, 200), dtype=numpy.uint8)]
+    assert batcher.batch_limit(images, 2.0) == 16
+
+    huge = [numpy.zeros((1, 1), dtype=numpy.uint8)]
+    # 2**50 pixels cannot fit into memory
+    assert batcher.batch_limit(huge, 2.0**25) == 1
+    batcher.close()
+
+
+class _FailingReader(_FakeReader):
+    def readtext_batched(
+        self, images: Sequence[Image], **kwargs: Any
+    ) -> List[List[Character]]:
+        raise RuntimeError("failed to recognize")
+
+
+def test_recognizer_batcher_failed() -> None:
+    batcher = RecognizerBatcher(_FailingReader(), max_batch=4, max_wait=0.0)
+    # the recognizer errors are logged as `readtext_batched` does
+    assert batcher.readtext(numpy.full((5, 8), 7, dtype=numpy.uint8)) == []
+    batcher.close()
+
+
+def test_recognizer_batcher_unhashable() -> None:
+    batcher = RecognizerBatcher(_FakeReader(), max_batch=4, max_wait=0.0)
+    image = numpy.full((5, 8), 7, dtype=numpy.uint8)
+    # fails to group by the keyword arguments
+    with pytest.raises(TypeError):
+        batcher.readtext(image, allowlist=["7"])
+    # the thread is still alive
+    assert join_chars(batcher.readtext(image)) == "7"
+    batcher.close()
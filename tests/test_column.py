@@ -44,9 +44,11 @@ class __ColumnCount:
 def test_COLUMNS_selected_column_count() -> None:
     targets: Iterable[__ColumnCount] = [
         __ColumnCount(["IMAGE_ID", "ID", "IMAGE_PATH", "IMAGE_NAME", "INAME"], 1),
+        __ColumnCount(["LABEL", "SEQUENCE", "SEQ"], 1),
         __ColumnCount(
             ["IMAGE_BIRTH_TIME", "IMAGE_MODIFY_TIME", "IMAGE_WIDTH", "IMAGE_HEIGHT"], 1
         ),
+        __ColumnCount(["LOW_CONFIDENCE", "LOWCONF"], 1),
         __ColumnCount(["PLAYER_WINS", "LEFT_WINS", "PWIN", "LWIN"], 1),
         __ColumnCount(["PLAYER_WOL", "LEFT_WOL", "PWOL", "LWOL"], 1),
         __ColumnCount(
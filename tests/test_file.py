@@ -1,4 +1,5 @@
 import logging
+import os
 import textwrap
 import time
 from pathlib import Path
@@ -9,7 +10,14 @@ import numpy
 import pytest
 
 from taikoi2t.application.file import read_student_dictionary_source_file
-from taikoi2t.implements.file import expand_paths, sort_files
+from taikoi2t.implements.file import (
+    discover_files,
+    expand_paths,
+    new_file_entry,
+    sort_file_entries,
+    sort_files,
+)
+from taikoi2t.models.file import FileFilter
 from taikoi2t.models.image import Image
 
 
@@ -23,7 +31,32 @@ def test_read_student_dictionary_source_file(tmp_path: Path) -> None:
     path1.write_text(content1, encoding="utf-8")
 
     res1 = read_student_dictionary_source_file(path1)
-    assert res1 == [("シロコ（水着）", "水シロコ"), ("ホシノ", ""), ("ノノミ", "")]
+    assert res1 == [
+        ("シロコ（水着）", "水シロコ", None),
+        ("ホシノ", "", None),
+        ("ノノミ", "", None),  # not a role
+    ]
+
+
+def test_read_student_dictionary_source_file_role(tmp_path: Path) -> None:
+    content1 = textwrap.dedent("""\
+        シロコ（水着）,水シロコ,Special
+        ホシノ,,STRIKER
+        ノノミ,,ストライカー
+        アヤネ（水着）,水アヤネ,スペシャル
+        セリカ,,
+    """)
+    path1 = tmp_path / "students1.csv"
+    path1.write_text(content1, encoding="utf-8")
+
+    res1 = read_student_dictionary_source_file(path1)
+    assert res1 == [
+        ("シロコ（水着）", "水シロコ", "SPECIAL"),
+        ("ホシノ", "", "STRIKER"),
+        ("ノノミ", "", "STRIKER"),
+        ("アヤネ（水着）", "水アヤネ", "SPECIAL"),
+        ("セリカ", "", None),
+    ]
 
 
 def test_read_student_dictionary_source_file_warning(
@@ -38,7 +71,7 @@ def test_read_student_dictionary_source_file_warning(
     path1.write_text(content1, encoding="utf-8")
 
     res1 = read_student_dictionary_source_file(path1)
-    assert res1 == [("ホシノ", "")]
+    assert res1 == [("ホシノ", "", None)]
 
     assert caplog.record_tuples == [
         ("taikoi2t.file", logging.WARNING, "Empty name at line 1; ['', '水シロコ']"),
@@ -118,6 +151,75 @@ def test_expand_paths(tmp_path: Path) -> None:
     ]
 
 
+def test_expand_paths_recursive(tmp_path: Path) -> None:
+    for name in ["a/1.png", "a/b/2.png", "a/b/c/3.png", "a/.hidden/4.png", "5.png"]:
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).touch()
+
+    res1 = expand_paths([tmp_path / "**" / "*.png"])
+    assert res1 == [
+        tmp_path / "5.png",
+        tmp_path / "a" / "1.png",
+        tmp_path / "a" / "b" / "2.png",
+        tmp_path / "a" / "b" / "c" / "3.png",
+    ]
+
+    res2 = expand_paths([tmp_path / "a" / "**"])
+    assert res2 == [
+        tmp_path / "a" / "1.png",
+        tmp_path / "a" / "b" / "2.png",
+        tmp_path / "a" / "b" / "c" / "3.png",
+    ]
+
+    res3 = expand_paths([tmp_path / "*" / "*.png"])
+    assert res3 == [tmp_path / "a" / "1.png"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="symlinks need a privilege on Windows")
+def test_expand_paths_recursive_symlink(tmp_path: Path) -> None:
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "a" / "b" / "1.png").touch()
+    (tmp_path / "a" / "b" / "loop").symlink_to(tmp_path / "a", target_is_directory=True)
+
+    res1 = expand_paths([tmp_path / "**" / "*.png"])
+    assert res1 == [tmp_path / "a" / "b" / "1.png"]
+
+
+def test_discover_files_filter(tmp_path: Path) -> None:
+    for i, name in enumerate(["1.png", "2.PNG", "3.jpg", "4.txt", "5.png"]):
+        (tmp_path / name).touch()
+        os.utime(tmp_path / name, ns=(0, (i + 1) * 1_000_000_000))
+
+    res1 = discover_files([tmp_path / "*"], FileFilter(extensions=[".png", ".jpg"]))
+    assert __to_names(e.path for e in res1) == ["1.png", "2.PNG", "3.jpg", "5.png"]
+
+    res2 = discover_files(
+        [tmp_path / "*"],
+        FileFilter(since_ns=2_000_000_000, until_ns=4_000_000_000),
+    )
+    assert __to_names(e.path for e in res2) == ["2.PNG", "3.jpg", "4.txt"]
+
+    # explicit paths are not filtered
+    res3 = discover_files([tmp_path / "4.txt"], FileFilter(extensions=[".png"]))
+    assert __to_names(e.path for e in res3) == ["4.txt"]
+    assert res3[0].stat is not None
+
+    res4 = discover_files([tmp_path / "not_found.png"])
+    assert res4[0].stat is None
+
+
+def test_sort_file_entries(tmp_path: Path) -> None:
+    for i, name in enumerate(["c", "a", "b"]):
+        (tmp_path / name).touch()
+        os.utime(tmp_path / name, ns=(0, (i + 1) * 1_000_000_000))
+    entries = [new_file_entry(tmp_path / n) for n in ["a", "not_found", "b", "c"]]
+
+    res1 = sort_file_entries(entries, "MODIFY_ASC")
+    assert __to_names(e.path for e in res1) == ["c", "a", "b", "not_found"]
+    res2 = sort_file_entries(entries, "MODIFY_DESC")
+    assert __to_names(e.path for e in res2) == ["b", "a", "c", "not_found"]
+
+
 def test_sort_files(tmp_path: Path) -> None:
     paths = [tmp_path / n for n in ["e31", "f", "b14", "d22", "c", "a43"]]
     for name in ["b14", "d22", "e31", "a43"]:
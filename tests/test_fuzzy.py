@@ -0,0 +1,161 @@
+import csv
+import random
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+from rapidfuzz import process
+from rapidfuzz.distance import Levenshtein
+
+from taikoi2t.implements.fuzzy import (
+    FuzzyIndex,
+    weighted_distance,
+    weighted_similarity,
+)
+
+CUTOFF: float = 0.51
+
+
+def test_FuzzyIndex_candidates() -> None:
+    index = FuzzyIndex(["ホシノ", "シロコ", "ノノミ", "ホシノ（水着）"])
+    assert index.candidates("ホシノ", CUTOFF) == [0]
+    assert index.candidates("シノ", CUTOFF) == [0]
+    assert index.candidates("ホシノ", 0) == [0, 1, 2, 3]
+
+
+def test_FuzzyIndex_neighbors() -> None:
+    index = FuzzyIndex(["ホシノ", "シロコ", "ネル", "ホシノ（水着）", "ア"])
+    assert index.neighbors("ホシノ", 1) == [0]
+    assert index.neighbors("ホシノ", 2) == [0, 1]
+    assert index.neighbors("ホシノ", 3) == [0, 1, 2, 4]  # no common characters
+    assert index.neighbors("ホシノ", 4) == [0, 1, 2, 3, 4]
+
+
+def test_weighted_distance() -> None:
+    def cost(c1: str, c2: str) -> float:
+        return 0.5 if c1.lower() == c2.lower() else 1.0
+
+    assert weighted_distance("abc", "abc", cost) == 0
+    assert weighted_distance("abc", "aBc", cost) == 0.5
+    assert weighted_distance("abc", "axc", cost) == 1
+    assert weighted_distance("abc", "ac", cost) == 1
+    assert weighted_distance("", "ABC", cost) == 3
+    assert weighted_similarity("abcd", "aBCd", cost) == 0.75
+    assert weighted_similarity("", "", cost) == 1.0
+
+    rand = random.Random(0)
+    for _ in range(100):
+        s1 = "".join(rand.choice("abcd") for _ in range(rand.randint(0, 8)))
+        s2 = "".join(rand.choice("abcd") for _ in range(rand.randint(0, 8)))
+        assert weighted_distance(s1, s2, lambda c1, c2: 1.0) == Levenshtein.distance(
+            s1, s2
+        )
+
+
+def test_FuzzyIndex_candidates_complete() -> None:
+    names = __load_names()
+    index = FuzzyIndex(names)
+    alphabet = "".join(set("".join(names)))
+    rand = random.Random(0)
+    for name in names:
+        for query in [name, __mutate(rand, name, alphabet), name[: len(name) // 2]]:
+            # no choices passing the cutoff are pruned
+            expected = process.extract(
+                query,
+                names,
+                scorer=Levenshtein.normalized_similarity,
+                score_cutoff=CUTOFF,
+                limit=None,
+            )
+            candidates = index.candidates(query, CUTOFF)
+            assert set(i for _, _, i in expected) <= set(candidates), query
+            assert len(candidates) < len(names)
+
+            neighbors = index.neighbors(query, 3)
+            for i, choice in enumerate(names):
+                if Levenshtein.distance(query, choice) <= 3:
+                    assert i in neighbors, (query, choice)
+
+
+def test_FuzzyIndex_extract() -> None:
+    names = __load_names()
+    alphabet = "".join(set("".join(names)))
+    rand = random.Random(0)
+    # scanned at once, and pruned by the index
+    for choices in [names, __new_choices(rand, names, alphabet, 1000)]:
+        index = FuzzyIndex(choices)
+        for name in rand.choices(choices, k=50):
+            query = __mutate(rand, name, alphabet)
+            expected = sorted(
+                (
+                    (i, score)
+                    for i, choice in enumerate(choices)
+                    if (score := Levenshtein.normalized_similarity(query, choice))
+                    >= CUTOFF
+                ),
+                key=lambda r: (-r[1], r[0]),
+            )
+            assert index.extract(query, CUTOFF) == expected, query
+
+
+def test_FuzzyIndex_extract_sublinear() -> None:
+    names = __load_names()
+    alphabet = "".join(set("".join(names)))
+    rand = random.Random(0)
+
+    def measure(size: int) -> Tuple[float, float]:
+        choices = __new_choices(rand, names, alphabet, size)
+        index = FuzzyIndex(choices)
+        queries = [__mutate(rand, c, alphabet) for c in rand.choices(choices, k=300)]
+
+        starts_at = time.perf_counter()
+        for query in queries:
+            index.extract(query, CUTOFF)
+        indexed = time.perf_counter() - starts_at
+
+        starts_at = time.perf_counter()
+        for query in queries:
+            process.extract(
+                query,
+                choices,
+                scorer=Levenshtein.normalized_similarity,
+                score_cutoff=CUTOFF,
+                limit=None,
+            )
+        scanned = time.perf_counter() - starts_at
+        return indexed, scanned
+
+    small = measure(1500)
+    large = measure(12000)
+    # the scan grows linearly with the choices, and the index grows slower by far
+    assert large[0] / small[0] < large[1] / small[1] / 2
+
+
+# a dictionary of thousands of names near each other
+def __new_choices(
+    rand: random.Random, names: List[str], alphabet: str, size: int
+) -> List[str]:
+    choices = dict.fromkeys(names)
+    while len(choices) < size:
+        choices[__mutate(rand, rand.choice(names), alphabet)] = None
+    return list(choices)
+
+
+def __load_names() -> List[str]:
+    path = Path(__file__).parent.parent / "students.csv"
+    with path.open(encoding="utf-8") as file:
+        return [row[0] for row in csv.reader(file) if len(row) > 0]
+
+
+def __mutate(rand: random.Random, name: str, alphabet: str) -> str:
+    chars = list(name)
+    for _ in range(rand.randint(1, 3)):
+        position = rand.randrange(len(chars) + 1)
+        match rand.randrange(3):
+            case 0 if position < len(chars):
+                del chars[position]
+            case 1 if position < len(chars):
+                chars[position] = rand.choice(alphabet)
+            case _:
+                chars.insert(position, rand.choice(alphabet))
+    return "".join(chars)
@@ -0,0 +1,53 @@
+from typing import List, Tuple
+
+import numpy
+
+from taikoi2t.application.glyph import segment_glyphs
+from taikoi2t.models.image import Image
+
+TILE_SHAPE: Tuple[int, int] = (146, 245)
+
+
+def _new_tile(rects: List[Tuple[int, int, int, int]]) -> Image:
+    tile: Image = numpy.full(TILE_SHAPE, 255, dtype=numpy.uint8)
+    for left, top, right, bottom in rects:
+        tile[top:bottom, left:right] = 0
+    return tile
+
+
+def _spans(tile: Image) -> List[Tuple[int, int]]:
+    return [(box.left, box.right) for box in segment_glyphs(tile)]
+
+
+def test_segment_glyphs() -> None:
+    # 3 glyphs of 40x40 with gaps
+    tile1 = _new_tile([(20, 50, 60, 90), (70, 50, 110, 90), (120, 50, 160, 90)])
+    assert _spans(tile1) == [(16, 64), (66, 114), (116, 164)]
+    box = segment_glyphs(tile1)[0]
+    assert (box.top, box.bottom) == (46, 94)
+
+    # no ink
+    assert segment_glyphs(_new_tile([])) == []
+    assert segment_glyphs(numpy.zeros((0, 0), dtype=numpy.uint8)) == []
+
+
+def test_segment_glyphs_strokes() -> None:
+    # 2 strokes of a glyph like ハ, and a glyph with a dakuten above the right
+    tile1 = _new_tile(
+        [(20, 50, 34, 90), (44, 50, 60, 90), (80, 55, 116, 90), (118, 48, 124, 54)]
+    )
+    assert _spans(tile1) == [(16, 64), (76, 128)]
+
+
+def test_segment_glyphs_touching() -> None:
+    # 3 glyphs touching by thin joints
+    tile1 = _new_tile([(20, 50, 140, 90)])
+    tile1[52:88, 58:62] = 255
+    tile1[52:88, 98:102] = 255
+    assert _spans(tile1) == [(16, 62), (54, 102), (94, 144)]
+
+
+def test_segment_glyphs_noise_and_frame() -> None:
+    # noise dots and a frame taller than characters are not glyphs
+    tile1 = _new_tile([(0, 0, 4, 146), (200, 10, 203, 13), (60, 50, 100, 90)])
+    assert _spans(tile1) == [(56, 104)]
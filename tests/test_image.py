@@ -1,8 +1,9 @@
 from pathlib import Path
 
+import cv2
 import numpy
 
-from taikoi2t.implements.image import crop, new_image_meta
+from taikoi2t.implements.image import crop, decode_image, new_image_meta, read_image
 from taikoi2t.models.image import BoundingBox, Image
 
 
@@ -38,3 +39,49 @@ def test_new_image_meta(tmp_path: Path) -> None:
     assert res2.width is None
     assert res2.height is None
     assert res2.modal is None
+
+
+def test_read_image(tmp_path: Path) -> None:
+    image1: Image = numpy.zeros((100, 200, 3), dtype=numpy.uint8)
+    image1[10:20, 30:40] = (255, 128, 0)
+    path1 = tmp_path / "image1.png"
+    cv2.imwrite(path1.as_posix(), image1)
+
+    res1 = read_image(path1)
+    assert res1 is not None
+    assert numpy.array_equal(res1, image1)
+
+    res2 = read_image(path1, 2)
+    assert res2 is not None
+    assert res2.shape == (50, 100, 3)
+
+    path2 = tmp_path / "empty.png"
+    path2.touch()
+    assert read_image(path2) is None
+
+    path3 = tmp_path / "text.png"
+    path3.write_text("not an image", encoding="utf-8")
+    assert read_image(path3) is None
+
+    assert read_image(tmp_path / "not_found.png") is None
+
+
+def test_decode_image() -> None:
+    image1: Image = numpy.full((40, 80, 3), 200, dtype=numpy.uint8)
+    encoded1: Image = cv2.imencode(".png", image1)[1]
+
+    res1 = decode_image(encoded1)
+    assert res1 is not None
+    assert numpy.array_equal(res1, image1)
+
+    res2 = decode_image(encoded1, 4)
+    assert res2 is not None
+    assert res2.shape == (10, 20, 3)
+
+    assert decode_image(encoded1, 3) is None
+    assert decode_image(numpy.zeros(10, dtype=numpy.uint8)) is None
+
+
+def test_BoundingBox_scaled() -> None:
+    res1 = BoundingBox(1, 2, 30, 40).scaled(2)
+    assert res1 == BoundingBox(2, 4, 60, 80)
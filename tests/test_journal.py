@@ -0,0 +1,107 @@
+import logging
+from dataclasses import replace
+from pathlib import Path
+
+import numpy
+import pytest
+
+from taikoi2t.implements.journal import append_journal, new_journal_key, read_journal
+from taikoi2t.implements.source import new_array_source, new_synthetic_image_meta
+from taikoi2t.models.image import BoundingBox, ImageMeta
+from taikoi2t.models.journal import JournalKey
+from taikoi2t.models.match import MatchResult
+from taikoi2t.models.ocr import OCRText, SlotRecognition
+from taikoi2t.models.source import ImageSource
+from taikoi2t.models.student import Student
+from taikoi2t.models.team import Specials, Strikers, Team
+
+__S1 = Student(1, "シロコ（水着）", "水シロコ")
+__S2 = Student(2, "ホシノ", None)
+__S3 = Student(-1, "Error", None)
+__MATCH = MatchResult(
+    id="1234567890-image0png",
+    image=ImageMeta(
+        path="path/to/image0.png",
+        name="image0.png",
+        birth_time_ns=None,
+        modify_time_ns=2222,
+        width=1920,
+        height=1080,
+        modal=BoundingBox(10, 20, 300, 400),
+    ),
+    player=Team(True, None, Strikers(__S2, __S1, __S2, __S1), Specials(__S1, __S2)),
+    opponent=Team(
+        False, "対戦相手", Strikers(__S3, __S2, __S1, __S2), Specials(__S2, __S1)
+    ),
+)
+
+
+def test_new_journal_key() -> None:
+    meta = __MATCH.image
+    res1 = new_journal_key(ImageSource(meta, lambda _: None, size=3333))
+    assert res1 == JournalKey("path/to/image0.png", 3333, 2222)
+
+    res2 = new_journal_key(ImageSource(meta, lambda _: None))
+    assert res2 is None
+
+    image = numpy.zeros((2, 2, 3), dtype=numpy.uint8)
+    res3 = new_journal_key(
+        new_array_source(new_synthetic_image_meta("<stdin>/0", "stdin-0"), image)
+    )
+    assert res3 is None
+
+
+def test_read_journal(tmp_path: Path) -> None:
+    path1 = tmp_path / "journal.jsonl"
+    key1 = JournalKey("path/to/image0.png", 3333, 2222)
+    key2 = JournalKey("path/to/image1.png", 4444, 5555)
+    kept = replace(
+        __MATCH,
+        recognitions=[
+            SlotRecognition(
+                "STRIKER", False, [OCRText("ホシノ", 0.5, BoundingBox(1, 2, 3, 4))]
+            ),
+            SlotRecognition(None, True, []),
+            SlotRecognition(
+                None, False, [], [OCRText("ミ", 0.25, BoundingBox(5, 6, 7, 8))]
+            ),
+        ],
+        low_confidence=True,
+    )
+    with path1.open(mode="a", encoding="utf-8") as stream:
+        assert append_journal(stream, key1, __MATCH)
+        assert append_journal(stream, key2, kept)
+
+    res1 = read_journal(path1)
+    assert res1 == {key1: __MATCH, key2: kept}
+
+
+def test_read_journal_not_found(tmp_path: Path) -> None:
+    res1 = read_journal(tmp_path / "journal.jsonl")
+    assert res1 == {}
+
+
+def test_read_journal_truncated(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    path1 = tmp_path / "journal.jsonl"
+    key1 = JournalKey("path/to/image0.png", 3333, 2222)
+    with path1.open(mode="a", encoding="utf-8") as stream:
+        append_journal(stream, key1, __MATCH)
+        stream.write('{"path": "path/to/image1.png", "size": 44')  # killed
+
+    res1 = read_journal(path1)
+    assert res1 == {key1: __MATCH}
+
+    assert len(caplog.record_tuples) == 1
+    assert caplog.record_tuples[0][:2] == ("taikoi2t.journal", logging.WARNING)
+    assert "Broken entry at line 2" in caplog.record_tuples[0][2]
+
+
+def test_read_journal_directory(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    res1 = read_journal(tmp_path)
+    assert res1 is None
+
+    assert caplog.record_tuples[0][:2] == ("taikoi2t.journal", logging.CRITICAL)
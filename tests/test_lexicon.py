@@ -0,0 +1,75 @@
+import math
+from typing import Dict, List, Sequence
+
+import numpy
+
+from taikoi2t.implements.lexicon import best_path_log_probability, decode_with_lexicon
+from taikoi2t.models.lexicon import NameTrie
+
+CLASS_BY_CHAR: Dict[str, int] = {"ア": 1, "イ": 2, "ル": 3, "ホ": 4, "シ": 5, "ノ": 6}
+
+
+# frames of the given classes; the rest shares `noise`
+def _frames(
+    classes: Sequence[int], noise: float = 0.01
+) -> numpy.typing.NDArray[numpy.float32]:
+    frames: List[List[float]] = []
+    for cls in classes:
+        frame = [noise] * (len(CLASS_BY_CHAR) + 1)
+        frame[cls] = 1 - noise * len(CLASS_BY_CHAR)
+        frames.append(frame)
+    return numpy.array(frames, dtype=numpy.float32)
+
+
+def test_name_trie() -> None:
+    trie = NameTrie([("アル", 0), ("アイ", 1), ("アル", 2), ("", 3)])
+    assert len(trie) == 2
+    assert trie.children[0].keys() == {"ア"}
+    # the first value of the same words
+    assert sorted(trie.words.values()) == [("アイ", 1), ("アル", 0)]
+
+
+def test_decode_with_lexicon() -> None:
+    trie = NameTrie([("アル", 0), ("ホシノ", 1), ("アイ", 2)])
+
+    # repeated frames and blanks are collapsed
+    res1 = decode_with_lexicon(_frames([4, 4, 0, 5, 0, 6, 6]), trie, CLASS_BY_CHAR)
+    assert res1 is not None
+    assert res1[0:2] == ("ホシノ", 1)
+
+    # the misread character is decoded to the nearest name
+    misread = _frames([4, 0, 5, 0, 3])
+    res2 = decode_with_lexicon(misread, trie, CLASS_BY_CHAR)
+    assert res2 is not None
+    assert res2[0:2] == ("ホシノ", 1)
+    assert res2[2] < best_path_log_probability(misread)
+
+
+def test_decode_with_lexicon_repeated_chars() -> None:
+    trie = NameTrie([("アア", 0), ("ア", 1)])
+    # repeated characters need a blank between them
+    res1 = decode_with_lexicon(_frames([1, 1, 1]), trie, CLASS_BY_CHAR)
+    assert res1 is not None
+    assert res1[0:2] == ("ア", 1)
+
+    res2 = decode_with_lexicon(_frames([1, 0, 1]), trie, CLASS_BY_CHAR)
+    assert res2 is not None
+    assert res2[0:2] == ("アア", 0)
+
+
+def test_decode_with_lexicon_not_found() -> None:
+    trie = NameTrie([("ホシノ", 0)])
+    # no beams reach the end of the name without unlikely characters
+    assert (
+        decode_with_lexicon(_frames([4, 0, 5], noise=0.0), trie, CLASS_BY_CHAR) is None
+    )
+    # no frames
+    empty = numpy.zeros((0, len(CLASS_BY_CHAR) + 1), dtype=numpy.float32)
+    assert decode_with_lexicon(empty, trie, CLASS_BY_CHAR) is None
+
+
+def test_best_path_log_probability() -> None:
+    frames = _frames([1, 0], noise=0.1)
+    assert math.isclose(
+        best_path_log_probability(frames), 2 * math.log(0.4), rel_tol=1e-5
+    )
@@ -0,0 +1,35 @@
+import sys
+
+import pytest
+
+from taikoi2t.implements.memory import (
+    format_bytes,
+    get_available_memory,
+    get_peak_rss,
+    get_unique_memory,
+)
+
+
+def test_get_peak_rss() -> None:
+    res1 = get_peak_rss()
+    assert res1 is not None
+    assert res1 > 0
+
+
+def test_get_available_memory() -> None:
+    res1 = get_available_memory()
+    assert res1 is not None
+    assert res1 > 0
+
+
+def test_format_bytes() -> None:
+    assert format_bytes(None) == "unknown"
+    assert format_bytes(3 * 2**20) == "3.0 MiB"
+    assert format_bytes(1536 * 2**10) == "1.5 MiB"
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="Linux only")
+def test_get_unique_memory() -> None:
+    res1 = get_unique_memory()
+    assert res1 is not None
+    assert res1 > 0
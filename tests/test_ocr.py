@@ -1,13 +1,48 @@
-from typing import List
+from typing import Any, List, Sequence
 
-from taikoi2t.implements.ocr import join_chars
-from taikoi2t.models.ocr import Character
+import numpy
+
+from taikoi2t.implements.ocr import (
+    join_chars,
+    join_ocr_texts,
+    new_ocr_texts,
+    read_texts_batched,
+)
+from taikoi2t.models.image import BoundingBox, Image
+from taikoi2t.models.ocr import Character, OCRText
+
+
+# returns the first pixel value as the text
+class _FakeReader:
+    def __init__(self) -> None:
+        self.batches: List[int] = []
+
+    def readtext_batched(
+        self, images: Sequence[Image], **kwargs: Any
+    ) -> List[List[Character]]:
+        assert len(set(image.shape for image in images)) == 1
+        self.batches.append(len(images))
+        return [[([(0, 0), (1, 0), (1, 1), (0, 1)], str(i[0, 0]), 0.9)] for i in images]
 
 
 def test_read_text_from_roi() -> None:
     pass  # TODO
 
 
+def test_read_texts_batched() -> None:
+    reader = _FakeReader()
+    images: List[Image] = [
+        numpy.full((10, 20), 1, dtype=numpy.uint8),
+        numpy.full((10, 30), 2, dtype=numpy.uint8),
+        numpy.full((10, 20), 3, dtype=numpy.uint8),
+        numpy.zeros((0, 20), dtype=numpy.uint8),
+    ]
+
+    res1 = read_texts_batched(reader, images, mag_ratio=2)
+    assert [join_chars(chars) for chars in res1] == ["1", "2", "3", ""]
+    assert reader.batches == [2, 1]  # grouped by the shape
+
+
 def test_join_chars() -> None:
     chars1: List[Character] = [
         ([(23, 10), (149, 10), (149, 55), (23, 55)], "シロコ", 0.9999086002751579),
@@ -23,3 +58,17 @@ def test_join_chars() -> None:
 
     char3: List[Character] = []
     assert join_chars(char3) == ""
+
+
+def test_new_ocr_texts() -> None:
+    chars: List[Character] = [
+        ([(3, 2), (9, 1), (10, 7), (2, 8)], "ホシ", 0.75),
+        ([(12, 1), (20, 1), (20, 8), (12, 8)], " ノ", numpy.float64(0.5)),  # type: ignore
+    ]
+    res1 = new_ocr_texts(chars)
+    assert res1 == [
+        OCRText("ホシ", 0.75, BoundingBox(2, 1, 10, 8)),
+        OCRText(" ノ", 0.5, BoundingBox(12, 1, 20, 8)),
+    ]
+    assert type(res1[1].confidence) is float
+    assert join_ocr_texts(res1) == join_chars(chars) == "ホシノ"
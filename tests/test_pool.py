@@ -0,0 +1,42 @@
+import os
+import sys
+from typing import List
+
+import pytest
+import torch
+
+from taikoi2t.implements.pool import ForkWorkerPool, new_thread_pool
+from taikoi2t.implements.runtime import is_fork_available
+
+
+@pytest.mark.skipif(not is_fork_available(), reason="fork is not available")
+def test_ForkWorkerPool() -> None:
+    # inherited by the workers without pickling
+    table: List[int] = [10, 20, 30]
+    pool = ForkWorkerPool(2, lambda index: (table[index], os.getpid()))
+    try:
+        futures = [pool.submit(i) for i in range(3)]
+        results = [future.result(timeout=30) for future in futures]
+    finally:
+        pool.shutdown()
+
+    assert [value for value, _ in results] == [10, 20, 30]
+    assert all(pid != os.getpid() for _, pid in results)
+    assert len(pool.unique_memory) >= 1
+    if sys.platform == "linux":
+        assert all(m is not None and m > 0 for m in pool.unique_memory.values())
+
+
+def test_new_thread_pool() -> None:
+    def grad_enabled() -> bool:
+        return torch.is_grad_enabled()
+
+    with torch.enable_grad():
+        executor = new_thread_pool(2)
+        try:
+            assert all(
+                executor.submit(grad_enabled).result() is False for _ in range(4)
+            )
+        finally:
+            executor.shutdown()
+        assert torch.is_grad_enabled() is True  # only in the threads
@@ -0,0 +1,136 @@
+from pathlib import Path
+from typing import Callable, Tuple
+
+import cv2
+import easyocr  # type: ignore
+import numpy
+import pytest
+import torch
+from easyocr.craft import CRAFT  # type: ignore
+from easyocr.model.vgg_model import Model  # type: ignore
+from easyocr.utils import CTCLabelConverter  # type: ignore
+
+from taikoi2t.implements.reader import (
+    READER_LANGUAGES,
+    RECOGNIZER_NETWORK_PARAMS,
+    get_model_cache_path,
+    new_reader,
+)
+from taikoi2t.models.reader import ReaderOptions
+
+
+def test_get_model_cache_path(tmp_path: Path) -> None:
+    options = ReaderOptions(model_cache=tmp_path)
+    int8_path = get_model_cache_path(options, "int8")
+    assert int8_path.parent == tmp_path
+    assert "int8" in int8_path.name
+    assert int8_path != get_model_cache_path(options, "fp32")
+
+
+def test_new_reader_cached(tmp_path: Path) -> None:
+    options = ReaderOptions(model_cache=tmp_path)
+    detector, recognizer, converter = __save_random_weights(options)
+    # easyocr quantizes the networks after loading them on CPU
+    for network in (detector, recognizer):
+        torch.quantization.quantize_dynamic(network, dtype=torch.qint8, inplace=True)
+
+    # built from the weights without loading .pth files
+    reader = new_reader(options)
+    assert reader.device == "cpu"
+    assert reader.converter.character == converter.character
+    image = torch.rand(1, 1, 64, 160)
+    text = torch.zeros(1, 17, dtype=torch.long)
+    with torch.no_grad():
+        assert torch.equal(reader.recognizer(image, text), recognizer(image, text))
+        tile = torch.rand(1, 3, 64, 64)
+        assert torch.equal(reader.detector(tile)[0], detector(tile)[0])
+
+
+def test_new_reader_cached_int8(tmp_path: Path) -> None:
+    options = ReaderOptions(model_cache=tmp_path)
+    __save_random_weights(options)
+
+    # quantized after loading as easyocr does on CPU
+    reader = new_reader(options)
+    assert reader.device == "cpu"
+    assert any(
+        isinstance(module, torch.ao.nn.quantized.dynamic.LSTM)
+        for module in reader.recognizer.modules()
+    )
+
+
+def test_new_reader_cached_pickle(tmp_path: Path) -> None:
+    options = ReaderOptions(model_cache=tmp_path)
+    torch.save({"detector": _Payload()}, get_model_cache_path(options, "weights"))
+
+    # objects other than tensors are never unpickled from the cache
+    try:
+        new_reader(options)
+    except Exception:
+        pass  # no trained weights to build the networks from
+    assert not _Payload.loaded
+
+
+class _Payload:
+    loaded: bool = False
+
+    def __reduce__(self) -> Tuple[Callable[[], None], Tuple[()]]:
+        return (_Payload.load, ())
+
+    @staticmethod
+    def load() -> None:
+        _Payload.loaded = True
+
+
+def test_new_reader_traced(tmp_path: Path) -> None:
+    options = ReaderOptions(model_cache=tmp_path, engine="traced")
+    __save_random_weights(options)
+
+    reader = new_reader(options, [(48, 160)])
+    assert isinstance(reader.recognizer, torch.jit.ScriptModule)
+    assert len(list(tmp_path.glob("*-recognizer-traced-*"))) == 1
+    expected = reader.recognize(numpy.zeros((48, 160), dtype=numpy.uint8))
+
+    # the traced artifact is reused
+    reader2 = new_reader(options, [(48, 160)])
+    assert isinstance(reader2.recognizer, torch.jit.ScriptModule)
+    assert reader2.recognize(numpy.zeros((48, 160), dtype=numpy.uint8)) == expected
+
+
+def test_new_reader_traced_same_as_eager(tmp_path: Path) -> None:
+    __save_random_weights(ReaderOptions(model_cache=tmp_path))
+    eager = new_reader(ReaderOptions(model_cache=tmp_path))
+    traced = new_reader(
+        ReaderOptions(model_cache=tmp_path, engine="traced"), [(48, 160)]
+    )
+    assert isinstance(traced.recognizer, torch.jit.ScriptModule)
+
+    tile = numpy.full((48, 160), 255, dtype=numpy.uint8)
+    cv2.putText(tile, "OCR", (20, 32), cv2.FONT_HERSHEY_SIMPLEX, 0.8, 0, 2)
+    expected = eager.recognize(tile)
+    actual = traced.recognize(tile)
+    assert [(box, text) for box, text, _ in actual] == [
+        (box, text) for box, text, _ in expected
+    ]
+    assert [float(c) for _, _, c in actual] == pytest.approx(
+        [float(c) for _, _, c in expected]
+    )
+
+
+# networks of easyocr without trained weights
+def __save_random_weights(
+    options: ReaderOptions,
+) -> Tuple[torch.nn.Module, torch.nn.Module, CTCLabelConverter]:
+    reader = easyocr.Reader(
+        READER_LANGUAGES, gpu=False, detector=False, recognizer=False, verbose=False
+    )
+    converter = CTCLabelConverter(reader.character, {}, {})
+    detector = CRAFT().eval()
+    recognizer = Model(
+        num_class=len(converter.character), **RECOGNIZER_NETWORK_PARAMS
+    ).eval()
+    torch.save(
+        {"detector": detector.state_dict(), "recognizer": recognizer.state_dict()},
+        get_model_cache_path(options, "weights"),
+    )
+    return detector, recognizer, converter
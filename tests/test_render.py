@@ -0,0 +1,126 @@
+import io
+import logging
+from dataclasses import replace
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from taikoi2t.app import run
+from taikoi2t.implements.journal import append_journal
+from taikoi2t.implements.json import to_json_str
+from taikoi2t.implements.render import read_stored_matches
+from taikoi2t.models.image import BoundingBox, ImageMeta
+from taikoi2t.models.journal import JournalKey
+from taikoi2t.models.match import MatchResult
+from taikoi2t.models.ocr import OCRText, SlotRecognition
+from taikoi2t.models.run import RunResult
+from taikoi2t.models.student import Student
+from taikoi2t.models.team import Specials, Strikers, Team
+
+__S1 = Student(1, "シロコ（水着）", "水シロコ")
+__S2 = Student(2, "ホシノ", None)
+
+
+def __new_match(name: str) -> MatchResult:
+    return MatchResult(
+        id=f"1234567890-{name}",
+        image=ImageMeta(
+            path=f"path/to/{name}",
+            name=name,
+            birth_time_ns=None,
+            modify_time_ns=2222,
+            width=1920,
+            height=1080,
+            modal=BoundingBox(10, 20, 300, 400),
+        ),
+        player=Team(True, None, Strikers(__S2, __S1, __S2, __S1), Specials(__S1, __S2)),
+        opponent=Team(
+            False, "対戦相手", Strikers(__S1, __S2, __S1, __S2), Specials(__S2, __S1)
+        ),
+    )
+
+
+def __write_stored(path: Path) -> None:
+    run_result = RunResult(
+        ["app"], "", "", [__new_match("0.png"), __new_match("1.png")]
+    )
+    with path.open(mode="w", encoding="utf-8") as stream:
+        stream.write(f"{to_json_str(run_result)}\n")
+        append_journal(stream, JournalKey("path/to/2.png", 1, 2), __new_match("2.png"))
+        stream.write("\n")
+        stream.write(f"{to_json_str(__new_match('3.png'))}\n")
+
+
+def test_read_stored_matches(tmp_path: Path) -> None:
+    path = tmp_path / "results.jsonl"
+    __write_stored(path)
+    with path.open(mode="r", encoding="utf-8") as stream:
+        res = list(read_stored_matches(stream, path.as_posix()))
+    assert res == [__new_match(f"{i}.png") for i in range(4)]
+
+
+def test_read_stored_matches_broken(caplog: pytest.LogCaptureFixture) -> None:
+    stream = io.StringIO(
+        f'[1, 2]\n{{"matches": [{{"id": "x"}}, {to_json_str(__new_match("0.png"))}]}}\n{{"id": '
+    )
+    with caplog.at_level(logging.WARNING):
+        res = list(read_stored_matches(stream, "results.jsonl"))
+    assert res == [__new_match("0.png")]
+    assert [r.message.split(";")[0] for r in caplog.records] == [
+        "Broken line 1 of results.jsonl",
+        "Broken result at line 2 of results.jsonl",
+        "Broken line 3 of results.jsonl",
+    ]
+
+
+def test_run_render(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    path = tmp_path / "results.jsonl"
+    __write_stored(path)
+
+    run(["app", "render", "--csv", "-c", "INAME", "PWIN", "L1", "R1", "--", str(path)])
+    captured = capsys.readouterr()
+    assert captured.out == "".join(f"{i}.png,TRUE,ホシノ,水シロコ\n" for i in range(4))
+
+    run(["app", "render", "--no-alias", "-c", "L2", "ONAME", "--", str(path)])
+    captured = capsys.readouterr()
+    assert captured.out == "シロコ（水着）\t対戦相手\n" * 4
+
+    with pytest.raises(SystemExit) as e:
+        run(["app", "render", "--", str(tmp_path / "not-found.jsonl")])
+    assert e.value.code == 1
+
+
+def test_run_rematch(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    def texts(word: str) -> List[OCRText]:
+        return [OCRText(word, 0.9, BoundingBox(0, 0, 10, 10))]
+
+    # read as ミカ at slot 2 and the special at slot 5, but unknown when extracted
+    recognitions = [SlotRecognition(None, False, texts("ホシノ")) for _ in range(12)]
+    recognitions[1] = SlotRecognition(None, False, texts("ミ"), texts("ミカ"))
+    recognitions[4] = SlotRecognition(None, False, texts("ミカ"))
+    stored = replace(__new_match("0.png"), recognitions=recognitions)
+    path = tmp_path / "results.jsonl"
+    path.write_text(
+        f"{to_json_str(stored)}\n{to_json_str(__new_match('1.png'))}\n",
+        encoding="utf-8",
+    )
+    dictionary = tmp_path / "students.csv"
+    dictionary.write_text("ホシノ,\nミカ,聖園ミカ\n", encoding="utf-8")
+
+    columns = ["INAME", "PWIN", "L1", "L2", "L5", "L6", "ONAME", "R1"]
+    run(["app", "rematch", "-d", str(dictionary), "-c", *columns, "--", str(path)])
+    captured = capsys.readouterr()
+    assert captured.out == (
+        # specials are sorted by the dictionary
+        "0.png\tTRUE\tホシノ\t聖園ミカ\tホシノ\t聖園ミカ\t対戦相手\tホシノ\n"
+        # without the kept output
+        "1.png\tTRUE\tホシノ\t水シロコ\t水シロコ\tホシノ\t対戦相手\t水シロコ\n"
+    )
+
+    # matched again repeatedly
+    run(["app", "rematch", "-d", str(dictionary), "--json", "--", str(path)])
+    rematched = capsys.readouterr().out.splitlines()[0]
+    (tmp_path / "rematched.jsonl").write_text(rematched + "\n", encoding="utf-8")
+    run(["app", "render", "-c", "L2", "--", str(tmp_path / "rematched.jsonl")])
+    assert capsys.readouterr().out == "聖園ミカ\n"
@@ -0,0 +1,148 @@
+import uuid
+from typing import List
+
+import numpy
+import pytest
+
+from taikoi2t.application.match import read_modal_image
+from taikoi2t.implements.ring import (
+    _SLOT,
+    SLOT_FILLED,
+    FrameRingReader,
+    FrameRingWriter,
+    _slot_offset,
+)
+from taikoi2t.models.args import VERBOSE_SILENT
+from taikoi2t.models.image import Image
+from taikoi2t.models.settings import Settings
+from taikoi2t.models.source import ImageSource
+
+
+def test_FrameRing() -> None:
+    writer = FrameRingWriter(__new_name(), slot_count=2, max_width=8, max_height=4)
+    try:
+        frame1: Image = numpy.full((4, 8, 3), 1, dtype=numpy.uint8)
+        frame2: Image = numpy.full((2, 3, 3), 2, dtype=numpy.uint8)
+        assert writer.put(frame1) is True
+        assert writer.put(frame2) is True
+        assert writer.put(frame1, timeout=0.01) is False  # full
+        writer.close()
+
+        reader = FrameRingReader(writer.name)
+        sources: List[ImageSource] = []
+        for source in reader.sources():
+            loaded = source.load(1)
+            assert loaded is not None
+            sources.append(source)
+            if len(sources) == 1:
+                assert numpy.array_equal(loaded, frame1)
+                assert source.load(2) is None
+            else:
+                assert numpy.array_equal(loaded, frame2)
+            del loaded
+            assert source.release is not None
+            source.release()
+            assert source.load(1) is None
+
+        assert [s.meta.name for s in sources] == [
+            f"{writer.name}-0",
+            f"{writer.name}-1",
+        ]
+        assert writer.drain(timeout=0.01) is True
+        assert writer.put(frame2, timeout=0.01) is True  # released
+        reader.close()
+    finally:
+        writer.unlink()
+
+
+def test_FrameRingReader_filled_while_closing() -> None:
+    writer = FrameRingWriter(__new_name(), slot_count=2, max_width=4, max_height=4)
+    try:
+        frame: Image = numpy.full((4, 4, 3), 1, dtype=numpy.uint8)
+        reader = FrameRingReader(writer.name)
+
+        is_closed = reader.is_closed
+
+        # the writer fills a slot and closes the ring after the reader saw it empty
+        def fill_and_close() -> bool:
+            if not is_closed():
+                writer.put(frame)
+                writer.close()
+            return True
+
+        reader.is_closed = fill_and_close  # type: ignore
+        sources = list(reader.sources())
+        assert [s.meta.name for s in sources] == [f"{writer.name}-0"]
+        for source in sources:
+            assert source.release is not None
+            source.release()
+        reader.close()
+    finally:
+        writer.unlink()
+
+
+def test_FrameRingWriter_invalid_frame() -> None:
+    writer = FrameRingWriter(__new_name(), slot_count=1, max_width=4, max_height=4)
+    try:
+        with pytest.raises(ValueError):
+            writer.put(numpy.zeros((8, 8, 3), dtype=numpy.uint8))
+        with pytest.raises(ValueError):
+            writer.put(numpy.zeros((4, 4), dtype=numpy.uint8))
+    finally:
+        writer.unlink()
+
+
+def test_FrameRingReader_oversized_slot(caplog: pytest.LogCaptureFixture) -> None:
+    writer = FrameRingWriter(__new_name(), slot_count=2, max_width=4, max_height=4)
+    try:
+        frame: Image = numpy.full((4, 4, 3), 1, dtype=numpy.uint8)
+        writer.put(frame)
+        writer.put(frame)
+        writer.close()
+        # a broken producer claims a larger frame than the slot
+        _SLOT.pack_into(writer.shm.buf, _slot_offset(0), SLOT_FILLED, 8, 8, 0)
+
+        reader = FrameRingReader(writer.name)
+        sources = list(reader.sources())
+        assert [s.meta.name for s in sources] == [f"{writer.name}-1"]
+        assert "Skipped frame 0" in caplog.text
+        for source in sources:
+            assert source.release is not None
+            source.release()
+        assert writer.drain(timeout=0.01) is True  # the skipped slot is freed
+        reader.close()
+    finally:
+        writer.unlink()
+
+
+def test_FrameRingReader_not_found() -> None:
+    with pytest.raises(FileNotFoundError):
+        FrameRingReader(__new_name())
+
+
+def test_read_modal_image_releases_slot() -> None:
+    frame: Image = numpy.zeros((1080, 1920, 3), dtype=numpy.uint8)
+    frame[169:911, 96:1824] = 200  # result-box
+
+    writer = FrameRingWriter(
+        __new_name(), slot_count=1, max_width=1920, max_height=1080
+    )
+    try:
+        writer.put(frame)
+        writer.close()
+        reader = FrameRingReader(writer.name)
+        settings = Settings([], "tsv", True, True, VERBOSE_SILENT)
+        for source in reader.sources():
+            modal_image = read_modal_image(source, settings)
+            assert modal_image is not None
+            assert modal_image.modal.width == 1728
+            assert modal_image.grayscale.base is None  # not a view of the slot
+            assert source.load(1) is None
+        assert writer.drain(timeout=0.01) is True
+        reader.close()
+    finally:
+        writer.unlink()
+
+
+def __new_name() -> str:
+    return f"taikoi2t-test-{uuid.uuid4().hex[:8]}"
@@ -0,0 +1,72 @@
+import threading
+from typing import List
+
+from taikoi2t.implements.schedule import PriorityScheduler
+from taikoi2t.models.schedule import Scheduled
+
+
+def test_priority_scheduler_backfill() -> None:
+    scheduler = PriorityScheduler(["a", "b", "c"])
+    scheduler.close()
+
+    res1 = list(scheduler)
+    assert [s.item for s in res1] == ["a", "b", "c"]
+    assert [s.label for s in res1] == ["B000000", "B000001", "B000002"]
+
+
+def test_priority_scheduler_live_first() -> None:
+    scheduler = PriorityScheduler(["a", "b", "c"])
+    res1: List[Scheduled[str]] = []
+    for scheduled in scheduler:
+        res1.append(scheduled)
+        if scheduled.item == "a":
+            scheduler.push_live("x")
+            scheduler.push_live("y")
+        elif scheduled.item == "c":
+            scheduler.close()
+
+    # the newest live item first, and then the backfill in order
+    assert [s.item for s in res1] == ["a", "y", "x", "b", "c"]
+    assert [s.label for s in res1] == [
+        "B000000",
+        "L000001",
+        "L000000",
+        "B000001",
+        "B000002",
+    ]
+    # labels restore the arrival order
+    assert [s.item for s in sorted(res1, key=lambda s: s.label)] == [
+        "a",
+        "b",
+        "c",
+        "x",
+        "y",
+    ]
+
+
+def test_priority_scheduler_waits_live() -> None:
+    scheduler = PriorityScheduler[str]([])
+
+    def push() -> None:
+        scheduler.push_live("x")
+        scheduler.close()
+
+    threading.Timer(0.05, push).start()
+    res1 = list(scheduler)
+    assert [s.item for s in res1] == ["x"]
+
+
+def test_priority_scheduler_on_idle() -> None:
+    scheduler = PriorityScheduler(["a"])
+    idles: List[int] = []
+
+    def on_idle() -> None:
+        idles.append(len(idles))
+        if len(idles) == 1:
+            scheduler.push_live("x")
+        else:
+            scheduler.close()
+
+    res1 = list(scheduler.iterate(on_idle=on_idle))
+    assert [s.item for s in res1] == ["a", "x"]
+    assert idles == [0, 1]
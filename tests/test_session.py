@@ -0,0 +1,113 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Tuple
+
+import easyocr  # type: ignore
+import numpy
+import pytest
+import torch
+from easyocr.utils import CTCLabelConverter  # type: ignore
+
+from taikoi2t.application.student import StudentDictionaryImpl
+from taikoi2t.implements.session import OCRSession, new_ocr_session
+
+
+# 4 columns of the input make a frame
+class _FakeRecognizer(torch.nn.Module):
+    def __init__(self, classes: int) -> None:
+        super().__init__()
+        generator = torch.Generator().manual_seed(0)
+        self.weight = torch.randn(4, classes, generator=generator) * 8
+        self.norm = torch.nn.BatchNorm2d(1)
+
+    def forward(self, image: torch.Tensor, text: torch.Tensor) -> torch.Tensor:
+        columns = self.norm(image).mean(dim=2)[:, 0, :]
+        return columns.reshape(columns.shape[0], -1, 4) @ self.weight
+
+
+# runs the methods of easyocr with the fake models
+class _FakeReader(easyocr.Reader):
+    def __init__(self) -> None:
+        self.character = "アイウエオカキ"
+        self.lang_char = "アイウエオ"
+        self.model_lang = "japanese"
+        self.device = "cpu"
+        self.converter = CTCLabelConverter(self.character, {}, {})
+        self.recognizer = _FakeRecognizer(len(self.character) + 1)
+
+    def detect(self, img: Any, **kwargs: Any) -> Tuple[List[Any], List[Any]]:
+        count = img.shape[0] if img.ndim == 4 else 1
+        return [[[2, 50, 3, 30], [40, 90, 0, 32]]] * count, [[]] * count
+
+
+IMAGES = [
+    numpy.random.default_rng(0).integers(0, 256, (32, 96), dtype=numpy.uint8)
+    for _ in range(3)
+]
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+@pytest.mark.parametrize("allowlist", [None, "アイカ", "ウ"])
+def test_OCRSession_same_as_easyocr(allowlist: str | None) -> None:
+    reader = _FakeReader()
+    session = OCRSession(reader)
+
+    assert session.recognize(IMAGES[0], allowlist=allowlist) == reader.recognize(
+        IMAGES[0], allowlist=allowlist
+    )
+    assert session.readtext(IMAGES[0], allowlist=allowlist) == reader.readtext(
+        IMAGES[0], allowlist=allowlist
+    )
+    assert session.readtext_batched(
+        IMAGES, allowlist=allowlist
+    ) == reader.readtext_batched(IMAGES, allowlist=allowlist)
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_OCRSession_same_as_easyocr_from_training_mode() -> None:
+    reader = _FakeReader()
+    norm = reader.recognizer.norm
+    norm.running_mean.fill_(0.3)
+    norm.running_var.fill_(0.5)
+    reader.recognizer.train()  # as easyocr builds it
+    session = OCRSession(reader)
+
+    # read before easyocr switches the recognizer to the evaluation mode
+    read1 = session.readtext_batched(IMAGES)
+    assert torch.equal(norm.running_mean, torch.full((1,), 0.3))
+    assert read1 == reader.readtext_batched(IMAGES)
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_OCRSession_threads() -> None:
+    reader = _FakeReader()
+    images = [IMAGES[i % 3][:, : 64 + i] for i in range(24)]
+    expected = [reader.readtext(image, allowlist="アイ") for image in images]
+
+    # the caches are filled by the threads at once
+    session = OCRSession(reader)
+    with ThreadPoolExecutor(8) as executor:
+        assert (
+            list(executor.map(lambda i: session.readtext(i, allowlist="アイ"), images))
+            == expected
+        )
+
+
+def test_OCRSession_read_text_probabilities() -> None:
+    session = OCRSession(_FakeReader())
+    probabilities = session.read_text_probabilities(IMAGES[0], "アイ")
+    assert probabilities is not None
+    # the 2 boxes are concatenated; the width of the inputs is 64 * 2
+    assert probabilities.shape == (2 * 32, 8)
+    assert numpy.allclose(probabilities.sum(axis=1), 1.0)
+    assert numpy.all(probabilities[:, [3, 4, 5, 6, 7]] == 0)
+
+
+def test_new_ocr_session() -> None:
+    dictionary = StudentDictionaryImpl(
+        [("アイ", "", "STRIKER"), ("カキ", "", "SPECIAL"), ("ウ", "")]
+    )
+    session = new_ocr_session(_FakeReader(), dictionary)
+    # prepared for all roles
+    assert len(session.masks) == 3
+    mask = session.ignore_mask(dictionary.get_allow_char_list("STRIKER"))
+    assert numpy.flatnonzero(~mask).tolist() == [0, 1, 2, 3]
@@ -124,3 +124,11 @@ def __new_args(
         logfile=None,
         files=[],
     )
+
+
+def test_new_settings_from_reduced_decode() -> None:
+    args1 = __new_args()
+    args1.reduced_decode = True
+    assert new_settings_from(args1).reduced_decode is True
+
+    assert new_settings_from(__new_args()).reduced_decode is False
@@ -0,0 +1,47 @@
+import cv2
+import numpy
+
+from taikoi2t.application.slot import get_slot_roles, is_blank_slot
+from taikoi2t.models.image import Image
+
+
+def test_is_blank_slot() -> None:
+    blank1: Image = numpy.full((146, 245), 255, dtype=numpy.uint8)
+    assert is_blank_slot(blank1) is True
+
+    noise1 = blank1.copy()
+    noise1[10:13, 20:23] = 0
+    noise1[100:102, 200:204] = 0
+    assert is_blank_slot(noise1) is True
+
+    # a frame line is taller than characters
+    frame1 = blank1.copy()
+    frame1[:, 0:4] = 0
+    frame1[:, 240:245] = 0
+    assert is_blank_slot(frame1) is True
+
+    name1 = blank1.copy()
+    cv2.putText(name1, "Hoshino", (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 1.5, 0, 4)
+    assert is_blank_slot(name1) is False
+
+    name2 = frame1.copy()
+    cv2.putText(name2, "Aru", (60, 90), cv2.FONT_HERSHEY_SIMPLEX, 1.5, 0, 4)
+    assert is_blank_slot(name2) is False
+
+    empty1: Image = numpy.zeros((0, 245), dtype=numpy.uint8)
+    assert is_blank_slot(empty1) is True
+
+
+def test_get_slot_roles() -> None:
+    full = [False] * 6
+    short = [False, False, False, False, False, True]
+
+    res1 = get_slot_roles(full + full)
+    assert res1 == ["STRIKER"] * 4 + ["SPECIAL"] * 2 + ["STRIKER"] * 4 + ["SPECIAL"] * 2
+
+    # no roles for the team with blank slots
+    res2 = get_slot_roles(full + short)
+    assert res2 == ["STRIKER"] * 4 + ["SPECIAL"] * 2 + [None] * 6
+
+    res3 = get_slot_roles([False] * 4)
+    assert res3 == [None] * 4
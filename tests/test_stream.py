@@ -0,0 +1,100 @@
+import io
+import logging
+import struct
+
+import cv2
+import numpy
+import pytest
+
+from taikoi2t.implements.stream import read_stream_sources
+from taikoi2t.models.image import Image
+
+
+def test_read_stream_sources_encoded() -> None:
+    image1: Image = numpy.full((20, 30, 3), 10, dtype=numpy.uint8)
+    image2: Image = numpy.full((40, 60, 3), 20, dtype=numpy.uint8)
+    stream = io.BytesIO()
+    for image in [image1, image2]:
+        encoded = cv2.imencode(".png", image)[1].tobytes()
+        stream.write(struct.pack(">I", len(encoded)) + encoded)
+    stream.seek(0)
+
+    res1 = list(read_stream_sources(stream, "encoded"))
+    assert [s.meta.name for s in res1] == ["stdin-0", "stdin-1"]
+    assert [s.meta.path for s in res1] == ["<stdin>/0", "<stdin>/1"]
+    assert res1[0].meta.modify_time_ns is None
+
+    loaded1 = res1[0].load(1)
+    assert loaded1 is not None
+    assert numpy.array_equal(loaded1, image1)
+
+    loaded2 = res1[1].load(2)
+    assert loaded2 is not None
+    assert loaded2.shape == (20, 30, 3)
+
+
+def test_read_stream_sources_raw() -> None:
+    image1: Image = numpy.arange(4 * 5 * 3, dtype=numpy.uint8).reshape((4, 5, 3))
+    stream = io.BytesIO(struct.pack(">II", 5, 4) + image1.tobytes())
+
+    res1 = list(read_stream_sources(stream, "raw", label="pipe"))
+    assert len(res1) == 1
+    assert res1[0].meta.name == "pipe-0"
+
+    loaded1 = res1[0].load(1)
+    assert loaded1 is not None
+    assert numpy.array_equal(loaded1, image1)
+    assert res1[0].load(2) is None  # raw frames cannot be decoded at reduced scale
+
+
+def test_read_stream_sources_truncated(caplog: pytest.LogCaptureFixture) -> None:
+    stream = io.BytesIO(struct.pack(">II", 5, 4) + bytes(10))
+
+    res1 = list(read_stream_sources(stream, "raw"))
+    assert res1 == []
+    assert caplog.record_tuples == [
+        (
+            "taikoi2t.stream",
+            logging.ERROR,
+            "<stdin>/0 is truncated; 10 of 60 bytes",
+        )
+    ]
+
+
+def test_read_stream_sources_too_large(caplog: pytest.LogCaptureFixture) -> None:
+    image1: Image = numpy.zeros((4, 5, 3), dtype=numpy.uint8)
+    stream = io.BytesIO(
+        struct.pack(">II", 100000, 4)
+        + bytes(10)
+        + struct.pack(">II", 5, 4)
+        + image1.tobytes()
+    )
+
+    res1 = list(read_stream_sources(stream, "raw"))
+    assert res1 == []
+    assert caplog.record_tuples == [
+        (
+            "taikoi2t.stream",
+            logging.ERROR,
+            "<stdin>/0 is too large; 100000x4 > 7680x4320",
+        )
+    ]
+
+
+def test_read_stream_sources_too_long(caplog: pytest.LogCaptureFixture) -> None:
+    stream = io.BytesIO(struct.pack(">I", 0xFFFFFFFF) + bytes(10))
+
+    res1 = list(read_stream_sources(stream, "encoded"))
+    assert res1 == []
+    assert caplog.record_tuples == [
+        (
+            "taikoi2t.stream",
+            logging.ERROR,
+            "<stdin>/0 is too large; 4294967295 > 99532800 bytes",
+        )
+    ]
+
+
+def test_read_stream_sources_empty(caplog: pytest.LogCaptureFixture) -> None:
+    assert list(read_stream_sources(io.BytesIO(), "encoded")) == []
+    assert caplog.record_tuples == []
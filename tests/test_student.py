@@ -1,13 +1,37 @@
+import csv
 import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, List, Sequence, Tuple
 
+import cv2
+import numpy
 import pytest
+from rapidfuzz import process
+from rapidfuzz.distance import Levenshtein
 
-from taikoi2t.application.student import STUDENTS_LEFT_XS, StudentDictionaryImpl
+from taikoi2t.application.student import (
+    STUDENTS_LEFT_XS,
+    CascadeResult,
+    StudentDictionaryImpl,
+    match_student,
+    read_students,
+    recognize_student_by_character,
+    rematch_students,
+    retry_student,
+)
+from taikoi2t.implements.fuzzy import weighted_similarity
 from taikoi2t.implements.student import (
+    diacritic_substitution_cost,
+    new_error_student,
     normalize_student_name,
     remove_diacritics,
 )
-from taikoi2t.models.student import Student
+from taikoi2t.models.image import BoundingBox, Image
+from taikoi2t.models.ocr import Character, OCRText, SlotRecognition
+from taikoi2t.models.student import Role, Student
 
 
 def test_StudentDictionary_validate_valid(caplog: pytest.LogCaptureFixture) -> None:
@@ -56,6 +80,22 @@ def test_StudentDictionary_get_allow_char_list() -> None:
     )
 
 
+def test_StudentDictionary_get_lexicon() -> None:
+    dic = StudentDictionaryImpl(
+        [("シロコ（水着）", "水シロコ"), ("ホシノ", ""), ("ヒビキ", "")]
+    )
+    lexicon = dic.get_lexicon()
+    # in half-width parentheses, and without diacritics
+    assert sorted(lexicon.words.values()) == [
+        ("シロコ(水着)", 0),
+        ("ヒヒキ", 2),
+        ("ヒビキ", 2),
+        ("ホシノ", 1),
+    ]
+    assert dic.get_student(0) == Student(0, "シロコ（水着）", "水シロコ")
+    assert dic.get_student(3).is_error
+
+
 def test_StudentDictionary_match() -> None:
     dic = StudentDictionaryImpl(
         [
@@ -88,6 +128,254 @@ def test_StudentDictionary_match() -> None:
     assert dic.match("ナキサ") == Student(10, "ナギサ", None)
 
 
+def test_StudentDictionary_match_diacritics() -> None:
+    dic = StudentDictionaryImpl([("カヨコ", ""), ("ガヨコ", ""), ("ハルカ", "")])
+    assert dic.match("カヨコ") == Student(0, "カヨコ", None)
+    assert dic.match("ガヨコ") == Student(1, "ガヨコ", None)
+    assert dic.match("ハルガ") == Student(2, "ハルカ", None)
+    assert dic.match("バルガ") == Student(2, "ハルカ", None)
+
+
+def test_StudentDictionary_match_same_as_full_scan() -> None:
+    path = Path(__file__).parent.parent / "students.csv"
+    with path.open(encoding="utf-8") as file:
+        dic = StudentDictionaryImpl(
+            (row[0], row[1]) for row in csv.reader(file) if len(row) > 0
+        )
+    names = dic.ordered_names
+    alphabet = "".join(set("".join(names)))
+    rand = random.Random(0)
+    for name in names[::4]:
+        for query in [
+            name,
+            name[: len(name) * 2 // 3],
+            remove_diacritics(name),
+            "".join(c if rand.random() < 0.8 else rand.choice(alphabet) for c in name),
+        ]:
+            assert dic.match(query).index == __match_by_full_scan(names, query), query
+
+
+def test_StudentDictionary_match_sublinear() -> None:
+    path = Path(__file__).parent.parent / "students.csv"
+    with path.open(encoding="utf-8") as file:
+        names = [row[0] for row in csv.reader(file) if len(row) > 0]
+    alphabet = "".join(set("".join(names)))
+    rand = random.Random(0)
+
+    def mutate(name: str) -> str:
+        return "".join(
+            c if rand.random() < 0.8 else rand.choice(alphabet) for c in name
+        )
+
+    def measure(size: int) -> Tuple[float, float]:
+        # a dictionary of thousands of names near each other
+        choices = list(
+            dict.fromkeys(names + [mutate(n) for n in rand.choices(names, k=size)])
+        )
+        dic = StudentDictionaryImpl((name, "") for name in choices)
+        queries = [mutate(n) for n in rand.choices(choices, k=300)]
+        matched = [dic.match(query).index for query in queries]
+        for query, index in list(zip(queries, matched))[:5]:
+            assert index == __match_by_full_scan(choices, query), query
+
+        # the radii of the matched names are found once on the first match
+        starts_at = time.perf_counter()
+        for query in queries:
+            dic.match(query)
+        elapsed = time.perf_counter() - starts_at
+
+        starts_at = time.perf_counter()
+        for query in queries:
+            process.extract(
+                query,
+                choices,
+                scorer=Levenshtein.normalized_similarity,
+                score_cutoff=0.51,
+                limit=None,
+            )
+        scanned = time.perf_counter() - starts_at
+        return elapsed, scanned
+
+    small = measure(1500)
+    large = measure(12000)
+    # the scan grows linearly with the names, and matching grows slower by far
+    assert large[0] / small[0] < large[1] / small[1] / 2
+
+
+def test_StudentDictionary_match_threads() -> None:
+    path = Path(__file__).parent.parent / "students.csv"
+    with path.open(encoding="utf-8") as file:
+        rows = [(row[0], row[1]) for row in csv.reader(file) if len(row) > 0]
+    queries = [name[: len(name) * 2 // 3] for name, _ in rows] * 4
+    expected = [StudentDictionaryImpl(rows).match(query) for query in queries]
+
+    # the radii are filled by the threads at once
+    dic = StudentDictionaryImpl(rows)
+    with ThreadPoolExecutor(8) as executor:
+        assert list(executor.map(dic.match, queries)) == expected
+
+
+# index decided by `StudentDictionaryImpl.match` without pruning nor early returns
+def __match_by_full_scan(names: Sequence[str], query: str) -> int:
+    scores = [
+        (weighted_similarity(query, name, diacritic_substitution_cost), index)
+        for index, name in enumerate(names)
+    ]
+    results = sorted(
+        ((score, index) for score, index in scores if score >= 0.51),
+        key=lambda r: (-r[0], r[1]),
+    )
+    if len(results) == 1 or (len(results) > 1 and results[0][0] >= 0.67):
+        return results[0][1]
+    return -1
+
+
+def test_StudentDictionary_match_role() -> None:
+    dic = StudentDictionaryImpl(
+        [
+            ("シロコ（水着）", "水シロコ", "SPECIAL"),
+            ("ホシノ", "", "STRIKER"),
+            ("シロコ", "", "STRIKER"),
+            ("ヒビキ", "", "SPECIAL"),
+            ("ネル", "", None),
+        ]
+    )
+    assert dic.match("シロコ（水") == Student(0, "シロコ（水着）", "水シロコ")
+    assert dic.match("シロコ（水", "STRIKER") == Student(2, "シロコ", None)
+    assert dic.match("シロコ（水", "SPECIAL") == Student(
+        0, "シロコ（水着）", "水シロコ"
+    )
+    assert dic.match("ホシノ", "SPECIAL") == Student(-1, "Error", None)
+    # students without roles are candidates for any role
+    assert dic.match("ネル", "SPECIAL") == Student(4, "ネル", None)
+    assert dic.match("ネル", "STRIKER") == Student(4, "ネル", None)
+
+    assert sorted(dic.get_allow_char_list("STRIKER")) == sorted("ホシノロコネル()")
+    assert sorted(dic.get_allow_char_list("SPECIAL")) == sorted(
+        "シロコ水着ヒビキネル()"
+    )
+
+    # all students if no students have roles
+    dic2 = StudentDictionaryImpl([("ホシノ", ""), ("ヒビキ", "")])
+    assert dic2.match("ホシノ", "SPECIAL") == Student(0, "ホシノ", None)
+    assert dic2.get_allow_char_list("STRIKER") == dic2.get_allow_char_list()
+
+
+class _FakeReader:
+    def __init__(self, text: str = "ホシノ") -> None:
+        self.text = text
+        self.read_count = 0
+        self.allowlists: List[str] = []
+
+    def readtext_batched(
+        self, images: Sequence[Image], **kwargs: Any
+    ) -> List[List[Character]]:
+        self.read_count += len(images)
+        self.allowlists.append(kwargs["allowlist"])
+        return [[([(0, 0), (1, 0), (1, 1), (0, 1)], self.text, 0.9)] for _ in images]
+
+    # a character for each glyph; detect is not called
+    def recognize(self, image: Image, **kwargs: Any) -> List[Character]:
+        char = self.text[self.read_count % len(self.text)]
+        self.read_count += 1
+        return [([(0, 0), (1, 0), (1, 1), (0, 1)], char, 0.9)]
+
+
+def test_read_students_blank() -> None:
+    dic = StudentDictionaryImpl([("シロコ（水着）", "水シロコ"), ("ホシノ", "")])
+    blank: Image = numpy.full((146, 245), 255, dtype=numpy.uint8)
+    name = blank.copy()
+    cv2.putText(name, "Hoshino", (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 1.5, 0, 4)
+    reader = _FakeReader()
+
+    texts = read_students(
+        reader,
+        dic,
+        [name, blank, name, blank],
+        blanks=[False, True, False, True],
+        roles=[None, None, None, None],
+    )
+    assert [len(chars) for chars in texts] == [1, 0, 1, 0]
+    assert reader.read_count == 2  # blank slots are not read
+    assert match_student(dic, name, texts[0], 0, None) == Student(1, "ホシノ", None)
+    assert match_student(dic, blank, texts[1], 0, None).is_error
+
+
+def test_read_students_role() -> None:
+    dic = StudentDictionaryImpl(
+        [("シロコ（水着）", "水シロコ", "SPECIAL"), ("シロコ", "", "STRIKER")]
+    )
+    name: Image = numpy.full((146, 245), 255, dtype=numpy.uint8)
+    cv2.putText(name, "Shiroko", (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 1.5, 0, 4)
+    reader = _FakeReader("シロコ（水")
+
+    roles: List[Role | None] = ["STRIKER", "SPECIAL"]
+    texts = read_students(reader, dic, [name, name], [False, False], roles)
+    assert [
+        match_student(dic, name, chars, 0, role) for chars, role in zip(texts, roles)
+    ] == [
+        Student(1, "シロコ", None),
+        Student(0, "シロコ（水着）", "水シロコ"),
+    ]
+    assert reader.allowlists == [
+        dic.get_allow_char_list("STRIKER"),
+        dic.get_allow_char_list("SPECIAL"),
+    ]
+
+
+def test_recognize_student_by_character() -> None:
+    dic = StudentDictionaryImpl([("ホシノ", ""), ("ミカ", "")])
+    name: Image = numpy.full((146, 245), 255, dtype=numpy.uint8)
+    for left in (20, 70, 120):
+        name[50:90, left : left + 40] = 0
+    reader = _FakeReader()
+
+    assert recognize_student_by_character(reader, dic, name) == Student(
+        0, "ホシノ", None
+    )
+    assert reader.read_count == 3
+
+    blank: Image = numpy.full((146, 245), 255, dtype=numpy.uint8)
+    assert recognize_student_by_character(reader, dic, blank).is_error
+
+
+def test_rematch_students() -> None:
+    def texts(*words: str) -> List[OCRText]:
+        return [OCRText(word, 0.9, BoundingBox(0, 0, 10, 10)) for word in words]
+
+    recognitions = [
+        SlotRecognition("STRIKER", False, texts("ホシ", "ノ")),
+        SlotRecognition(None, True, []),
+        SlotRecognition(None, False, texts("ミカ")),
+        SlotRecognition(None, False, texts("ミ"), texts("ミ", "カ")),
+        SlotRecognition(None, False, texts("ミ"), None),
+        SlotRecognition(None, False, []),
+    ]
+
+    old = StudentDictionaryImpl([("ホシノ", "", "STRIKER"), ("シロコ", "")])
+    assert [s.name for s in rematch_students(old, recognitions)] == [
+        "ホシノ",
+        "",
+        "Error",
+        "Error",
+        "Error",
+        "Error",
+    ]
+
+    # a new student is matched without OCR
+    new = StudentDictionaryImpl(
+        [("ホシノ", "", "STRIKER"), ("シロコ", ""), ("ミカ", "")]
+    )
+    assert [s.name for s in rematch_students(new, recognitions)] == [
+        "ホシノ",
+        "",
+        "ミカ",
+        "ミカ",
+        "Error",
+        "Error",
+    ]
+
+
 def test_normalize_student_name() -> None:
     res1 = normalize_student_name("シロコ(水着)")
     assert res1 == "シロコ（水着）"
@@ -106,3 +394,96 @@ def test_remove_diacritics() -> None:
 
 def test_STUDENTS_LEFT_XS() -> None:
     assert len(list(STUDENTS_LEFT_XS)) == 12
+
+
+# reads the given texts in order; the same text after them
+class _SequenceReader:
+    def __init__(self, reads: Sequence[Tuple[str, float]]) -> None:
+        self.reads = reads
+        self.read_count = 0
+        self.recognize_count = 0
+
+    def readtext_batched(
+        self, images: Sequence[Image], **kwargs: Any
+    ) -> List[List[Character]]:
+        text, confidence = self.reads[min(self.read_count, len(self.reads) - 1)]
+        self.read_count += 1
+        return [[([(0, 0), (1, 0), (1, 1), (0, 1)], text, confidence)]]
+
+    def recognize(self, image: Image, **kwargs: Any) -> List[Character]:
+        self.recognize_count += 1
+        return [([(0, 0), (1, 0), (1, 1), (0, 1)], "ミ", 0.9)]
+
+
+def test_retry_student() -> None:
+    dic = StudentDictionaryImpl([("ホシノ", ""), ("ミカ", "")])
+    name: Image = numpy.full((146, 245), 255, dtype=numpy.uint8)
+    name[50:90, 20:60] = 0
+    hoshino = Student(0, "ホシノ", None)
+
+    # confident reads are not retried
+    reader1 = _SequenceReader([])
+    res1 = retry_student(reader1, dic, name, hoshino, [_char("ホシノ", 0.9)])
+    assert res1 == CascadeResult(hoshino, [_char("ホシノ", 0.9)], None, False)
+    assert reader1.read_count == 0
+
+    # matched reads with low confidence are only flagged without a budget
+    reader2 = _SequenceReader([("ホシノ", 0.8)])
+    res2 = retry_student(reader2, dic, name, hoshino, [_char("ホシノ", 0.1)])
+    assert res2 == CascadeResult(hoshino, [_char("ホシノ", 0.1)], None, True)
+    assert reader2.read_count == 0
+
+    # the more confident variant is taken within a budget
+    deadline = time.monotonic() + 60
+    reader3 = _SequenceReader([("ホシ", 0.2), ("ホシノ", 0.8)])
+    res3 = retry_student(
+        reader3, dic, name, hoshino, [_char("ホシノ", 0.1)], deadline=deadline
+    )
+    assert res3 == CascadeResult(hoshino, [_char("ホシノ", 0.8)], None, False)
+    assert reader3.read_count == 2
+
+    # another student replaces a matched one only if it is read with confidence
+    reader4 = _SequenceReader([("ミカ", 0.2)])
+    res4 = retry_student(
+        reader4, dic, name, hoshino, [_char("ホシノ", 0.1)], deadline=deadline
+    )
+    assert res4 == CascadeResult(hoshino, [_char("ホシノ", 0.1)], None, True)
+    reader5 = _SequenceReader([("ミカ", 0.2), ("ミカ", 0.5)])
+    res5 = retry_student(
+        reader5, dic, name, hoshino, [_char("ホシノ", 0.1)], deadline=deadline
+    )
+    assert res5 == CascadeResult(
+        Student(1, "ミカ", None), [_char("ミカ", 0.5)], None, False
+    )
+
+    # by single character only if no variants are matched
+    reader6 = _SequenceReader([("", 0.0)])
+    res6 = retry_student(reader6, dic, name, new_error_student(), [], deadline=deadline)
+    assert res6.student.is_error  # ミ is too short for ミカ
+    assert res6.low_confidence is True
+    assert res6.by_character is not None
+    assert reader6.read_count == 2
+    assert reader6.recognize_count == 1
+
+    # no variants without a budget
+    reader7 = _SequenceReader([("ホシノ", 0.9)])
+    res7 = retry_student(reader7, dic, name, new_error_student(), [])
+    assert res7.by_character is not None
+    assert reader7.read_count == 0
+    assert reader7.recognize_count == 1
+
+
+def test_retry_student_deadline() -> None:
+    dic = StudentDictionaryImpl([("ホシノ", "")])
+    name: Image = numpy.full((146, 245), 255, dtype=numpy.uint8)
+    reader1 = _SequenceReader([("ホシノ", 0.9)])
+
+    res1 = retry_student(
+        reader1, dic, name, new_error_student(), [], deadline=time.monotonic()
+    )
+    assert res1 == CascadeResult(new_error_student(), [], None, True)
+    assert reader1.read_count == 0
+
+
+def _char(text: str, confidence: float) -> Character:
+    return ([(0, 0), (1, 0), (1, 1), (0, 1)], text, confidence)
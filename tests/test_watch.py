@@ -0,0 +1,36 @@
+import os
+from pathlib import Path
+
+from taikoi2t.implements.file import discover_files
+from taikoi2t.implements.watch import FileWatcher
+from taikoi2t.models.file import FileFilter
+
+
+def test_file_watcher_poll(tmp_path: Path) -> None:
+    (tmp_path / "0.png").touch()
+    patterns = [tmp_path / "*.png"]
+    watcher = FileWatcher(patterns, FileFilter(), 1.0, lambda _: None)
+    watcher.start(discover_files(patterns))
+    watcher.stop()
+
+    for i, name in enumerate(["2.png", "1.png", "3.txt"]):
+        (tmp_path / name).touch()
+        os.utime(tmp_path / name, ns=(0, (i + 1) * 1_000_000_000))
+
+    # reported after the size and the modify time are unchanged
+    res1 = watcher.poll()
+    assert res1 == []
+
+    res2 = watcher.poll()
+    assert [e.path.name for e in res2] == ["2.png", "1.png"]  # older first
+
+    res3 = watcher.poll()
+    assert res3 == []
+
+    (tmp_path / "4.png").touch()
+    watcher.poll()
+    (tmp_path / "4.png").write_bytes(b"png")  # still being written
+    res4 = watcher.poll()
+    assert res4 == []
+    res5 = watcher.poll()
+    assert [e.path.name for e in res5] == ["4.png"]
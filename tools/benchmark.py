@@ -0,0 +1,132 @@
+import argparse
+import csv
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# the same format as tests/images/expected_results.csv
+COLUMNS = ["IMAGE_PATH", "PWIN", "PNAME", "PTEAM", "OWIN", "ONAME", "OTEAM"]
+# replaced with the value of --parallel
+PARALLEL = "{parallel}"
+# the unmodified easyocr.Reader(["ja", "en"]) that other modes are compared with
+BASELINE_MODE = "baseline"
+# engine options compared with the baseline
+MODES: Dict[str, List[str]] = {
+    BASELINE_MODE: [],
+    "traced": ["--engine", "traced"],
+    # threads sharing the models against forked processes; run with python3.13t
+    # to compare them without the GIL
+    "threads": ["--threads", PARALLEL],
+    "workers": ["--workers", PARALLEL],
+}
+
+type Rows = Dict[str, List[str]]  # cells except the path by image paths
+
+
+# Compares the throughput and the accuracy of OCR modes.
+#   poetry run python ./tools/benchmark.py -d ./students.csv [--expected CSV] [--parallel N] -- IMAGES
+# The accuracy is against the expected results if given, or against the baseline mode.
+def main() -> int:
+    arg_parser = argparse.ArgumentParser("benchmark")
+    arg_parser.add_argument("-d", "--dictionary", type=Path, required=True)
+    arg_parser.add_argument("--expected", type=Path, default=None)
+    arg_parser.add_argument(
+        "--modes", nargs="+", choices=list(MODES.keys()), default=list(MODES.keys())
+    )
+    arg_parser.add_argument("--parallel", type=int, default=4)
+    arg_parser.add_argument("files", type=Path, nargs="+")
+    args = arg_parser.parse_args()
+
+    expected: Optional[Rows] = None
+    if args.expected is not None:
+        with args.expected.open(mode="r", encoding="utf-8") as expected_file:
+            expected = __to_rows(list(csv.reader(expected_file)))
+
+    print("| mode | init (s) | images/s | rows | cells |")
+    print("| --- | ---: | ---: | ---: | ---: |")
+    # the baseline always runs first
+    for mode in [BASELINE_MODE] + [m for m in args.modes if m != BASELINE_MODE]:
+        try:
+            rows, init_seconds, images_per_second = __run(
+                args.dictionary,
+                args.files,
+                [
+                    str(args.parallel) if option == PARALLEL else option
+                    for option in MODES[mode]
+                ],
+            )
+        except subprocess.CalledProcessError as e:
+            print(f"{mode} failed; {e.stderr}", file=sys.stderr)
+            return 1
+        if expected is None:
+            expected = rows
+        row_accuracy, cell_accuracy = __accuracy(rows, expected)
+        print(
+            f"| {mode} | {init_seconds:.2f} | {images_per_second:.2f} "
+            f"| {row_accuracy:.1%} | {cell_accuracy:.1%} |"
+        )
+    return 0
+
+
+def __run(
+    dictionary: Path, files: Sequence[Path], options: Sequence[str]
+) -> Tuple[Rows, float, float]:
+    with tempfile.TemporaryDirectory() as temporary:
+        logfile = Path(temporary) / "benchmark.log"
+        starts_at = time.perf_counter()
+        output = subprocess.run(
+            ["poetry", "run", "taikoi2t", "-d", dictionary.as_posix()]
+            + list(options)
+            + ["--csv", "--no-alias", "-c"]
+            + COLUMNS
+            + ["--logfile", logfile.as_posix(), "--"]
+            + [file.as_posix() for file in files],
+            check=True,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+        ).stdout
+        elapsed = time.perf_counter() - starts_at
+        log = logfile.read_text(encoding="utf-8")
+
+    rows = __to_rows(list(csv.reader(output.splitlines())))
+    init_seconds = __find_elapsed(log, "INITIALIZED") or 0.0
+    run_seconds = (__find_elapsed(log, "RUN FINISHED") or elapsed) - init_seconds
+    return rows, init_seconds, len(rows) / run_seconds if run_seconds > 0 else 0.0
+
+
+# Returns the rate of the same rows and the same cells
+def __accuracy(rows: Rows, expected: Rows) -> Tuple[float, float]:
+    same_rows = 0
+    same_cells = 0
+    total_cells = 0
+    for path, expected_cells in expected.items():
+        cells = rows.get(path, [])
+        same_rows += 1 if cells == expected_cells else 0
+        same_cells += sum(1 for a, b in zip(cells, expected_cells) if a == b)
+        total_cells += len(expected_cells)
+    return (
+        same_rows / len(expected) if len(expected) > 0 else 0.0,
+        same_cells / total_cells if total_cells > 0 else 0.0,
+    )
+
+
+def __to_rows(rows: Sequence[Sequence[str]]) -> Rows:
+    return dict((Path(row[0]).name, list(row[1:])) for row in rows if len(row) > 0)
+
+
+# finds "=== {marker}; elapsed: 0:00:01.234567 ..." in the log
+def __find_elapsed(log: str, marker: str) -> Optional[float]:
+    match = re.search(rf"{marker}; elapsed: (\d+):(\d+):(\d+(?:\.\d+)?)", log)
+    if match is None:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())